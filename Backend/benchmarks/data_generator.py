@@ -0,0 +1,191 @@
+"""
+Deterministic synthetic data for local benchmarks and tests.
+
+The same seed and sizes always produce the same rows, so numbers from
+different commits are comparable. Rows are inserted in bulk with Core
+inserts (no ORM objects) to keep seeding fast at large scales.
+
+Usage (from Backend/, with DATABASE_URL pointing at a scratch database):
+    python -m benchmarks.data_generator --movies 1000
+"""
+import argparse
+import random
+import sys
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from sqlmodel import SQLModel
+from models.favorite import Favorite
+from models.genre import Genre
+from models.movie import Movie
+from models.movie_genre_link import MovieGenreLink
+from models.review import Review
+from models.role import Role
+from models.user import User
+from views.movie_views import create_movie_slug
+
+GENRE_NAMES = [
+    "Action", "Adventure", "Animation", "Comedy", "Crime", "Drama",
+    "Fantasy", "Horror", "Mystery", "Romance", "Sci-Fi", "Thriller",
+]
+TITLE_WORDS = [
+    "Silent", "Dark", "Last", "Golden", "Broken", "Hidden", "Red", "Lost",
+    "Night", "River", "Empire", "Storm", "Garden", "Echo", "Shadow", "Road",
+]
+ROLE_NAMES = ["regular", "admin", "superadmin"]
+
+# Every generated user logs in with this password (hashed once, reused)
+DEFAULT_PASSWORD = "benchmark-password"
+
+BATCH_SIZE = 1000
+
+
+def default_sizes(movies: int) -> dict:
+    """Derive the other table sizes from the movie count."""
+    users = max(10, movies // 2)
+    return {
+        "movies": movies,
+        "users": users,
+        "reviews": movies * 5,
+        "favorites": min(users * 3, users * movies),
+    }
+
+
+def _insert(connection, table, rows):
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        if batch:
+            connection.execute(table.insert(), batch)
+
+
+def generate_rows(movies: int, users: int, reviews: int, favorites: int,
+                  hashed_password: str, seed: int = 42) -> dict:
+    """Build all rows in memory; returns {table_name: [row dicts]}."""
+    rng = random.Random(seed)
+
+    roles = [{"id": i, "name": name} for i, name in enumerate(ROLE_NAMES, start=1)]
+    genres = [{"id": i, "name": name} for i, name in enumerate(GENRE_NAMES, start=1)]
+
+    movie_rows = []
+    links = []
+    for movie_id in range(1, movies + 1):
+        title = f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_WORDS)} {movie_id}"
+        movie_rows.append({
+            "id": movie_id,
+            "title": title,
+            "slug": create_movie_slug(title),
+            "director": f"Director {rng.randrange(max(1, movies // 10) + 1)}",
+            "description": " ".join(rng.choice(TITLE_WORDS).lower() for _ in range(60)),
+            "image": f"/images/{movie_id}.jpg",
+            "release_date": date(1950, 1, 1) + timedelta(days=rng.randrange(365 * 75)),
+        })
+        for genre_id in rng.sample(range(1, len(GENRE_NAMES) + 1), rng.randint(1, 3)):
+            links.append({"movie_id": movie_id, "genre_id": genre_id})
+
+    user_rows = []
+    for user_id in range(1, users + 1):
+        user_rows.append({
+            "id": user_id,
+            "name": f"Name{user_id}",
+            "surname": f"Surname{user_id}",
+            "address": None,
+            "email": f"user{user_id}@example.com",
+            "username": f"user{user_id}",
+            "hashed_password": hashed_password,
+            # user1 is the superadmin so admin-only routes can be benchmarked
+            "role_id": 3 if user_id == 1 else 1,
+        })
+
+    start_date = datetime(2020, 1, 1)
+    review_rows = []
+    if movies:
+        for review_id in range(1, reviews + 1):
+            review_rows.append({
+                "id": review_id,
+                "rating": rng.randint(1, 10),
+                "review_text": " ".join(rng.choice(TITLE_WORDS).lower() for _ in range(25)),
+                "review_date": start_date + timedelta(minutes=rng.randrange(60 * 24 * 365 * 5)),
+                "user_id": rng.randint(1, users),
+                "movie_id": rng.randint(1, movies),
+            })
+
+    favorite_rows = []
+    seen = set()
+    favorites = min(favorites, users * movies)
+    while len(favorite_rows) < favorites:
+        pair = (rng.randint(1, users), rng.randint(1, movies))
+        if pair in seen:
+            continue
+        seen.add(pair)
+        favorite_rows.append({"id": len(favorite_rows) + 1, "user_id": pair[0], "movie_id": pair[1]})
+
+    return {
+        "roles": roles,
+        "genres": genres,
+        "movies": movie_rows,
+        "movie_genre_link": links,
+        "users": user_rows,
+        "reviews": review_rows,
+        "favorites": favorite_rows,
+    }
+
+
+def seed_database(engine, movies: int, users: int = None, reviews: int = None,
+                  favorites: int = None, seed: int = 42, reset: bool = True) -> dict:
+    """(Re)create the schema and bulk-insert a deterministic dataset.
+
+    Returns the number of rows inserted per table.
+    """
+    from views.user import hash_password
+
+    sizes = default_sizes(movies)
+    sizes.update({k: v for k, v in
+                  {"users": users, "reviews": reviews, "favorites": favorites}.items()
+                  if v is not None})
+
+    if reset:
+        SQLModel.metadata.drop_all(engine)
+    SQLModel.metadata.create_all(engine)
+
+    rows = generate_rows(hashed_password=hash_password(DEFAULT_PASSWORD), seed=seed, **sizes)
+    tables = {
+        "roles": Role.__table__,
+        "genres": Genre.__table__,
+        "movies": Movie.__table__,
+        "movie_genre_link": MovieGenreLink.__table__,
+        "users": User.__table__,
+        "reviews": Review.__table__,
+        "favorites": Favorite.__table__,
+    }
+    with engine.begin() as connection:
+        for name, table in tables.items():
+            _insert(connection, table, rows[name])
+
+    return {name: len(table_rows) for name, table_rows in rows.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed a scratch database with synthetic data")
+    parser.add_argument("--movies", type=int, default=1000)
+    parser.add_argument("--users", type=int)
+    parser.add_argument("--reviews", type=int)
+    parser.add_argument("--favorites", type=int)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--force", action="store_true",
+                        help="allow seeding a non-SQLite database (drops all tables!)")
+    args = parser.parse_args()
+
+    from database.database import engine
+    if engine.url.get_backend_name() != "sqlite" and not args.force:
+        sys.exit(f"Refusing to drop and reseed {engine.url.render_as_string()} without --force")
+    counts = seed_database(engine, args.movies, args.users, args.reviews, args.favorites, args.seed)
+    for name, count in counts.items():
+        print(f"  {name:<18} {count:>8}")
+
+
+if __name__ == "__main__":
+    main()
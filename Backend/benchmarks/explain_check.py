@@ -0,0 +1,141 @@
+"""
+EXPLAIN-based check that the hot queries in views/ and routers/ use indexes.
+
+Each query below mirrors a statement the app issues on a hot path. The
+script runs EXPLAIN (MySQL) or EXPLAIN QUERY PLAN (SQLite) for it and
+fails if the plan contains a full table scan. Covering-index scans are
+allowed. Run it against a database with realistic data: with only a few
+rows MySQL may prefer a table scan even when a usable index exists.
+
+Usage (from Backend/):
+    python -m benchmarks.explain_check
+"""
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from sqlalchemy import text
+from sqlmodel import select, func, or_
+from models.favorite import Favorite
+from models.genre import Genre
+from models.movie import Movie
+from models.movie_genre_link import MovieGenreLink
+from models.movie_tombstone import MovieTombstone
+from models.review import Review
+from models.user import User
+
+
+def hot_queries() -> dict:
+    """name -> statement, mirroring the queries in views/ and routers/."""
+    return {
+        "rating of one movie (get_movie_rating)":
+            select(func.avg(Review.rating)).where(Review.movie_id == 1),
+        "ratings of many movies (get_movies_ratings)":
+            select(Review.movie_id, func.avg(Review.rating))
+            .where(Review.movie_id.in_([1, 2, 3])).group_by(Review.movie_id),
+        "ratings of all movies (get_movies_ratings)":
+            select(Review.movie_id, func.avg(Review.rating)).group_by(Review.movie_id),
+        "reviews of a movie (list_reviews)":
+            select(Review).where(Review.movie_id == 1),
+        "reviews of a user by date":
+            select(Review).where(Review.user_id == 1).order_by(Review.review_date.desc()),
+        "genres of a movie (get_movie_genres)":
+            select(Genre.name).join(MovieGenreLink, MovieGenreLink.genre_id == Genre.id)
+            .where(MovieGenreLink.movie_id == 1),
+        "movies of a genre (movie_genre_link by genre_id)":
+            select(MovieGenreLink.movie_id).where(MovieGenreLink.genre_id == 1),
+        "favorites of a user (get_user_favorites)":
+            select(Movie.id, Movie.title, Movie.image)
+            .join(Favorite, Favorite.movie_id == Movie.id).where(Favorite.user_id == 1),
+        "favorite status (check_favorite_status)":
+            select(Favorite).where(Favorite.user_id == 1, Favorite.movie_id == 1),
+        "favorites of a movie":
+            select(func.count()).select_from(Favorite).where(Favorite.movie_id == 1),
+        "user by username (login)":
+            select(User).where(User.username == "user1"),
+        "user by email (register)":
+            select(User).where(User.email == "user1@example.com"),
+        "user directory page (get_users_page)":
+            select(User).where(User.username > "user5").order_by(User.username).limit(51),
+        "user directory prefix search (get_users_page)":
+            select(User).where(or_(
+                (User.username >= "user1") & (User.username < "user2"),
+                (User.email >= "user1") & (User.email < "user2"),
+            )).order_by(User.username).limit(51),
+        "user directory by role (get_users_page)":
+            select(User).where(User.role_id == 1, User.username > "user5")
+            .order_by(User.username).limit(51),
+        "movie by slug (get_movie_by_slug)":
+            select(Movie.id).where(Movie.slug == "heat"),
+        "taken slugs (unique_movie_slug)":
+            select(Movie.slug).where(Movie.slug >= "heat", Movie.slug < "heat."),
+        "movies changed since a version (get_movie_changes)":
+            select(Movie).where(Movie.version > 5, Movie.version <= 10).order_by(Movie.id),
+        "changed movie ids (movie_facets, random_movie catch-up)":
+            select(Movie.id).where(Movie.version > 5, Movie.version <= 10),
+        "tombstones since a version (get_movie_changes)":
+            select(MovieTombstone.movie_id)
+            .where(MovieTombstone.version > 5, MovieTombstone.version <= 10)
+            .order_by(MovieTombstone.movie_id),
+        "movie list filtered by genre (get_movie_rows)":
+            select(Movie.id, Movie.title)
+            .join(MovieGenreLink, MovieGenreLink.movie_id == Movie.id)
+            .join(Genre, Genre.id == MovieGenreLink.genre_id)
+            .where(Genre.name == "Drama"),
+        "genre by name (get_genre_movies_page)":
+            select(Genre.id).where(Genre.name == "Drama"),
+        "page of a genre's movies (get_genre_movies_page)":
+            select(Movie).join(MovieGenreLink, MovieGenreLink.movie_id == Movie.id)
+            .where(MovieGenreLink.genre_id == 1, Movie.slug > "heat")
+            .order_by(Movie.slug).limit(21),
+    }
+
+
+def _full_scans_sqlite(connection, sql: str) -> list:
+    rows = connection.execute(text(f"EXPLAIN QUERY PLAN {sql}")).fetchall()
+    details = [row[-1] for row in rows]
+    return [d for d in details if d.startswith("SCAN") and "INDEX" not in d], details
+
+
+def _full_scans_mysql(connection, sql: str) -> list:
+    result = connection.execute(text(f"EXPLAIN {sql}"))
+    columns = list(result.keys())
+    rows = [dict(zip(columns, row)) for row in result.fetchall()]
+    details = [f"{r.get('table')}: type={r.get('type')} key={r.get('key')} extra={r.get('Extra')}"
+               for r in rows]
+    return [d for d, r in zip(details, rows) if r.get("type") == "ALL"], details
+
+
+def check(engine, verbose: bool = False) -> list:
+    """Return a list of (query name, offending plan lines) for queries that full-scan."""
+    dialect = engine.dialect
+    explain = _full_scans_sqlite if dialect.name == "sqlite" else _full_scans_mysql
+    failures = []
+    with engine.connect() as connection:
+        for name, statement in hot_queries().items():
+            sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+            scans, details = explain(connection, sql)
+            if verbose:
+                print(f"{'FAIL' if scans else 'ok  '} {name}")
+                for line in details:
+                    print(f"       {line}")
+            if scans:
+                failures.append((name, scans))
+    return failures
+
+
+def main():
+    from database.database import engine
+
+    failures = check(engine, verbose=True)
+    if failures:
+        print(f"\n{len(failures)} hot queries do a full table scan")
+        sys.exit(1)
+    print("\nAll hot queries use an index")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+"""
+Offline endpoint benchmarks against a local SQLite database.
+
+For every data scale the database is reseeded with the deterministic
+generator, then each endpoint is called through an in-process TestClient
+and its latency (mean/p50/p95) and sequential throughput are recorded.
+The app cache is cleared before every timed call, so the numbers are the
+queries and serialization; the "(cached)" rows time cache hits instead.
+The JSON report can be compared with one from another commit.
+
+With --memory, tracemalloc runs during the timed requests and each
+endpoint also reports the peak bytes allocated per request and what is
+still allocated after them. Tracing slows allocation down, so compare
+memory runs with memory runs only.
+
+Usage (from Backend/):
+    python -m benchmarks.run_benchmarks --scales 100 1000 --output bench.json
+    python -m benchmarks.run_benchmarks --scales 100 --compare bench.json
+    python -m benchmarks.run_benchmarks --scales 1000 --memory --output mem.json
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from functools import partial
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+
+def configure_environment(db_path: Path):
+    """Point the app at a scratch SQLite file. Must run before importing main."""
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ["DB_ECHO"] = "false"
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def measure(call, requests: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        call()
+    timings, peaks = [], []
+    tracing = tracemalloc.is_tracing()
+    before = tracemalloc.get_traced_memory()[0]
+    started = time.perf_counter()
+    for _ in range(requests):
+        if tracing:
+            tracemalloc.reset_peak()
+            request_start = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        response = call()
+        timings.append(time.perf_counter() - t0)
+        if tracing:
+            peaks.append(tracemalloc.get_traced_memory()[1] - request_start)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{response.request.url} returned {response.status_code}: {response.text[:200]}")
+    elapsed = time.perf_counter() - started
+    result = {
+        "requests": requests,
+        "mean_ms": statistics.fmean(timings) * 1000,
+        "p50_ms": percentile(timings, 50) * 1000,
+        "p95_ms": percentile(timings, 95) * 1000,
+        "throughput_rps": requests / elapsed if elapsed else 0.0,
+        "response_bytes": len(response.content),
+    }
+    if tracing:
+        result["peak_kb_p50"] = percentile(peaks, 50) / 1024
+        result["peak_kb_max"] = max(peaks) / 1024
+        # Growth across all timed requests; steady growth here points at a leak or an unbounded cache
+        result["retained_kb"] = (tracemalloc.get_traced_memory()[0] - before) / 1024
+    return result
+
+
+def uncached(call):
+    """`call` with the app cache emptied first, so it does the real work every time."""
+    from cache import get_cache
+
+    def run():
+        get_cache().clear()
+        return call()
+    return run
+
+
+def endpoint_calls(client, token: str) -> dict:
+    from benchmarks.data_generator import DEFAULT_PASSWORD
+
+    auth = {"Authorization": f"Bearer {token}"}
+    movies = partial(client.get, "/movies/")
+    movie = partial(client.get, "/movies/1")
+    return {
+        "GET /movies/": uncached(movies),
+        "GET /movies/ (cached)": movies,
+        "GET /movies/{id}": uncached(movie),
+        "GET /movies/{id} (cached)": movie,
+        "GET /reviews/": uncached(lambda: client.get("/reviews/")),
+        "GET /favorites/": uncached(lambda: client.get("/favorites/", headers=auth)),
+        "POST /users/login": lambda: client.post(
+            "/users/login", data={"username": "user2", "password": DEFAULT_PASSWORD}),
+    }
+
+
+def run_scale(movies: int, requests: int, warmup: int, only: list) -> dict:
+    from fastapi.testclient import TestClient
+    import main
+    from database.database import engine
+    from benchmarks.data_generator import DEFAULT_PASSWORD, seed_database
+    from views.random_movie import random_movie_sampler
+    from cache import get_cache
+
+    counts = seed_database(engine, movies)
+    random_movie_sampler.reset()
+    get_cache().clear()
+
+    results = {}
+    with TestClient(main.app) as client:
+        token = client.post(
+            "/users/login", data={"username": "user2", "password": DEFAULT_PASSWORD}
+        ).json()["access_token"]
+        for name, call in endpoint_calls(client, token).items():
+            if only and name not in only:
+                continue
+            # bcrypt dominates login; fewer samples keep the run short
+            count = max(3, requests // 5) if name.startswith("POST /users/login") else requests
+            results[name] = measure(call, count, warmup)
+            memory = (f"  peak {results[name]['peak_kb_p50']:9.1f} KB"
+                      if "peak_kb_p50" in results[name] else "")
+            print(f"  [{movies:>6} movies] {name:<26} "
+                  f"p50 {results[name]['p50_ms']:8.2f} ms  "
+                  f"p95 {results[name]['p95_ms']:8.2f} ms  "
+                  f"{results[name]['throughput_rps']:8.1f} req/s{memory}")
+    return {"rows": counts, "endpoints": results}
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(report: dict, baseline_path: str):
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"\nComparison with {baseline_path} ({baseline['meta'].get('git_revision')}):")
+    for scale, data in report["scales"].items():
+        old_scale = baseline.get("scales", {}).get(scale)
+        if not old_scale:
+            continue
+        for name, result in data["endpoints"].items():
+            old = old_scale["endpoints"].get(name)
+            if not old:
+                continue
+            change = (result["p50_ms"] - old["p50_ms"]) / old["p50_ms"] * 100 if old["p50_ms"] else 0.0
+            print(f"  [{scale:>6} movies] {name:<26} p50 {old['p50_ms']:8.2f} -> "
+                  f"{result['p50_ms']:8.2f} ms ({change:+.1f}%)")
+            if "peak_kb_p50" in result and "peak_kb_p50" in old:
+                print(f"  {'':15}{'':<26} peak {old['peak_kb_p50']:8.1f} -> "
+                      f"{result['peak_kb_p50']:8.1f} KB, retained {old['retained_kb']:8.1f} -> "
+                      f"{result['retained_kb']:8.1f} KB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run offline endpoint benchmarks")
+    parser.add_argument("--scales", type=int, nargs="+", default=[100, 1000],
+                        help="movie counts to benchmark (other tables scale with it)")
+    parser.add_argument("--requests", type=int, default=30, help="timed requests per endpoint")
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", nargs="*", default=[], help='e.g. "GET /movies/"')
+    parser.add_argument("--output", help="write the JSON report here")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    parser.add_argument("--db", help="SQLite file to use (default: a temp file)")
+    parser.add_argument("--memory", action="store_true",
+                        help="trace allocations and report per-request peaks (slows every request)")
+    args = parser.parse_args()
+
+    workdir = tempfile.TemporaryDirectory()
+    configure_environment(Path(args.db) if args.db else Path(workdir.name) / "bench.db")
+
+    report = {
+        "meta": {
+            "git_revision": git_revision(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "requests": args.requests,
+            "memory": args.memory,
+        },
+        "scales": {},
+    }
+    if args.memory:
+        tracemalloc.start()
+    for movies in args.scales:
+        report["scales"][str(movies)] = run_scale(movies, args.requests, args.warmup, args.only)
+    if args.memory:
+        tracemalloc.stop()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+    workdir.cleanup()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Microbenchmark for the /movies/ serialization path.
+
+Compares the per-row cost of the old path (construct MovieReadWithGenres,
+validate again against response_model, encode with the standard library)
+with the fast paths in views/serialization.py.
+
+Usage (from Backend/):
+    python -m benchmarks.serialization_bench --rows 5000 --repeat 5
+"""
+import argparse
+import json
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.append(str(BASE_DIR))
+
+from fastapi.encoders import jsonable_encoder
+from schemas.movie import MovieReadWithGenres
+from views.serialization import movie_list_adapter, orjson
+
+
+def make_rows(count: int) -> list:
+    return [
+        {
+            "id": i,
+            "title": f"Movie {i}",
+            "director": f"Director {i % 97}",
+            "description": "A long enough description of the plot. " * 8,
+            "image": f"https://example.com/images/{i}.jpg",
+            "release_date": date(1950 + i % 70, 1 + i % 12, 1 + i % 28),
+            "genres": ["Drama", "Crime"] if i % 2 else ["Comedy"],
+            "rating": round((i % 100) / 10, 1),
+            "slug": f"movie-{i}",
+        }
+        for i in range(1, count + 1)
+    ]
+
+
+def old_path(rows):
+    models = [MovieReadWithGenres(**row) for row in rows]
+    validated = movie_list_adapter.validate_python(
+        [m.model_dump() for m in models]
+    )
+    return json.dumps(jsonable_encoder(validated), ensure_ascii=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def construct_path(rows):
+    models = [MovieReadWithGenres.model_construct(**row) for row in rows]
+    return movie_list_adapter.dump_json(models)
+
+
+def orjson_path(rows):
+    return orjson.dumps(rows)
+
+
+def best_of(func, rows, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    paths = [("validate twice + json", old_path),
+             ("model_construct + TypeAdapter", construct_path)]
+    if orjson is not None:
+        paths.append(("orjson (trusted dicts)", orjson_path))
+
+    print(f"{args.rows} rows, best of {args.repeat}")
+    baseline = None
+    for name, func in paths:
+        seconds = best_of(func, rows, args.repeat)
+        per_row_us = seconds / args.rows * 1e6
+        baseline = baseline or per_row_us
+        print(f"  {name:<32} {per_row_us:8.2f} us/row  ({baseline / per_row_us:4.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
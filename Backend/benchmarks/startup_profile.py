@@ -0,0 +1,113 @@
+"""
+Startup profile report: import time per module and time to first request.
+
+Runs a fresh interpreter with `-X importtime`, imports `main`, runs the
+lifespan (init_db) and serves GET / through a TestClient. Prints a report
+and, with --output, writes the numbers as JSON so they can be tracked
+across commits. Needs the same environment (.env / DB) as the app.
+
+Usage (from Backend/):
+    python -m benchmarks.startup_profile --top 15 --output startup.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+
+def child():
+    """Runs inside the profiled interpreter and prints timings as JSON."""
+    started = time.perf_counter()
+    sys.path.insert(0, str(BASE_DIR))
+
+    import main
+    imported = time.perf_counter()
+
+    from fastapi.testclient import TestClient
+    client = TestClient(main.app)
+    client.__enter__()  # runs the lifespan startup
+    lifespan_done = time.perf_counter()
+    response = client.get("/")
+    first_response = time.perf_counter()
+    client.__exit__(None, None, None)
+
+    print(json.dumps({
+        "import_main_s": imported - started,
+        "lifespan_s": lifespan_done - imported,
+        "first_request_s": first_response - lifespan_done,
+        "time_to_first_request_s": first_response - started,
+        "status_code": response.status_code,
+    }))
+
+
+def parse_importtime(stderr: str) -> list:
+    """Parse `-X importtime` lines into (module, self_us, cumulative_us)."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def top_level_packages(rows: list) -> dict:
+    """Sum self time per top-level package (fastapi, sqlalchemy, routers, ...)."""
+    totals = {}
+    for module, self_us, _ in rows:
+        package = module.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Profile app imports and time to first request")
+    parser.add_argument("--top", type=int, default=15, help="how many modules/packages to list")
+    parser.add_argument("--output", help="write the report as JSON to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child()
+        return
+
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "benchmarks.startup_profile", "--child"],
+        cwd=BASE_DIR, capture_output=True, text=True, env=os.environ.copy(),
+    )
+    if process.returncode != 0:
+        sys.stderr.write(process.stderr[-4000:])
+        sys.exit(process.returncode)
+
+    timings = json.loads(process.stdout.strip().splitlines()[-1])
+    rows = parse_importtime(process.stderr)
+    packages = sorted(top_level_packages(rows).items(), key=lambda item: item[1], reverse=True)
+    modules = sorted(rows, key=lambda row: row[1], reverse=True)
+
+    print("Startup timings:")
+    for key in ("import_main_s", "lifespan_s", "first_request_s", "time_to_first_request_s"):
+        print(f"  {key:<26} {timings[key] * 1000:9.1f} ms")
+    print(f"\nSlowest packages (self time, top {args.top}):")
+    for package, self_us in packages[:args.top]:
+        print(f"  {package:<40} {self_us / 1000:9.1f} ms")
+    print(f"\nSlowest modules (self time, top {args.top}):")
+    for module, self_us, cumulative_us in modules[:args.top]:
+        print(f"  {module:<40} {self_us / 1000:9.1f} ms  (cumulative {cumulative_us / 1000:.1f} ms)")
+
+    if args.output:
+        report = {
+            "timings": timings,
+            "packages_ms": {package: self_us / 1000 for package, self_us in packages[:args.top]},
+            "modules_ms": {module: self_us / 1000 for module, self_us, _ in modules[:args.top]},
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2))
+        print(f"\nReport written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+from functools import lru_cache
+
+from database.config import settings
+from database.workers import after_fork
+from .backends import CacheBackend, NullCache, InProcessCache, RedisCache, TieredCache
+
+# Key prefixes; write paths invalidate whole groups at once
+MOVIES = "movies:"
+MOVIE_LIST = "movies:list:"
+MOVIE_DETAIL = "movies:detail:"
+FAVORITES = "favorites:user:"
+USERS = "users:"
+# Genre aggregates and per-genre movie pages; movie and review writes drop them
+GENRES = "genres:"
+
+
+@lru_cache()
+def get_cache() -> CacheBackend:
+    backend = settings.CACHE_BACKEND.lower()
+    if backend == "none":
+        return NullCache()
+
+    local = InProcessCache(settings.CACHE_MAX_ENTRIES, settings.CACHE_TTL_SECONDS)
+    if backend == "memory":
+        return local
+    if backend == "redis":
+        if not settings.CACHE_REDIS_URL:
+            raise ValueError("CACHE_BACKEND=redis needs CACHE_REDIS_URL")
+        return TieredCache(local, RedisCache(settings.CACHE_REDIS_URL, settings.CACHE_TTL_SECONDS))
+    raise ValueError(f"Unknown CACHE_BACKEND {settings.CACHE_BACKEND!r} (use none, memory or redis)")
+
+
+# A forked worker has no invalidation subscriber thread (threads don't survive
+# fork) and must not share the parent's Redis sockets, so it builds its own cache
+after_fork(get_cache.cache_clear)
+
+
+def invalidate(*prefixes: str):
+    """Drop cached entries under the given prefixes, in every worker."""
+    get_cache().invalidate(*prefixes)
+
+
+def fill_cache(session, key: str, value):
+    """Cache `value`, which was read through `session`, unless it may be stale.
+
+    A replica lags behind the primary, so right after a write it can still
+    return the old rows; cached, they would be served for the whole TTL and
+    to every worker. Replica reads therefore don't fill the cache for
+    REPLICA_PIN_SECONDS after an invalidation (the window writers are pinned
+    to the primary for).
+    """
+    # database.database builds the engines on import; only needed here
+    from database.database import session_router
+
+    cache = get_cache()
+    if session_router.engine_for(session) == "replica" and cache.invalidated_within(session_router.pin_seconds):
+        return
+    cache.set(key, value)
@@ -0,0 +1,254 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional
+
+from . import serialization
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "criticrew:cache:invalidate"
+
+
+class CacheBackend:
+    """Interface every cache backend implements.
+
+    Keys are strings grouped by prefix ("movies:list:...", "favorites:user:7"),
+    so a write path can drop a whole group with delete_prefix().
+    """
+
+    def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete_prefix(self, prefix: str):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def invalidate(self, *prefixes: str):
+        """Drop every key under the given prefixes (in all workers, if shared)."""
+        for prefix in prefixes:
+            self.delete_prefix(prefix)
+
+    def invalidated_within(self, seconds: float) -> bool:
+        """Whether any prefix was dropped in the last `seconds`, as far as this worker has heard."""
+        return False
+
+    def close(self):
+        pass
+
+
+class NullCache(CacheBackend):
+    """Caching disabled: every lookup misses."""
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl=None):
+        pass
+
+    def delete_prefix(self, prefix):
+        pass
+
+    def clear(self):
+        pass
+
+
+class InProcessCache(CacheBackend):
+    """Thread-safe LRU with per-entry expiry, private to one worker process."""
+
+    def __init__(self, max_entries: int = 1024, default_ttl: Optional[float] = 300):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._invalidated_at = float("-inf")
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete_prefix(self, prefix):
+        with self._lock:
+            self._invalidated_at = time.monotonic()
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def invalidated_within(self, seconds):
+        return time.monotonic() - self._invalidated_at < seconds
+
+
+class RedisCache(CacheBackend):
+    """Cache stored in Redis (or anything speaking the Redis protocol).
+
+    Values are encoded with cache.serialization. Needs the `redis` package.
+    While Redis is unreachable, lookups miss and writes are dropped (and
+    logged) rather than failing the request.
+    """
+
+    def __init__(self, url: str, default_ttl: Optional[float] = 300, namespace: str = "criticrew:"):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.default_ttl = default_ttl
+        self.namespace = namespace
+        self._errors = redis.RedisError
+        self._stop = threading.Event()
+        self._subscribers = []
+
+    def get(self, key):
+        try:
+            data = self.client.get(self.namespace + key)
+        except self._errors as exc:
+            logger.warning("redis cache get failed, treating as a miss: %s", exc)
+            return None
+        return None if data is None else serialization.loads(data)
+
+    def set(self, key, value, ttl=None):
+        ttl = self.default_ttl if ttl is None else ttl
+        px = int(ttl * 1000) if ttl else None
+        try:
+            self.client.set(self.namespace + key, serialization.dumps(value), px=px)
+        except self._errors as exc:
+            logger.warning("redis cache set failed, not cached: %s", exc)
+
+    def delete_prefix(self, prefix):
+        try:
+            keys = list(self.client.scan_iter(match=self.namespace + prefix + "*", count=500))
+            for start in range(0, len(keys), 500):
+                self.client.delete(*keys[start:start + 500])
+        except self._errors as exc:
+            logger.warning("redis cache delete of %r failed: %s", prefix, exc)
+
+    def clear(self):
+        self.delete_prefix("")
+
+    def publish(self, message: str, channel: str = INVALIDATION_CHANNEL):
+        try:
+            self.client.publish(channel, message)
+        except self._errors as exc:
+            logger.warning("redis cache publish failed: %s", exc)
+
+    def subscribe(self, callback: Callable[[str], None], channel: str = INVALIDATION_CHANNEL,
+                  on_resubscribe: Optional[Callable[[], None]] = None) -> threading.Thread:
+        """Call `callback(message)` for every message on `channel`, on a daemon thread.
+
+        Messages published while the connection is down are lost, so
+        `on_resubscribe()` is called every time the subscription is made
+        again after a drop. The thread stops on close().
+        """
+        pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(channel)
+
+        def listen():
+            subscribed = True
+            while not self._stop.is_set():
+                try:
+                    if not subscribed:
+                        pubsub.subscribe(channel)
+                        subscribed = True
+                        if on_resubscribe is not None:
+                            on_resubscribe()
+                    # A timeout rather than listen(), so close() is noticed
+                    message = pubsub.get_message(timeout=0.5)
+                    if message and message.get("type") == "message":
+                        data = message["data"]
+                        callback(data.decode() if isinstance(data, bytes) else data)
+                except Exception as exc:  # connection dropped; resubscribe after a pause
+                    if self._stop.is_set():
+                        break
+                    logger.warning("cache invalidation subscriber lost its connection: %s", exc)
+                    subscribed = False
+                    self._stop.wait(1)
+            pubsub.close()
+
+        thread = threading.Thread(target=listen, name=f"redis-subscriber:{channel}", daemon=True)
+        thread.start()
+        self._subscribers.append(thread)
+        return thread
+
+    def close(self):
+        self._stop.set()
+        for thread in self._subscribers:
+            thread.join(timeout=2)
+        self.client.close()
+
+
+class TieredCache(CacheBackend):
+    """Per-worker in-process cache in front of a shared Redis cache.
+
+    Reads hit the local LRU first, then Redis (filling the local copy).
+    Invalidation deletes from Redis and publishes the prefix on a pub/sub
+    channel so every worker drops its local copies as well. Invalidations
+    sent while this worker's subscription was down never arrive, so the
+    local copies are all dropped when it resubscribes.
+    """
+
+    def __init__(self, local: InProcessCache, shared: RedisCache):
+        self.local = local
+        self.shared = shared
+        self._subscriber = shared.subscribe(self.local.delete_prefix, on_resubscribe=self._resubscribed)
+
+    def _resubscribed(self):
+        # Not clear(): this counts as an invalidation, for fill_cache's replica check
+        self.local.delete_prefix("")
+
+    def get(self, key):
+        value = self.local.get(key)
+        if value is not None:
+            return value
+        value = self.shared.get(key)
+        if value is not None:
+            self.local.set(key, value)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.local.set(key, value, ttl)
+        self.shared.set(key, value, ttl)
+
+    def delete_prefix(self, prefix):
+        self.local.delete_prefix(prefix)
+        self.shared.delete_prefix(prefix)
+
+    def invalidate(self, *prefixes):
+        for prefix in prefixes:
+            self.delete_prefix(prefix)
+            self.shared.publish(prefix)
+
+    def invalidated_within(self, seconds):
+        # Other workers' invalidations reach the local cache over pub/sub
+        return self.local.invalidated_within(seconds)
+
+    def clear(self):
+        self.local.clear()
+        self.shared.clear()
+        self.shared.publish("")
+
+    def close(self):
+        self.shared.close()
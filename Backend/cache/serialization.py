@@ -0,0 +1,65 @@
+import json
+import zlib
+from datetime import date, datetime
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library is the fallback
+    orjson = None
+
+# One-byte header tells loads() how the payload was encoded
+RAW_BYTES = b"b"
+JSON = b"j"
+ZLIB_BYTES = b"B"
+ZLIB_JSON = b"J"
+
+# Payloads above this size are zlib-compressed before going over the wire
+COMPRESS_THRESHOLD = 1024
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot cache value of type {type(value).__name__}")
+
+
+def _json_dumps(value: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(value, default=_json_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def _json_loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode a cache value: bytes pass through, everything else is JSON.
+
+    Dates and datetimes become ISO strings (pydantic parses them back).
+    """
+    if isinstance(value, (bytes, bytearray)):
+        header, payload = RAW_BYTES, bytes(value)
+    else:
+        header, payload = JSON, _json_dumps(value)
+
+    if len(payload) > COMPRESS_THRESHOLD:
+        compressed = zlib.compress(payload, 1)
+        if len(compressed) < len(payload):
+            header = ZLIB_BYTES if header == RAW_BYTES else ZLIB_JSON
+            payload = compressed
+    return header + payload
+
+
+def loads(data: bytes) -> Any:
+    header, payload = data[:1], data[1:]
+    if header in (ZLIB_BYTES, ZLIB_JSON):
+        payload = zlib.decompress(payload)
+    if header in (RAW_BYTES, ZLIB_BYTES):
+        return payload
+    if header in (JSON, ZLIB_JSON):
+        return _json_loads(payload)
+    raise ValueError(f"Unknown cache payload header {header!r}")
@@ -4,22 +4,113 @@ from pathlib import Path
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import SecretStr
+from typing import Optional
 
 BASE_DIR = Path(__file__).resolve().parent.parent#.parent
 class Settings(BaseSettings):
     
-    DB_USERNAME: str
-    DB_PASSWORD: SecretStr
-    DB_HOST: str
-    DB_PORT: int
-    DB_NAME: str
+    # Full SQLAlchemy URL (e.g. sqlite:///./local.db); overrides the MySQL fields below
+    DATABASE_URL: Optional[str] = None
+
+    DB_USERNAME: Optional[str] = None
+    DB_PASSWORD: Optional[SecretStr] = None
+    DB_HOST: Optional[str] = None
+    DB_PORT: Optional[int] = None
+    DB_NAME: Optional[str] = None
+    DB_ECHO: bool = True
+
+    # Optional read replica for GET traffic (same URL format as DATABASE_URL)
+    REPLICA_DATABASE_URL: Optional[str] = None
+    # How long a client that wrote reads from the primary (replication lag budget)
+    REPLICA_PIN_SECONDS: float = 5.0
+    # How long to skip a replica that failed before trying it again
+    REPLICA_RETRY_SECONDS: float = 30.0
 
     
     SECRET_KEY: SecretStr
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
 
-    
+    # Response compression (gzip always, brotli if the package is installed)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    GZIP_LEVEL: int = 6
+    BROTLI_QUALITY: int = 4
+    COMPRESSION_CACHE_SIZE: int = 64
+
+    # Skip the second response_model validation pass for trusted list payloads
+    FAST_SERIALIZATION: bool = True
+
+    # Shared cache: "none", "memory" (per worker) or "redis" (needs the redis package)
+    CACHE_BACKEND: str = "memory"
+    CACHE_REDIS_URL: Optional[str] = None
+    CACHE_TTL_SECONDS: float = 300
+    CACHE_MAX_ENTRIES: int = 1024
+
+    # Time budget for GET /movies/{id}/full (all of its queries together)
+    MOVIE_FULL_TIMEOUT_SECONDS: float = 2.0
+    # Most ids GET /movies/batch accepts in one request
+    MOVIE_BATCH_MAX_IDS: int = 100
+
+    # Live updates on /events (SSE) and /events/ws
+    EVENTS_ENABLED: bool = True
+    EVENTS_MAX_SUBSCRIBERS: int = 10000
+    # Unsent deltas kept per client before it is told to resync
+    EVENTS_MAX_PENDING: int = 256
+    # Recent events replayed to clients reconnecting with Last-Event-ID
+    EVENTS_HISTORY: int = 512
+    EVENTS_HEARTBEAT_SECONDS: float = 15.0
+    # Connections are closed after this long; EventSource reconnects on its own
+    EVENTS_MAX_SECONDS: float = 3600.0
+    EVENTS_RETRY_MS: int = 3000
+
+    # Bulk user import (POST /users/import, import_users.py)
+    IMPORT_BATCH_SIZE: int = 1000
+    IMPORT_MAX_ROWS: int = 50000
+    # Processes that hash passwords; defaults to one per core
+    IMPORT_HASH_WORKERS: Optional[int] = None
+
+    # On-demand request profiling: admins send "X-Profile: 1", or a random share is sampled.
+    # Off by default: it counts every statement on the engines
+    PROFILING_ENABLED: bool = False
+    PROFILING_SAMPLE_RATE: float = 0.0
+    PROFILING_INTERVAL_MS: float = 5.0
+    PROFILING_DIR: str = "profiles"
+    PROFILING_MAX_PROFILES: int = 200
+    # How long a user's admin check is reused; a demoted admin can profile for up to this long
+    PROFILING_ADMIN_CACHE_SECONDS: float = 60.0
+
+    # Slow-query log (GET /diagnostics/slow-queries): statements over the threshold, with their plan.
+    # Off by default: its statement listeners time every query
+    SLOW_QUERY_ENABLED: bool = False
+    SLOW_QUERY_MS: float = 200.0
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_MAX_TEMPLATES: int = 500
+
+    # tracemalloc diagnostics (GET /diagnostics/memory); off by default, tracing slows every allocation
+    MEMORY_TRACKING_ENABLED: bool = False
+    MEMORY_TRACE_FRAMES: int = 1
+    MEMORY_SNAPSHOT_SECONDS: float = 300.0
+    MEMORY_SNAPSHOT_HISTORY: int = 48
+
+    # Skip create_all on boot when Alembic reports the schema is at head
+    FAST_STARTUP: bool = False
+    # Each worker creates the schema and roles on startup; serve.py does it once and turns this off
+    INIT_DB_ON_STARTUP: bool = True
+
+    # Multi-process serving (serve.py; uvicorn and gunicorn read WEB_CONCURRENCY too)
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    WEB_CONCURRENCY: int = 1
+    # Threads for sync endpoints per worker; defaults to the DB pool capacity
+    THREADPOOL_SIZE: Optional[int] = None
+    # Connection pool per worker (MySQL only; SQLite keeps SQLAlchemy's defaults)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_RECYCLE: int = 1800
+    # Server-side connection limit that all workers together must stay under
+    DB_MAX_CONNECTIONS: Optional[int] = None
+
     model_config = SettingsConfigDict(
         env_file=".env",
         env_file_encoding="utf-8",
@@ -28,6 +119,14 @@ class Settings(BaseSettings):
 
     @property
     def db_url(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
+
+        missing = [name for name in ("DB_USERNAME", "DB_PASSWORD", "DB_HOST", "DB_PORT", "DB_NAME")
+                   if getattr(self, name) is None]
+        if missing:
+            raise ValueError(f"Set DATABASE_URL or all of: {', '.join(missing)}")
+
         # Extract the actual password value from SecretStr
         password = self.DB_PASSWORD.get_secret_value()
         # URL encode credentials to handle special characters
@@ -1,5 +1,12 @@
+from contextlib import contextmanager
+from typing import Optional
+
+from fastapi import Request
+from sqlalchemy.exc import OperationalError
 from sqlmodel import SQLModel, create_engine, Session, select
-from .config import settings
+from .config import settings, BASE_DIR
+from .routing import SessionRouter
+from .workers import after_fork
 from models.user import User
 from models.role import Role
 from models.movie import Movie
@@ -9,48 +16,124 @@ from models.movie_genre_link import MovieGenreLink
 
 
 
-# Configure engine with SSL settings for Aiven
-engine = create_engine(
-    settings.db_url,
-    echo=True,
-    connect_args={
+def engine_connect_args(url: str) -> dict:
+    if url.startswith("sqlite"):
+        # Local/benchmark runs: the session is used from FastAPI's threadpool
+        return {"check_same_thread": False}
+    # SSL settings for Aiven
+    return {
         "ssl_disabled": False,
         "charset": "utf8mb4"
     }
+
+
+def engine_pool_args(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    # Sized per worker; see database.workers.check_worker_config for the totals
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+engine = create_engine(
+    settings.db_url,
+    echo=settings.DB_ECHO,
+    connect_args=engine_connect_args(settings.db_url),
+    **engine_pool_args(settings.db_url)
 )
 
 #engine = create_engine(settings.db_url, echo=True, pool_pre_ping=True)
 
+replica_engine = None
+if settings.REPLICA_DATABASE_URL:
+    # pre_ping so a replica that went away is noticed at checkout, not mid-query
+    replica_engine = create_engine(
+        settings.REPLICA_DATABASE_URL,
+        echo=settings.DB_ECHO,
+        pool_pre_ping=True,
+        connect_args=engine_connect_args(settings.REPLICA_DATABASE_URL),
+        **engine_pool_args(settings.REPLICA_DATABASE_URL)
+    )
+
+session_router = SessionRouter(
+    engine,
+    replica_engine,
+    pin_seconds=settings.REPLICA_PIN_SECONDS,
+    retry_seconds=settings.REPLICA_RETRY_SECONDS,
+)
+
+
+@after_fork
+def _reset_pools_in_child():
+    # The parent's pooled sockets must not be shared: drop them without
+    # closing (that would end the parent's sessions) so the worker opens its own
+    engine.dispose(close=False)
+    if replica_engine is not None:
+        replica_engine.dispose(close=False)
+    session_router.reset()
+
+
+
+ROLE_NAMES = ("regular", "admin", "superadmin")
+
+
+def schema_is_at_head() -> bool:
+    """Check whether the database is already migrated to the newest Alembic revision."""
+    # Alembic is only needed here, so keep it off the import path
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+    from alembic.runtime.migration import MigrationContext
+
+    config = Config(str(BASE_DIR / "alembic.ini"))
+    heads = set(ScriptDirectory.from_config(config).get_heads())
+    with engine.connect() as connection:
+        current = set(MigrationContext.configure(connection).get_current_heads())
+    return bool(heads) and current == heads
+
+
+def seed_roles(session: Session):
+    """Create any missing default roles with one lookup and one batched insert."""
+    existing = set(session.exec(select(Role.name).where(Role.name.in_(ROLE_NAMES))).all())
+    missing = [Role(name=name) for name in ROLE_NAMES if name not in existing]
+    if missing:
+        # Insert order matters: "regular" must get id 1 (see views.user.register2)
+        session.add_all(missing)
+        session.commit()
 
 
 def init_db():
-    # Create all tables
-    SQLModel.metadata.create_all(engine)
+    # Create all tables, unless fast startup is on and Alembic already did it
+    if not (settings.FAST_STARTUP and schema_is_at_head()):
+        SQLModel.metadata.create_all(engine)
     
     # Initialize default roles
     with Session(engine) as session:
-        from models.role import Role
-        
-        # Check if roles exist, if not create them
-        if not session.exec(select(Role).where(Role.name == "regular")).first():
-            regular_role = Role(name="regular")
-            session.add(regular_role)
-        
-        if not session.exec(select(Role).where(Role.name == "admin")).first():
-            admin_role = Role(name="admin") 
-            session.add(admin_role)
-            
-        if not session.exec(select(Role).where(Role.name == "superadmin")).first():
-            superadmin_role = Role(name="superadmin")
-            session.add(superadmin_role)
-        
-        session.commit()
+        seed_roles(session)
 
 
-def get_session():
-    
-    with Session(engine) as session:
+@contextmanager
+def routed_session(request: Optional[Request] = None):
+    """A session on the engine picked for `request` (see SessionRouter).
+
+    If the replica fails while the session is in use, the error still
+    propagates but the replica is marked down, so the next reads go to the
+    primary.
+    """
+    with session_router.open_session(request) as session:
+        try:
+            yield session
+        except OperationalError:
+            if session_router.engine_for(session) == "replica":
+                session_router.mark_replica_down()
+            raise
+
 
+def get_session(request: Request = None):
+    # GETs go to the replica when one is configured, everything else to the primary
+    with routed_session(request) as session:
         yield session
 
 def get_db():
@@ -0,0 +1,104 @@
+import hashlib
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+class SessionRouter:
+    """Chooses the primary or the read replica for each request's session.
+
+    - Safe requests (GET/HEAD/OPTIONS) read from the replica.
+    - Writes go to the primary and pin the caller (by Authorization header)
+      to the primary for `pin_seconds`, so they read their own writes while
+      the replica catches up. Not by client address: behind a proxy or NAT
+      every client shares one, and one write would pin them all. Anonymous
+      writes (register, login) pin nobody.
+    - `X-Consistency: strong` forces the primary for a single request.
+    - If the replica cannot hand out a connection it is skipped for
+      `retry_seconds` and reads fall back to the primary. The choice is
+      made when the session opens: a replica that fails mid-request fails
+      that request (get_session then marks it down for the next ones).
+    """
+
+    def __init__(self, primary, replica=None, pin_seconds: float = 5.0, retry_seconds: float = 30.0):
+        self.primary = primary
+        self.replica = replica
+        self.pin_seconds = pin_seconds
+        self.retry_seconds = retry_seconds
+        self._pins = {}
+        self._replica_down_until = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _caller_key(request) -> Optional[str]:
+        authorization = request.headers.get("authorization")
+        if not authorization:
+            return None
+        return hashlib.sha1(authorization.encode()).hexdigest()
+
+    def pin(self, request):
+        key = self._caller_key(request)
+        if key is None:
+            return
+        until = time.monotonic() + self.pin_seconds
+        with self._lock:
+            self._pins[key] = until
+            if len(self._pins) > 10000:
+                now = time.monotonic()
+                self._pins = {k: v for k, v in self._pins.items() if v > now}
+
+    def is_pinned(self, request) -> bool:
+        key = self._caller_key(request)
+        if key is None:
+            return False
+        with self._lock:
+            return self._pins.get(key, 0.0) > time.monotonic()
+
+    def replica_available(self) -> bool:
+        return self.replica is not None and time.monotonic() >= self._replica_down_until
+
+    def mark_replica_down(self):
+        self._replica_down_until = time.monotonic() + self.retry_seconds
+
+    def wants_replica(self, request) -> bool:
+        if request is None or request.method not in SAFE_METHODS:
+            return False
+        if request.headers.get("x-consistency", "").lower() == "strong":
+            return False
+        return self.replica_available() and not self.is_pinned(request)
+
+    def open_session(self, request=None) -> Session:
+        """Return a new Session bound to the engine this request should use."""
+        if request is not None and request.method not in SAFE_METHODS and self.replica is not None:
+            self.pin(request)
+
+        if self.wants_replica(request):
+            session = Session(self.replica)
+            try:
+                # Check out a connection now so a dead replica is detected up front
+                session.connection()
+                return session
+            except SQLAlchemyError:
+                session.close()
+                self.mark_replica_down()
+        return Session(self.primary)
+
+    def reset(self):
+        """Forget pins and replica health (used in a freshly forked worker)."""
+        self._lock = threading.Lock()
+        self._pins = {}
+        self._replica_down_until = 0.0
+
+    def engine_for(self, session: Session) -> Optional[str]:
+        """'primary' or 'replica' (for logging and tests)."""
+        bind = session.get_bind()
+        if bind is self.primary:
+            return "primary"
+        if bind is self.replica:
+            return "replica"
+        return None
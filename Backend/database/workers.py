@@ -0,0 +1,75 @@
+"""
+Support for serving the app from several worker processes.
+
+Fork-based servers (gunicorn --preload, or anything that imports the app
+before forking) copy module-level state into every worker: the engine's
+pooled sockets, locks, background threads and RNG state. Modules that own
+such state register an `after_fork` hook to rebuild it in the child, so
+each worker opens its own connections on first use.
+"""
+import logging
+import os
+from typing import Callable, List
+
+from sqlalchemy.engine import make_url
+
+logger = logging.getLogger(__name__)
+
+
+def after_fork(callback: Callable[[], None]) -> Callable[[], None]:
+    """Run `callback()` in the child process after every fork (usable as a decorator)."""
+    if hasattr(os, "register_at_fork"):  # not available on Windows
+        os.register_at_fork(after_in_child=callback)
+    return callback
+
+
+def pool_capacity(settings) -> int:
+    """Most connections one worker's primary engine can hold at once."""
+    return settings.DB_POOL_SIZE + settings.DB_MAX_OVERFLOW
+
+
+def threadpool_size(settings) -> int:
+    return settings.THREADPOOL_SIZE or pool_capacity(settings)
+
+
+def check_worker_config(settings) -> List[str]:
+    """Return the reasons the worker/pool settings are unsafe (empty if they are fine)."""
+    problems = []
+    workers = settings.WEB_CONCURRENCY
+    if workers < 1:
+        problems.append(f"WEB_CONCURRENCY must be at least 1 (got {workers})")
+
+    url = make_url(settings.db_url)
+    if url.get_backend_name() == "sqlite":
+        if workers > 1 and url.database in (None, "", ":memory:"):
+            problems.append("an in-memory SQLite database is private to each worker; "
+                            "use a file or a server database with WEB_CONCURRENCY > 1")
+    else:
+        capacity = pool_capacity(settings)
+        if threadpool_size(settings) > capacity:
+            problems.append(f"THREADPOOL_SIZE {threadpool_size(settings)} exceeds the DB pool "
+                            f"({capacity} = DB_POOL_SIZE + DB_MAX_OVERFLOW); extra threads "
+                            f"would block waiting for a connection and time out")
+        if settings.DB_MAX_CONNECTIONS and workers * capacity > settings.DB_MAX_CONNECTIONS:
+            problems.append(f"{workers} workers x {capacity} connections exceeds "
+                            f"DB_MAX_CONNECTIONS={settings.DB_MAX_CONNECTIONS}")
+
+    if workers > 1 and settings.CACHE_BACKEND.lower() == "memory":
+        problems.append("CACHE_BACKEND=memory keeps a separate cache per worker and writes "
+                        "only invalidate their own; use redis (or none) with WEB_CONCURRENCY > 1")
+    return problems
+
+
+def ensure_safe_worker_config(settings):
+    """Refuse to start with settings that are unsafe for the configured worker count."""
+    problems = check_worker_config(settings)
+    if problems:
+        raise RuntimeError("Unsafe worker configuration:\n  - " + "\n  - ".join(problems))
+
+
+def configure_threadpool(size: int):
+    """Set how many sync endpoints a worker runs concurrently (AnyIO's default limiter)."""
+    from anyio import to_thread
+
+    to_thread.current_default_thread_limiter().total_tokens = size
+    logger.info("worker %s: threadpool size %s", os.getpid(), size)
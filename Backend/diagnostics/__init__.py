@@ -0,0 +1,14 @@
+from database.config import settings
+from middleware.memory import MemoryTracker
+from middleware.profiling import ProfileStore
+from middleware.slow_queries import SlowQueryLog
+
+# Request profiles written by middleware.profiling, listed by routers/diagnostics.py
+profile_store = ProfileStore(settings.PROFILING_DIR, settings.PROFILING_MAX_PROFILES)
+
+# Statements over SLOW_QUERY_MS by template; installed on the engines in main.py
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_MS, settings.SLOW_QUERY_EXPLAIN, settings.SLOW_QUERY_MAX_TEMPLATES)
+
+# Allocation snapshots and per-route peaks; started in main.py's lifespan when enabled
+memory_tracker = MemoryTracker(settings.MEMORY_TRACE_FRAMES, settings.MEMORY_SNAPSHOT_SECONDS,
+                               settings.MEMORY_SNAPSHOT_HISTORY)
@@ -0,0 +1,128 @@
+import asyncio
+import json
+import signal
+import threading
+from typing import Iterable
+
+from sqlmodel import Session, select, func
+
+from database.config import settings
+from database.workers import after_fork
+from models.favorite import Favorite
+from models.review import Review
+from .hub import EventHub, Subscriber, RESYNC
+
+# Live updates for /events; with Redis every worker's clients get every event
+EVENTS_CHANNEL = "criticrew:events"
+
+hub = EventHub(
+    max_pending=settings.EVENTS_MAX_PENDING,
+    history=settings.EVENTS_HISTORY,
+    max_subscribers=settings.EVENTS_MAX_SUBSCRIBERS,
+)
+
+
+def start(loop: asyncio.AbstractEventLoop):
+    """Bind the hub to the worker's event loop (called from the app lifespan)."""
+    bridge = None
+    if settings.CACHE_BACKEND.lower() == "redis":
+        from cache import get_cache
+
+        shared = get_cache().shared
+        shared.subscribe(lambda message: hub.deliver(json.loads(message)), channel=EVENTS_CHANNEL)
+        bridge = lambda event: shared.publish(json.dumps(event, separators=(",", ":")), channel=EVENTS_CHANNEL)
+    hub.start(loop, bridge)
+    _stop_on_exit_signals(loop)
+
+
+# Signal handlers replaced by _stop_on_exit_signals, put back by stop()
+_previous_handlers = {}
+
+
+def _stop_on_exit_signals(loop: asyncio.AbstractEventLoop):
+    """Stop the hub as soon as the server is told to exit.
+
+    Uvicorn waits for open responses to finish before it runs the lifespan
+    shutdown, so if the hub were only stopped there, every open event stream
+    would hold up the exit until EVENTS_MAX_SECONDS. Chaining the server's
+    own SIGINT/SIGTERM handlers ends the streams first. Signal handlers can
+    only be set from the main thread (not under TestClient).
+    """
+    if threading.current_thread() is not threading.main_thread():
+        return
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        previous = signal.getsignal(signum)
+        if not callable(previous):
+            continue  # default or ignored: nothing drains connections on this signal
+
+        def handler(received, frame, previous=previous):
+            loop.call_soon_threadsafe(hub.stop)
+            previous(received, frame)
+
+        _previous_handlers[signum] = previous
+        signal.signal(signum, handler)
+
+
+def stop():
+    hub.stop()
+    while _previous_handlers:
+        signum, previous = _previous_handlers.popitem()
+        signal.signal(signum, previous)
+
+
+# A forked worker binds its own loop in its lifespan; drop the parent's
+after_fork(hub.stop)
+
+
+def publish(event: dict):
+    if settings.EVENTS_ENABLED:
+        hub.publish(event)
+
+
+def format_sse(events: Iterable[dict]) -> str:
+    """Server-Sent Events wire format: one id/event/data block per event."""
+    chunks = []
+    for event in events:
+        data = {key: value for key, value in event.items() if key not in ("id", "type")}
+        if "id" in event:
+            chunks.append(f"id: {event['id']}\n")
+        chunks.append(f"event: {event['type']}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n")
+    return "".join(chunks)
+
+
+def publish_rating(session: Session, movie_id: int):
+    """Push a movie's new average rating and review count (one aggregate query)."""
+    publish_ratings(session, [movie_id])
+
+
+def publish_ratings(session: Session, movie_ids: Iterable[int]):
+    """publish_rating for many movies (one grouped query)."""
+    movie_ids = list(movie_ids)
+    if not settings.EVENTS_ENABLED or not movie_ids:
+        return
+    stats = {
+        movie_id: (average, count)
+        for movie_id, average, count in session.exec(
+            select(Review.movie_id, func.avg(Review.rating), func.count())
+            .where(Review.movie_id.in_(movie_ids))
+            .group_by(Review.movie_id)
+        ).all()
+    }
+    for movie_id in movie_ids:
+        average, count = stats.get(movie_id, (None, 0))
+        publish({"type": "rating", "movie_id": movie_id,
+                 "rating": round(float(average), 1) if average else 0.0, "reviews": count})
+
+
+def publish_favorites(session: Session, movie_ids: Iterable[int]):
+    """Push the favorite count of each movie (one grouped query)."""
+    movie_ids = list(movie_ids)
+    if not settings.EVENTS_ENABLED or not movie_ids:
+        return
+    counts = dict(session.exec(
+        select(Favorite.movie_id, func.count())
+        .where(Favorite.movie_id.in_(movie_ids))
+        .group_by(Favorite.movie_id)
+    ).all())
+    for movie_id in movie_ids:
+        publish({"type": "favorites", "movie_id": movie_id, "favorites": counts.get(movie_id, 0)})
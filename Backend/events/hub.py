@@ -0,0 +1,146 @@
+import asyncio
+import itertools
+import logging
+import secrets
+from collections import OrderedDict, deque
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Sent instead of the missed deltas when a client fell too far behind
+RESYNC = {"type": "resync"}
+
+
+class Subscriber:
+    """One connected client: the deltas it hasn't received yet, coalesced.
+
+    Pending events are keyed by (type, movie_id), so a newer rating for a
+    movie replaces the unsent older one. A slow client therefore never
+    holds more than `max_pending` events; past that it gets a single
+    "resync" event and is expected to refetch.
+    """
+
+    __slots__ = ("pending", "wake", "lagged", "max_pending")
+
+    def __init__(self, max_pending: int):
+        self.pending = OrderedDict()
+        self.wake = asyncio.Event()
+        self.lagged = False
+        self.max_pending = max_pending
+
+    def offer(self, event: dict):
+        key = (event["type"], event.get("movie_id"))
+        self.pending.pop(key, None)
+        self.pending[key] = event
+        if len(self.pending) > self.max_pending:
+            self.pending.clear()
+            self.lagged = True
+        self.wake.set()
+
+    async def next_batch(self, timeout: float) -> Optional[List[dict]]:
+        """Wait for events; None if `timeout` passed first (time for a heartbeat)."""
+        try:
+            await asyncio.wait_for(self.wake.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        self.wake.clear()
+        if self.lagged:
+            # The refetch that follows a resync covers whatever arrived since
+            self.lagged = False
+            self.pending.clear()
+            return [RESYNC]
+        batch = list(self.pending.values())
+        self.pending.clear()
+        return batch
+
+
+class EventHub:
+    """Fans events out to every connected client of this worker.
+
+    Subscribers live on the event loop: an idle connection is one waiting
+    coroutine and an empty dict, with no thread or queue of its own.
+    publish() may be called from any thread (sync endpoints run in the
+    threadpool) and hands the event to the loop. With a `bridge`, events
+    go through it (Redis pub/sub) and come back via deliver() in every
+    worker, including this one.
+    """
+
+    def __init__(self, max_pending: int = 256, history: int = 512, max_subscribers: int = 10000):
+        self.max_pending = max_pending
+        self.max_subscribers = max_subscribers
+        self._subscribers = set()
+        # Recent events, so a reconnecting client can resume from Last-Event-ID
+        self._history = deque(maxlen=history)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._bridge: Optional[Callable[[dict], None]] = None
+        self._origin = secrets.token_hex(4)
+        self._sequence = itertools.count(1)
+        self._running = False
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    @property
+    def full(self) -> bool:
+        return len(self._subscribers) >= self.max_subscribers
+
+    @property
+    def running(self) -> bool:
+        """False once stopped: open streams should end instead of waiting for more events."""
+        return self._running
+
+    def start(self, loop: asyncio.AbstractEventLoop, bridge: Optional[Callable[[dict], None]] = None):
+        self._loop = loop
+        self._bridge = bridge
+        self._running = True
+
+    def stop(self):
+        """Stop delivering and wake every subscriber so its stream can close (call on the loop)."""
+        self._running = False
+        self._loop = None
+        self._bridge = None
+        for subscriber in list(self._subscribers):
+            subscriber.wake.set()
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> Optional[Subscriber]:
+        """Register a client (call on the event loop); None when the worker is full."""
+        if self.full:
+            return None
+        subscriber = Subscriber(self.max_pending)
+        if last_event_id:
+            ids = [event["id"] for event in self._history]
+            if last_event_id in ids:
+                for event in list(self._history)[ids.index(last_event_id) + 1:]:
+                    subscriber.offer(event)
+            else:
+                # Missed more than the history holds (or another deployment's id)
+                subscriber.lagged = True
+                subscriber.wake.set()
+        self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: Subscriber):
+        self._subscribers.discard(subscriber)
+
+    def publish(self, event: dict):
+        """Send `event` to every client (thread-safe; dropped if the hub isn't running)."""
+        event = {"id": f"{self._origin}-{next(self._sequence)}", **event}
+        if self._bridge is not None:
+            try:
+                self._bridge(event)
+                return
+            except Exception:
+                logger.warning("event bridge failed; delivering locally only", exc_info=True)
+        self.deliver(event)
+
+    def deliver(self, event: dict):
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._fan_out, event)
+
+    def _fan_out(self, event: dict):
+        self._history.append(event)
+        for subscriber in self._subscribers:
+            subscriber.offer(event)
@@ -0,0 +1,59 @@
+"""
+Bulk-create users from a CSV or NDJSON file (same rules as POST /users/import).
+
+Usage (from Backend/):
+    python import_users.py users.csv
+    python import_users.py users.ndjson --dry-run --report report.json
+
+CSV needs a header row with username, email, name, surname and password
+(or hashed_password); address and role (regular/admin) are optional.
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+from database.config import settings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-create users from CSV or NDJSON")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="default: from the file extension")
+    parser.add_argument("--dry-run", action="store_true", help="only validate and check for conflicts")
+    parser.add_argument("--batch-size", type=int, default=settings.IMPORT_BATCH_SIZE)
+    parser.add_argument("--workers", type=int, default=settings.IMPORT_HASH_WORKERS,
+                        help="password hashing processes (default: one per core)")
+    parser.add_argument("--report", help="write the per-row report here as JSON")
+    args = parser.parse_args()
+
+    from sqlmodel import Session
+    from database.database import engine, init_db
+    from cache import invalidate, USERS
+    from views.user_import import detect_format, import_users, parse_records
+
+    init_db()
+    text = Path(args.path).read_text(encoding="utf-8-sig")
+    records = parse_records(text, args.format or detect_format(args.path))
+
+    started = time.perf_counter()
+    with Session(engine) as session:
+        report = import_users(session, records, args.batch_size, args.dry_run, args.workers)
+    if report["created"]:
+        invalidate(USERS)
+    elapsed = time.perf_counter() - started
+
+    for row in report["rows"]:
+        if row["status"] == "error":
+            print(f"  row {row['row']:>6} {row['username'] or '-':<16} {row['error']}")
+    verb = "valid" if args.dry_run else "created"
+    valid = len(report["rows"]) - report["failed"]
+    print(f"{valid} {verb}, {report['failed']} failed in {elapsed:.1f}s")
+    if args.report:
+        Path(args.report).write_text(json.dumps(report, indent=2))
+    sys.exit(1 if report["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
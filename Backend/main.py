@@ -1,6 +1,9 @@
+import asyncio
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
-from database.database import init_db
+from database.database import init_db, engine, replica_engine
+from database.config import settings
+from database.workers import ensure_safe_worker_config, configure_threadpool, threadpool_size
 
 from routers import __all__ as all_routers
 from dotenv import load_dotenv
@@ -10,9 +13,26 @@ load_dotenv()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Initialize database tables on startup
-    init_db()
+    # Runs once per worker process: refuse unsafe multi-worker settings first
+    ensure_safe_worker_config(settings)
+    configure_threadpool(threadpool_size(settings))
+    from views.review_search import ensure_search_supported
+    ensure_search_supported(engine, replica_engine)
+    # Initialize database tables on startup (serve.py has done it before starting the workers)
+    if settings.INIT_DB_ON_STARTUP:
+        init_db()
+    if settings.EVENTS_ENABLED:
+        import events
+        events.start(asyncio.get_running_loop())
+    if settings.MEMORY_TRACKING_ENABLED:
+        from diagnostics import memory_tracker
+        # Per worker, after the fork: the baseline is this process after startup
+        memory_tracker.start()
     yield
+    if settings.MEMORY_TRACKING_ENABLED:
+        memory_tracker.stop()
+    if settings.EVENTS_ENABLED:
+        events.stop()
 
 app = FastAPI(lifespan=lifespan)
 
@@ -27,7 +47,50 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Optional features import their modules only when they are switched on
+if settings.COMPRESSION_ENABLED:
+    from middleware.compression import CompressionMiddleware
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_SIZE,
+        gzip_level=settings.GZIP_LEVEL,
+        brotli_quality=settings.BROTLI_QUALITY,
+        cache_size=settings.COMPRESSION_CACHE_SIZE,
+    )
+
+if settings.MEMORY_TRACKING_ENABLED:
+    from diagnostics import memory_tracker
+    from middleware.memory import MemoryMiddleware
+    app.add_middleware(MemoryMiddleware, tracker=memory_tracker)
+
+if settings.SLOW_QUERY_ENABLED:
+    from diagnostics import slow_query_log
+    from middleware.slow_queries import QueryRouteMiddleware
+    slow_query_log.install([engine, replica_engine])
+    app.add_middleware(QueryRouteMiddleware)
+
+# Added last so it runs first and its timings include compression
+if settings.PROFILING_ENABLED:
+    from diagnostics import profile_store
+    from middleware.profiling import ProfilingMiddleware, install_query_counter
+    install_query_counter([engine, replica_engine])
+    app.add_middleware(
+        ProfilingMiddleware,
+        store=profile_store,
+        sample_rate=settings.PROFILING_SAMPLE_RATE,
+        interval=settings.PROFILING_INTERVAL_MS / 1000,
+        admin_cache_seconds=settings.PROFILING_ADMIN_CACHE_SECONDS,
+    )
+
+disabled_routers = set()
+if not settings.EVENTS_ENABLED:
+    disabled_routers.add("events")
+if not (settings.PROFILING_ENABLED or settings.SLOW_QUERY_ENABLED or settings.MEMORY_TRACKING_ENABLED):
+    disabled_routers.add("diagnostics")
+
 for module_name in all_routers:
+    if module_name in disabled_routers:
+        continue
     module = import_module(f"routers.{module_name}")
     app.include_router(module.router)
 
@@ -0,0 +1,184 @@
+import gzip
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+try:
+    import brotli
+except ImportError:  # brotli is optional, gzip is always available
+    brotli = None
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Parse an Accept-Encoding header into {coding: q}."""
+    codings = {}
+    for part in header.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, params = part.partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        codings[name.strip().lower()] = q
+    return codings
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    """Pick br or gzip (in that order of preference) if the client accepts it."""
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*", 0.0)
+    candidates = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_q = None, 0.0
+    for name in candidates:
+        q = codings.get(name, wildcard)
+        if q > best_q:
+            best, best_q = name, q
+    return best
+
+
+class CompressedBodyCache:
+    """Small LRU of compressed bodies keyed by (path, query string, encoding).
+
+    Each entry keeps the body it was made from, and a hit only counts when
+    the new body is byte-for-byte the same: comparing is a memcmp, much
+    cheaper than hashing every response body to build the key.
+    """
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, body: bytes) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != body:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: tuple, body: bytes, compressed: bytes):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (body, compressed)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+def _add_vary(headers: list) -> list:
+    """Response headers with Accept-Encoding added to Vary (merged into an existing one)."""
+    vary = b", ".join(v for k, v in headers if k.lower() == b"vary")
+    if b"accept-encoding" in vary.lower() or vary.strip() == b"*":
+        return headers
+    headers = [(k, v) for k, v in headers if k.lower() != b"vary"]
+    headers.append((b"vary", vary + b", Accept-Encoding" if vary else b"Accept-Encoding"))
+    return headers
+
+
+class CompressionMiddleware:
+    """ASGI middleware that gzip/brotli-compresses large buffered responses.
+
+    Streaming responses (more than one body chunk, or event streams) are
+    passed through untouched. Every response that could be compressed gets
+    `Vary: Accept-Encoding`, also when this client gets it uncompressed,
+    so shared caches don't hand a gzip body to a client that can't read
+    it. Compressed bytes of cacheable GET responses are kept in an LRU so
+    an unchanged catalog is compressed only once.
+    """
+
+    def __init__(self, app, minimum_size: int = 1024, gzip_level: int = 6,
+                 brotli_quality: int = 4, cache_size: int = 64):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+        self.cache = CompressedBodyCache(cache_size)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        encoding = choose_encoding(headers.get(b"accept-encoding", b"").decode("latin-1"))
+        cacheable_request = scope.get("method") in ("GET", "HEAD")
+        start_message = None
+        passthrough = False
+
+        async def send_wrapper(message):
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            response_headers = {k.lower(): v for k, v in start_message.get("headers", [])}
+            content_type = response_headers.get(b"content-type", b"")
+
+            if (
+                message.get("more_body", False)
+                or b"content-encoding" in response_headers
+                or content_type.startswith(b"text/event-stream")
+                or len(body) < self.minimum_size
+            ):
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            new_headers = _add_vary(start_message.get("headers", []))
+            if encoding is None:
+                await send({**start_message, "headers": new_headers})
+                await send(message)
+                return
+
+            cache_control = response_headers.get(b"cache-control", b"").lower()
+            cache_key = None
+            if (
+                cacheable_request
+                and start_message["status"] == 200
+                and b"no-store" not in cache_control
+                and b"private" not in cache_control
+            ):
+                cache_key = (scope.get("path"), scope.get("query_string", b""), encoding)
+            compressed = self._compress(body, encoding, cache_key)
+
+            new_headers = [(k, v) for k, v in new_headers if k.lower() != b"content-length"]
+            new_headers.append((b"content-encoding", encoding.encode("latin-1")))
+            new_headers.append((b"content-length", str(len(compressed)).encode("latin-1")))
+
+            await send({**start_message, "headers": new_headers})
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
+
+    def _compress(self, body: bytes, encoding: str, cache_key: Optional[tuple]) -> bytes:
+        if cache_key is not None:
+            cached = self.cache.get(cache_key, body)
+            if cached is not None:
+                return cached
+
+        if encoding == "br":
+            compressed = brotli.compress(body, quality=self.brotli_quality)
+        else:
+            compressed = gzip.compress(body, compresslevel=self.gzip_level, mtime=0)
+
+        if cache_key is not None:
+            self.cache.set(cache_key, body, compressed)
+        return compressed
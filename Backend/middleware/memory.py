@@ -0,0 +1,208 @@
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from typing import List, Optional
+
+GROUP_BY = ("lineno", "filename", "traceback")
+AGAINST = ("baseline", "previous")
+
+# Allocations made by tracemalloc itself and the import machinery are noise here
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+
+def current_rss() -> Optional[int]:
+    """Resident set size in bytes (Linux only; None elsewhere)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _kb(size: int) -> float:
+    return round(size / 1024, 1)
+
+
+class MemoryTracker:
+    """tracemalloc snapshots taken every `interval` seconds, plus per-route peaks.
+
+    The first snapshot is the baseline; diffs compare a fresh snapshot with
+    it (what has grown since startup) or with the latest periodic one (what
+    has grown lately), grouped by allocation site. Only the baseline and
+    the latest snapshot are kept, with a short history of totals.
+
+    tracemalloc's peak is process-wide, so only one request at a time is
+    measured (see begin_request); requests running alongside it add to its
+    peak.
+    """
+
+    def __init__(self, frames: int = 1, interval: float = 300.0, history: int = 48):
+        self.frames = frames
+        self.interval = interval
+        self.history = deque(maxlen=history)
+        self.baseline: Optional[tracemalloc.Snapshot] = None
+        self.latest: Optional[tracemalloc.Snapshot] = None
+        self.routes: dict = {}
+        self._lock = threading.Lock()
+        self._busy = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._started_tracing = False
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started_tracing = True
+        self.take_snapshot()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="memory-snapshots", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        self.baseline = self.latest = None
+        self.history.clear()
+        self.routes.clear()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.take_snapshot()
+
+    def _snapshot(self) -> tracemalloc.Snapshot:
+        return tracemalloc.take_snapshot().filter_traces(_FILTERS)
+
+    def take_snapshot(self) -> dict:
+        snapshot = self._snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        summary = {"taken_at": time.time(), "traced_kb": _kb(current), "peak_kb": _kb(peak),
+                   "rss_kb": _kb(rss) if (rss := current_rss()) is not None else None}
+        with self._lock:
+            if self.baseline is None:
+                self.baseline = snapshot
+            self.latest = snapshot
+            self.history.append(summary)
+        return summary
+
+    def diff(self, against: str = "baseline", group_by: str = "lineno", limit: int = 20) -> List[dict]:
+        """Allocation sites that grew the most between the reference snapshot and now."""
+        if against not in AGAINST:
+            raise ValueError(f"against must be one of {', '.join(AGAINST)}")
+        if group_by not in GROUP_BY:
+            raise ValueError(f"group_by must be one of {', '.join(GROUP_BY)}")
+        reference = self.baseline if against == "baseline" else self.latest
+        if reference is None:
+            return []
+        stats = self._snapshot().compare_to(reference, group_by)
+        return [
+            {
+                "site": [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback],
+                "size_kb": _kb(stat.size),
+                "size_diff_kb": _kb(stat.size_diff),
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ]
+
+    def status(self) -> dict:
+        current, peak = tracemalloc.get_traced_memory()
+        rss = current_rss()
+        return {
+            "tracing": self.tracing,
+            "traced_kb": _kb(current),
+            "rss_kb": _kb(rss) if rss is not None else None,
+            "history": list(self.history),
+            "routes": self.top_routes(),
+        }
+
+    def begin_request(self) -> Optional[int]:
+        """Start measuring a request; returns its starting traced size, or None when busy/off."""
+        if not self.tracing or not self._busy.acquire(blocking=False):
+            return None
+        tracemalloc.reset_peak()
+        return tracemalloc.get_traced_memory()[0]
+
+    def end_request(self, route: str, started: int):
+        current, peak = tracemalloc.get_traced_memory()
+        self._busy.release()
+        with self._lock:
+            entry = self.routes.setdefault(route, {"requests": 0, "peak": 0, "max_peak": 0, "retained": 0})
+            entry["requests"] += 1
+            entry["peak"] += peak - started
+            entry["max_peak"] = max(entry["max_peak"], peak - started)
+            entry["retained"] += current - started
+
+    def top_routes(self, limit: int = 50) -> List[dict]:
+        with self._lock:
+            rows = [
+                {
+                    "route": route,
+                    "requests": entry["requests"],
+                    "mean_peak_kb": _kb(entry["peak"] / entry["requests"]),
+                    "max_peak_kb": _kb(entry["max_peak"]),
+                    "mean_retained_kb": _kb(entry["retained"] / entry["requests"]),
+                }
+                for route, entry in self.routes.items()
+            ]
+        return sorted(rows, key=lambda row: row["max_peak_kb"], reverse=True)[:limit]
+
+
+class MemoryMiddleware:
+    """Attributes each measured request's peak allocation to its route (see MemoryTracker).
+
+    An event stream (/events) can stay open for an hour, and while one
+    request is measured no other is, so streams are measured only up to
+    their response headers.
+    """
+
+    def __init__(self, app, tracker: MemoryTracker):
+        self.app = app
+        self.tracker = tracker
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = self.tracker.begin_request()
+        if started is None:
+            await self.app(scope, receive, send)
+            return
+
+        measuring = True
+
+        def finish():
+            nonlocal measuring
+            if measuring:
+                measuring = False
+                # The route template, not the path, so ids don't each get an entry
+                route = getattr(scope.get("route"), "path", "(no route)")
+                self.tracker.end_request(f"{scope['method']} {route}", started)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                content_type = dict(message.get("headers") or []).get(b"content-type", b"")
+                if content_type.startswith(b"text/event-stream"):
+                    finish()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            finish()
@@ -0,0 +1,278 @@
+import json
+import os
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+import anyio
+from sqlalchemy import event
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+PROFILE_HEADER = b"x-profile"
+# Sortable: UTC time to the microsecond, then a random part
+PROFILE_ID = re.compile(r"^[0-9]{20}-[0-9a-f]{8}$")
+
+# Statements issued by the request being profiled; the context is copied
+# into the threadpool, so sync endpoints count into the same list
+_query_count: ContextVar[Optional[List[int]]] = ContextVar("profile_query_count", default=None)
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _query_count.get()
+    if counter is not None:
+        counter[0] += 1
+
+
+def install_query_counter(engines: Iterable):
+    for engine in engines:
+        if engine is not None and not event.contains(engine, "before_cursor_execute", _count_query):
+            event.listen(engine, "before_cursor_execute", _count_query)
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename
+    try:
+        filename = str(Path(filename).relative_to(BASE_DIR))
+    except ValueError:
+        # Library code: drop everything up to site-packages (or the stdlib dir)
+        filename = filename.split("site-packages" + os.sep)[-1].split("lib" + os.sep)[-1]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Statistical profiler: snapshots thread stacks every `interval` seconds.
+
+    cProfile only sees the thread that enabled it, and most routes here are
+    sync functions that run in the threadpool. The sampler instead looks at
+    the event loop thread and the AnyIO worker threads, and keeps stacks
+    that are inside this app's code (an idle worker has none). On a busy
+    worker, other requests' samples are mixed in.
+    """
+
+    def __init__(self, loop_thread: int, interval: float = 0.005):
+        self.loop_thread = loop_thread
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self) -> Counter:
+        self._stop.set()
+        self._thread.join()
+        return self.stacks
+
+    def _watched(self) -> set:
+        return {thread.ident for thread in threading.enumerate()
+                if thread.ident == self.loop_thread or thread.name.startswith("AnyIO worker thread")}
+
+    def _run(self):
+        own_file = __file__
+        while not self._stop.wait(self.interval):
+            watched = self._watched()
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id not in watched:
+                    continue
+                labels, in_app = [], False
+                while frame is not None:
+                    code = frame.f_code
+                    if code.co_filename == own_file:
+                        break  # the middleware itself and everything above it
+                    in_app = in_app or code.co_filename.startswith(str(BASE_DIR))
+                    labels.append(_frame_label(code))
+                    frame = frame.f_back
+                if in_app and labels:
+                    self.stacks[";".join(reversed(labels))] += 1
+
+
+class ProfileStore:
+    """Profiles on local disk: <id>.folded (flame graph input) and <id>.json (metadata)."""
+
+    def __init__(self, directory: str, max_profiles: int = 200):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+
+    def save(self, meta: dict, stacks: Counter) -> dict:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        folded = "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+        (self.directory / f"{meta['id']}.folded").write_text(folded)
+        (self.directory / f"{meta['id']}.json").write_text(json.dumps(meta))
+        self._prune()
+        return meta
+
+    def _prune(self):
+        metas = sorted(self.directory.glob("*.json"))
+        for path in metas[:max(0, len(metas) - self.max_profiles)]:
+            path.unlink(missing_ok=True)
+            path.with_suffix(".folded").unlink(missing_ok=True)
+
+    def list(self, limit: int = 50) -> List[dict]:
+        """Newest first."""
+        if not self.directory.is_dir():
+            return []
+        metas = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True)[:limit]:
+            try:
+                metas.append(json.loads(path.read_text()))
+            except (OSError, ValueError):
+                continue  # pruned or half-written by another worker
+        return metas
+
+    def path(self, profile_id: str) -> Optional[Path]:
+        if not PROFILE_ID.match(profile_id):
+            return None
+        path = self.directory / f"{profile_id}.folded"
+        return path if path.is_file() else None
+
+
+def top_functions(stacks: Counter, limit: int = 10) -> List[dict]:
+    """Functions with the most samples at the top of the stack (self time)."""
+    leaves = Counter()
+    for stack, count in stacks.items():
+        leaves[stack.rsplit(";", 1)[-1]] += count
+    total = sum(leaves.values()) or 1
+    return [{"function": name, "samples": count, "share": round(count / total, 3)}
+            for name, count in leaves.most_common(limit)]
+
+
+def _token_user_id(authorization: str) -> Optional[int]:
+    """User id of a valid bearer token; checking the signature needs no database."""
+    from fastapi import HTTPException
+    from views.user import get_token_user_id
+
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        return get_token_user_id(token)
+    except HTTPException:
+        return None
+
+
+def _is_admin(user_id: int) -> bool:
+    from sqlmodel import Session
+    from database.database import engine
+    from views.user import get_user_by_id
+
+    with Session(engine) as session:
+        user = get_user_by_id(session, user_id)
+        return user is not None and user.role is not None and user.role.name in ("admin", "superadmin")
+
+
+class AdminCache:
+    """Admin check results per user id, kept for `ttl` seconds.
+
+    Without it every X-Profile request, from any logged-in user, would cost
+    a user and role lookup.
+    """
+
+    def __init__(self, ttl: float = 60.0, max_users: int = 1024):
+        self.ttl = ttl
+        self.max_users = max_users
+        self._entries = {}  # user id -> (expires at, is admin)
+
+    def get(self, user_id: int) -> Optional[bool]:
+        entry = self._entries.get(user_id)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    def put(self, user_id: int, is_admin: bool):
+        if len(self._entries) >= self.max_users:
+            self._entries.clear()
+        self._entries[user_id] = (time.monotonic() + self.ttl, is_admin)
+
+
+class ProfilingMiddleware:
+    """ASGI middleware that profiles requests on demand.
+
+    A request is profiled when an admin sends `X-Profile: 1`, or at random
+    with probability `sample_rate`. One request per worker is profiled at a
+    time. The profile is saved with route, status, timing and statement
+    count, and its id is returned in the X-Profile-Id response header.
+    """
+
+    def __init__(self, app, store: ProfileStore, sample_rate: float = 0.0, interval: float = 0.005,
+                 admin_cache_seconds: float = 60.0):
+        self.app = app
+        self.store = store
+        self.sample_rate = sample_rate
+        self.interval = interval
+        self.admins = AdminCache(admin_cache_seconds)
+        self._busy = threading.Lock()
+
+    async def _trigger(self, scope) -> Optional[str]:
+        headers = dict(scope.get("headers") or [])
+        if headers.get(PROFILE_HEADER, b"").strip() in (b"1", b"true"):
+            user_id = _token_user_id(headers.get(b"authorization", b"").decode("latin-1"))
+            if user_id is not None:
+                is_admin = self.admins.get(user_id)
+                if is_admin is None:
+                    # A database lookup; run it off the event loop and before the clock starts
+                    is_admin = await anyio.to_thread.run_sync(_is_admin, user_id)
+                    self.admins.put(user_id, is_admin)
+                if is_admin:
+                    return "header"
+        if self.sample_rate > 0 and random.random() < self.sample_rate:
+            return "sampled"
+        return None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trigger = await self._trigger(scope)
+        if trigger is None or not self._busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        now = time.time()
+        stamp = time.strftime("%Y%m%d%H%M%S", time.gmtime(now)) + f"{int(now % 1 * 1e6):06d}"
+        profile_id = f"{stamp}-{secrets.token_hex(4)}"
+        status = None
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message = {**message, "headers": [*message.get("headers", []),
+                                                  (b"x-profile-id", profile_id.encode())]}
+            await send(message)
+
+        counter = [0]
+        token = _query_count.set(counter)
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            stacks = sampler.stop()
+            duration = time.perf_counter() - started
+            _query_count.reset(token)
+            self._busy.release()
+            route = scope.get("route")
+            meta = {
+                "id": profile_id,
+                "created_at": now,
+                "trigger": trigger,
+                "method": scope.get("method"),
+                "path": scope.get("path"),
+                "route": getattr(route, "path", None),
+                "status": status,
+                "duration_ms": round(duration * 1000, 2),
+                "queries": counter[0],
+                "samples": sum(stacks.values()),
+                "top": top_functions(stacks),
+            }
+            await anyio.to_thread.run_sync(self.store.save, meta, stacks)
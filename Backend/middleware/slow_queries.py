@@ -0,0 +1,176 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Iterable, List, Optional
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+SORT_KEYS = ("total_ms", "count", "max_ms", "mean_ms")
+EXPLAINABLE = ("select", "with", "update", "delete")
+
+# The ASGI scope of the request being served; copied into the threadpool
+# with the rest of the context, so sync endpoints see it too
+_request_scope: ContextVar[Optional[dict]] = ContextVar("slow_query_scope", default=None)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%\(\w+\)s|%s|:\w+\b|\?")
+_LIST = re.compile(r"\bIN \(\?(?:, \?)*\)", re.IGNORECASE)
+_ROWS = re.compile(r"(\(\?(?:, \?)*\))(?:, \1)+")
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """The statement's template: literals and placeholders become ?, IN lists and VALUES rows collapse."""
+    sql = _SPACE.sub(" ", statement).strip()
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _LIST.sub("IN (?, ...)", sql)
+    return _ROWS.sub(r"\1, ...", sql)
+
+
+def parameters_shape(parameters, executemany: bool) -> str:
+    """Types of the bound parameters, never their values."""
+    if executemany:
+        rows = list(parameters or [])
+        return f"{len(rows)} x {parameters_shape(rows[0], False)}" if rows else "0 rows"
+    if isinstance(parameters, dict):
+        return "{" + ", ".join(f"{key}: {type(value).__name__}" for key, value in parameters.items()) + "}"
+    types = Counter(type(value).__name__ for value in (parameters or ()))
+    return "(" + ", ".join(f"{count} x {name}" if count > 1 else name for name, count in types.items()) + ")"
+
+
+def current_route() -> Optional[str]:
+    scope = _request_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    return f"{scope.get('method', 'WS')} {getattr(route, 'path', scope.get('path'))}"
+
+
+def _explain(conn, statement: str, parameters) -> List:
+    """Plan of `statement`, run on a raw cursor so it doesn't go through the engine events."""
+    dialect = conn.dialect.name
+    prefix = "EXPLAIN QUERY PLAN " if dialect == "sqlite" else "EXPLAIN "
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(prefix + statement, parameters)
+        rows = cursor.fetchall()
+        if dialect == "sqlite":
+            return [row[-1] for row in rows]  # (id, parent, notused, detail)
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in rows]
+    finally:
+        cursor.close()
+
+
+class SlowQueryLog:
+    """Statements slower than `threshold_ms`, aggregated by template.
+
+    Each template keeps its count, total/max time, the routes that issued
+    it, the shape of its parameters and, when `explain` is on, the plan of
+    its first slow execution. The plan is taken on the same connection
+    right after the statement, so it sees the same transaction. Data is per
+    process; at `max_templates` the template with the least total time is
+    dropped to make room.
+    """
+
+    def __init__(self, threshold_ms: float = 200.0, explain: bool = True, max_templates: int = 500):
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.max_templates = max_templates
+        self._entries: dict = {}
+        self._lock = threading.Lock()
+
+    def install(self, engines: Iterable):
+        for engine in engines:
+            if engine is not None and not event.contains(engine, "before_cursor_execute", self._before):
+                event.listen(engine, "before_cursor_execute", self._before)
+                event.listen(engine, "after_cursor_execute", self._after)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        # On the execution context, so a statement that raises leaves nothing behind
+        context._slow_query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        duration_ms = (time.perf_counter() - context._slow_query_started) * 1000
+        if duration_ms >= self.threshold_ms:
+            self.record(conn, statement, parameters, executemany, duration_ms)
+
+    def record(self, conn, statement: str, parameters, executemany: bool, duration_ms: float):
+        template = normalize_sql(statement)
+        route = current_route()
+        shape = parameters_shape(parameters, executemany)
+        logger.warning("slow query (%.1f ms) from %s: %s %s", duration_ms, route or "-", template, shape)
+
+        with self._lock:
+            entry = self._entries.get(template)
+            if entry is None:
+                if len(self._entries) >= self.max_templates:
+                    smallest = min(self._entries, key=lambda key: self._entries[key]["total_ms"])
+                    del self._entries[smallest]
+                entry = self._entries[template] = {
+                    "template": template, "count": 0, "total_ms": 0.0, "max_ms": 0.0,
+                    "routes": Counter(), "parameters": shape, "explain": None,
+                }
+            entry["count"] += 1
+            entry["total_ms"] += duration_ms
+            entry["max_ms"] = max(entry["max_ms"], duration_ms)
+            entry["last_seen"] = time.time()
+            entry["routes"][route] += 1
+            needs_plan = entry["explain"] is None
+            if needs_plan:
+                entry["explain"] = []  # claimed; other threads don't explain it again
+
+        if needs_plan and self.explain and not executemany \
+                and template.split(" ", 1)[0].lower() in EXPLAINABLE:
+            try:
+                plan = _explain(conn, statement, parameters)
+            except Exception as exc:  # the plan is a nice-to-have; never fail the query over it
+                plan = [f"EXPLAIN failed: {exc}"]
+            with self._lock:
+                if template in self._entries:
+                    self._entries[template]["explain"] = plan
+
+    def top(self, limit: int = 20, sort: str = "total_ms") -> List[dict]:
+        if sort not in SORT_KEYS:
+            raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+        with self._lock:
+            entries = [
+                {
+                    **entry,
+                    "total_ms": round(entry["total_ms"], 2),
+                    "max_ms": round(entry["max_ms"], 2),
+                    "mean_ms": round(entry["total_ms"] / entry["count"], 2),
+                    "routes": [{"route": route, "count": count} for route, count in entry["routes"].most_common(5)],
+                }
+                for entry in self._entries.values()
+            ]
+        return sorted(entries, key=lambda entry: entry[sort], reverse=True)[:limit]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class QueryRouteMiddleware:
+    """Makes the current request's route available to SlowQueryLog."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+        token = _request_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _request_scope.reset(token)
@@ -41,6 +41,15 @@ target_metadata = SQLModel.metadata
 url = settings.db_url
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    # The review search index is raw DDL (models/review.py), not part of the metadata
+    if type_ == "table" and name.startswith("reviews_fts"):
+        return False
+    if type_ == "index" and name == "ft_reviews_review_text":
+        return False
+    return True
+
+
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode.
 
@@ -57,6 +66,7 @@ def run_migrations_offline() -> None:
         url=url,
         target_metadata=target_metadata,
         literal_binds=True,
+        include_object=include_object,
         dialect_opts={"paramstyle": "named"},
         compare_type=True
     )
@@ -79,7 +89,8 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata, compare_type=True)
+        context.configure(connection=connection, target_metadata=target_metadata, compare_type=True,
+                          include_object=include_object)
 
         with context.begin_transaction():
             context.run_migrations()
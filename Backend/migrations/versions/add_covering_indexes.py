@@ -0,0 +1,36 @@
+"""Add covering indexes for reviews, favorites and genre links
+
+Revision ID: add_covering_indexes
+Revises: add_favorites_table
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_covering_indexes'
+down_revision: Union[str, None] = 'add_favorites_table'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Average rating per movie is answered from the index alone
+    op.create_index('ix_reviews_movie_id_rating', 'reviews', ['movie_id', 'rating'])
+    # A user's reviews, newest first
+    op.create_index('ix_reviews_user_id_review_date', 'reviews', ['user_id', 'review_date'])
+    # Favorites by user use unique_user_movie_favorite (user_id, movie_id);
+    # this one serves per-movie favorite counts and deletes by movie
+    op.create_index('ix_favorites_movie_id', 'favorites', ['movie_id'])
+    # Movies of a genre (the primary key only covers movie_id -> genre_id)
+    op.create_index('ix_movie_genre_link_genre_id_movie_id', 'movie_genre_link', ['genre_id', 'movie_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_movie_genre_link_genre_id_movie_id', table_name='movie_genre_link')
+    op.drop_index('ix_favorites_movie_id', table_name='favorites')
+    op.drop_index('ix_reviews_user_id_review_date', table_name='reviews')
+    op.drop_index('ix_reviews_movie_id_rating', table_name='reviews')
@@ -0,0 +1,47 @@
+"""Add movie change versions and tombstones for delta sync
+
+Revision ID: add_movie_change_versions
+Revises: add_users_role_username_index
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_movie_change_versions'
+down_revision: Union[str, None] = 'add_users_role_username_index'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'sync_versions',
+        sa.Column('name', sa.String(length=50), nullable=False),
+        sa.Column('value', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('name'),
+    )
+    op.create_table(
+        'movie_tombstones',
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('movie_id'),
+    )
+    op.create_index('ix_movie_tombstones_version', 'movie_tombstones', ['version'])
+    # Existing movies start at version 0, which only a full sync returns
+    with op.batch_alter_table('movies') as batch_op:
+        batch_op.add_column(sa.Column('version', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index('ix_movies_version', ['version'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('movies') as batch_op:
+        batch_op.drop_index('ix_movies_version')
+        batch_op.drop_column('version')
+    op.drop_index('ix_movie_tombstones_version', table_name='movie_tombstones')
+    op.drop_table('movie_tombstones')
+    op.drop_table('sync_versions')
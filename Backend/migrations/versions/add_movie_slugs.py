@@ -0,0 +1,59 @@
+"""Store movie slugs in a unique indexed column
+
+Revision ID: add_movie_slugs
+Revises: add_movie_change_versions
+Create Date: 2026-10-19 17:00:00.000000
+
+"""
+import re
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_movie_slugs'
+down_revision: Union[str, None] = 'add_movie_change_versions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _slugify(title: str) -> str:
+    # Frozen copy of views.movie_views.create_movie_slug at this revision
+    ascii_title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_title.lower().replace("'", "")).strip("-")
+    return slug[:200].rstrip("-") or "movie"
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('movies') as batch_op:
+        batch_op.add_column(sa.Column('slug', sa.String(length=255), nullable=True))
+
+    # Backfill; the oldest movie keeps the bare slug, later ones get -2, -3...
+    connection = op.get_bind()
+    movies = sa.table('movies', sa.column('id', sa.Integer), sa.column('title', sa.String),
+                      sa.column('slug', sa.String))
+    taken = set()
+    updates = []
+    for movie_id, title in connection.execute(sa.select(movies.c.id, movies.c.title).order_by(movies.c.id)):
+        base = slug = _slugify(title)
+        suffix = 2
+        while slug in taken:
+            slug, suffix = f"{base}-{suffix}", suffix + 1
+        taken.add(slug)
+        updates.append({"movie_id": movie_id, "slug": slug})
+    if updates:
+        connection.execute(
+            movies.update().where(movies.c.id == sa.bindparam("movie_id")).values(slug=sa.bindparam("slug")),
+            updates,
+        )
+
+    op.create_index('ix_movies_slug', 'movies', ['slug'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_movies_slug', table_name='movies')
+    with op.batch_alter_table('movies') as batch_op:
+        batch_op.drop_column('slug')
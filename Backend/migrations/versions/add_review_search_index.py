@@ -0,0 +1,49 @@
+"""Add the full-text index behind /reviews/search
+
+Revision ID: add_review_search_index
+Revises: add_movie_slugs
+Create Date: 2026-10-19 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_review_search_index'
+down_revision: Union[str, None] = 'add_movie_slugs'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Frozen copy of models.review.REVIEWS_FTS_SQLITE at this revision
+SQLITE_FTS = (
+    "CREATE VIRTUAL TABLE reviews_fts USING fts5("
+    "review_text, content='reviews', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER reviews_fts_insert AFTER INSERT ON reviews BEGIN "
+    "INSERT INTO reviews_fts(rowid, review_text) VALUES (new.id, new.review_text); END",
+    "CREATE TRIGGER reviews_fts_delete AFTER DELETE ON reviews BEGIN "
+    "INSERT INTO reviews_fts(reviews_fts, rowid, review_text) VALUES ('delete', old.id, old.review_text); END",
+    "CREATE TRIGGER reviews_fts_update AFTER UPDATE OF review_text ON reviews BEGIN "
+    "INSERT INTO reviews_fts(reviews_fts, rowid, review_text) VALUES ('delete', old.id, old.review_text); "
+    "INSERT INTO reviews_fts(rowid, review_text) VALUES (new.id, new.review_text); END",
+)
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in SQLITE_FTS:
+            op.execute(statement)
+        # Index the reviews that already exist
+        op.execute("INSERT INTO reviews_fts(reviews_fts) VALUES ('rebuild')")
+    else:
+        op.execute("CREATE FULLTEXT INDEX ft_reviews_review_text ON reviews (review_text)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name == 'sqlite':
+        for trigger in ('reviews_fts_insert', 'reviews_fts_delete', 'reviews_fts_update'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS reviews_fts")
+    else:
+        op.drop_index('ft_reviews_review_text', table_name='reviews')
@@ -0,0 +1,26 @@
+"""Add (role_id, username) index for the admin user directory
+
+Revision ID: add_users_role_username_index
+Revises: add_covering_indexes
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'add_users_role_username_index'
+down_revision: Union[str, None] = 'add_covering_indexes'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Role-filtered directory pages walk this index in username order
+    op.create_index('ix_users_role_id_username', 'users', ['role_id', 'username'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_role_id_username', table_name='users')
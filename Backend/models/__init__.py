@@ -5,6 +5,8 @@ from . import genre
 from . import movie
 from . import review
 from . import favorite
+from . import sync_version
+from . import movie_tombstone
 
 
 
@@ -1,6 +1,6 @@
 from typing import Optional, TYPE_CHECKING
 from sqlmodel import SQLModel, Field, Relationship
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import UniqueConstraint, Index
 
 if TYPE_CHECKING:
     from .user import User
@@ -14,7 +14,11 @@ class Favorite(SQLModel, table=True):
     movie_id: int = Field(foreign_key="movies.id")
     
     # Add unique constraint to prevent duplicate favorites
-    __table_args__ = (UniqueConstraint('user_id', 'movie_id', name='unique_user_movie_favorite'),)
+    # (it also serves favorites-by-user lookups); movie_id index serves per-movie counts
+    __table_args__ = (
+        UniqueConstraint('user_id', 'movie_id', name='unique_user_movie_favorite'),
+        Index('ix_favorites_movie_id', 'movie_id'),
+    )
 
     # Relationships
     user: Optional["User"] = Relationship(back_populates="favorites")
@@ -16,6 +16,10 @@ class Movie(SQLModel, table=True):
     description: str
     image: Optional[str] = None
     release_date: Optional[date] = None
+    # Set from the title on create/update, with a -2, -3... suffix on collisions
+    slug: Optional[str] = Field(default=None, max_length=255, unique=True, index=True)
+    # Change version (see views/movie_changes.py); bumped on edits and rating changes
+    version: int = Field(default=0, index=True, sa_column_kwargs={"server_default": "0"})
 
 
     reviews: List["Review"] = Relationship(back_populates="movie")
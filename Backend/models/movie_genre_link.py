@@ -1,8 +1,11 @@
 from sqlmodel import SQLModel, Field
+from sqlalchemy import Index
 
 
 class MovieGenreLink(SQLModel, table=True):
     __tablename__ = "movie_genre_link"
+    # The primary key covers movie -> genres; this covers genre -> movies
+    __table_args__ = (Index("ix_movie_genre_link_genre_id_movie_id", "genre_id", "movie_id"),)
 
     movie_id: int|None = Field(default=None, foreign_key="movies.id", primary_key=True)
     genre_id: int|None = Field(default=None, foreign_key="genres.id", primary_key=True)
\ No newline at end of file
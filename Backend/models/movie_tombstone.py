@@ -0,0 +1,10 @@
+from sqlmodel import SQLModel, Field
+
+
+class MovieTombstone(SQLModel, table=True):
+    """A deleted movie, kept so delta-sync clients learn about the delete."""
+    __tablename__ = "movie_tombstones"
+
+    # No foreign key: the movie row is gone
+    movie_id: int = Field(primary_key=True)
+    version: int = Field(index=True)
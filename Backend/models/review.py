@@ -1,11 +1,17 @@
 from datetime import datetime
 from typing import Optional, TYPE_CHECKING
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import DDL, Index, event
 if TYPE_CHECKING:
     from .user import User
     from .movie import Movie
 class Review(SQLModel, table=True):
     __tablename__ = "reviews"
+    # Covering index for per-movie rating aggregates, and a user's reviews by date
+    __table_args__ = (
+        Index("ix_reviews_movie_id_rating", "movie_id", "rating"),
+        Index("ix_reviews_user_id_review_date", "user_id", "review_date"),
+    )
     id: Optional[int] = Field(default=None, primary_key=True)
     rating: int
     review_text: str
@@ -14,4 +20,27 @@ class Review(SQLModel, table=True):
     user_id: Optional[int] = Field(default=None, foreign_key="users.id")
     movie_id: Optional[int] = Field(default=None, foreign_key="movies.id")
     user: Optional["User"] = Relationship(back_populates="reviews")
-    movie: Optional["Movie"] = Relationship(back_populates="reviews")
\ No newline at end of file
+    movie: Optional["Movie"] = Relationship(back_populates="reviews")
+
+
+# Full-text index for /reviews/search (views/review_search.py). SQLite keeps
+# an external-content FTS5 table in step with triggers, so bulk inserts and
+# set-based deletes maintain it too; MySQL has a FULLTEXT index.
+REVIEWS_FTS_SQLITE = (
+    "CREATE VIRTUAL TABLE reviews_fts USING fts5("
+    "review_text, content='reviews', content_rowid='id', tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER reviews_fts_insert AFTER INSERT ON reviews BEGIN "
+    "INSERT INTO reviews_fts(rowid, review_text) VALUES (new.id, new.review_text); END",
+    "CREATE TRIGGER reviews_fts_delete AFTER DELETE ON reviews BEGIN "
+    "INSERT INTO reviews_fts(reviews_fts, rowid, review_text) VALUES ('delete', old.id, old.review_text); END",
+    "CREATE TRIGGER reviews_fts_update AFTER UPDATE OF review_text ON reviews BEGIN "
+    "INSERT INTO reviews_fts(reviews_fts, rowid, review_text) VALUES ('delete', old.id, old.review_text); "
+    "INSERT INTO reviews_fts(rowid, review_text) VALUES (new.id, new.review_text); END",
+)
+REVIEWS_FULLTEXT_MYSQL = "CREATE FULLTEXT INDEX ft_reviews_review_text ON reviews (review_text)"
+
+for _statement in REVIEWS_FTS_SQLITE:
+    event.listen(Review.__table__, "after_create", DDL(_statement).execute_if(dialect="sqlite"))
+event.listen(Review.__table__, "after_create", DDL(REVIEWS_FULLTEXT_MYSQL).execute_if(dialect="mysql"))
+event.listen(Review.__table__, "before_drop", DDL("DROP TABLE IF EXISTS reviews_fts").execute_if(dialect="sqlite"))
+
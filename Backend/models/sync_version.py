@@ -0,0 +1,9 @@
+from sqlmodel import SQLModel, Field
+
+
+class SyncVersion(SQLModel, table=True):
+    """Named change counters for delta sync (one row per synced collection)."""
+    __tablename__ = "sync_versions"
+
+    name: str = Field(primary_key=True, max_length=50)
+    value: int = 0
@@ -1,5 +1,6 @@
 from typing import Optional, TYPE_CHECKING, List
 from sqlmodel import SQLModel, Field, Relationship
+from sqlalchemy import Index
 if TYPE_CHECKING:
     from .role import Role
     from .review import Review
@@ -7,6 +8,8 @@ if TYPE_CHECKING:
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    # Admin directory: users of one role in username order
+    __table_args__ = (Index("ix_users_role_id_username", "role_id", "username"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str
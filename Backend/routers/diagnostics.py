@@ -0,0 +1,89 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+
+from diagnostics import profile_store, slow_query_log, memory_tracker
+from middleware.memory import AGAINST, GROUP_BY
+from middleware.slow_queries import SORT_KEYS
+from routers.user import require_admin_or_superadmin, User
+
+router = APIRouter(prefix="/diagnostics", tags=["diagnostics"])
+
+
+# GET lista snimljenih profila (najnoviji prvi)
+@router.get("/profiles")
+def list_profiles(
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(require_admin_or_superadmin),
+):
+    """
+    Recent request profiles: route, status, timing, statement count and the
+    functions with the most samples. Send `X-Profile: 1` as an admin to
+    profile a request, or set PROFILING_SAMPLE_RATE.
+    """
+    return profile_store.list(limit)
+
+
+# GET preuzimanje profila (folded stacks, npr. za speedscope ili flamegraph.pl)
+@router.get("/profiles/{profile_id}")
+def download_profile(profile_id: str, current_user: User = Depends(require_admin_or_superadmin)):
+    path = profile_store.path(profile_id)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=path.name)
+
+
+# GET najsporiji upiti grupisani po obliku upita (samo za ovaj proces)
+@router.get("/slow-queries")
+def list_slow_queries(
+    limit: int = Query(20, ge=1, le=500),
+    sort: str = Query("total_ms", description=f"One of {', '.join(SORT_KEYS)}"),
+    current_user: User = Depends(require_admin_or_superadmin),
+):
+    """
+    Statements slower than SLOW_QUERY_MS, grouped by template (literals and
+    placeholders replaced by ?), worst first. Each has its count, timings,
+    the routes that issued it, its parameter types and the EXPLAIN output
+    of its first slow run. Data is kept in memory by each worker.
+    """
+    try:
+        items = slow_query_log.top(limit, sort)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"threshold_ms": slow_query_log.threshold_ms, "items": items}
+
+
+# DELETE brisanje sakupljenih sporih upita (npr. posle dodavanja indeksa)
+@router.delete("/slow-queries", status_code=204)
+def clear_slow_queries(current_user: User = Depends(require_admin_or_superadmin)):
+    slow_query_log.clear()
+
+
+# GET stanje memorije: istorija snimaka i vrh potrosnje po ruti
+@router.get("/memory")
+def memory_status(current_user: User = Depends(require_admin_or_superadmin)):
+    """
+    tracemalloc totals and RSS for this worker, the history of periodic
+    snapshots, and the routes with the highest per-request allocation
+    peaks. Tracing is on when MEMORY_TRACKING_ENABLED is set.
+    """
+    return memory_tracker.status()
+
+
+# GET razlika izmedju trenutnog stanja i pocetnog (ili poslednjeg) snimka
+@router.get("/memory/diff")
+def memory_diff(
+    against: str = Query("baseline", description=f"One of {', '.join(AGAINST)}"),
+    group_by: str = Query("lineno", description=f"One of {', '.join(GROUP_BY)}"),
+    limit: int = Query(20, ge=1, le=500),
+    current_user: User = Depends(require_admin_or_superadmin),
+):
+    """
+    Allocation sites that grew the most since the startup snapshot
+    ("baseline") or the latest periodic one ("previous"). Empty when
+    tracing is off.
+    """
+    try:
+        items = memory_tracker.diff(against, group_by, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"tracing": memory_tracker.tracing, "against": against, "items": items}
@@ -0,0 +1,76 @@
+import asyncio
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+import events
+from database.config import settings
+
+router = APIRouter(prefix="/events", tags=["events"])
+
+
+# GET tok izmena (rating, broj recenzija i omiljenih) kao Server-Sent Events
+@router.get("")
+async def stream_events(
+    request: Request,
+    timeout: Optional[float] = Query(None, ge=0, description="Close the stream after this many seconds"),
+):
+    """
+    Server-Sent Events: `rating` ({movie_id, rating, reviews}), `favorites`
+    ({movie_id, favorites}) and `resync` (refetch, deltas were missed).
+    """
+    if events.hub.full:
+        raise HTTPException(status_code=503, detail="Too many live connections, retry later",
+                            headers={"Retry-After": "30"})
+    last_event_id = request.headers.get("last-event-id")
+    duration = min(settings.EVENTS_MAX_SECONDS, settings.EVENTS_MAX_SECONDS if timeout is None else timeout)
+
+    async def stream():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + duration
+        # Subscribed only once the body is being sent, so the finally below
+        # always runs for it: a client gone before that never subscribes
+        subscriber = events.hub.subscribe(last_event_id)
+        try:
+            yield f"retry: {settings.EVENTS_RETRY_MS}\n\n"
+            if subscriber is None:
+                return  # filled up since the check above; the client retries
+            while (remaining := deadline - loop.time()) > 0:
+                batch = await subscriber.next_batch(min(settings.EVENTS_HEARTBEAT_SECONDS, remaining))
+                # The worker is shutting down, or the client left: don't hold the connection open
+                if not events.hub.running or await request.is_disconnected():
+                    break
+                # A comment line keeps proxies from closing an idle stream
+                yield events.format_sse(batch) if batch else ": keepalive\n\n"
+        finally:
+            if subscriber is not None:
+                events.hub.unsubscribe(subscriber)
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",  # nginx: don't buffer the stream
+    })
+
+
+# WebSocket varijanta istog toka (poruke su JSON objekti sa "type")
+@router.websocket("/ws")
+async def websocket_events(websocket: WebSocket):
+    await websocket.accept()
+    subscriber = events.hub.subscribe(websocket.query_params.get("last_event_id"))
+    if subscriber is None:
+        await websocket.close(code=1013)  # try again later
+        return
+    try:
+        while True:
+            batch = await subscriber.next_batch(settings.EVENTS_HEARTBEAT_SECONDS)
+            if not events.hub.running:
+                await websocket.close(code=1012)  # service restart
+                break
+            # Idle sockets are only noticed as gone when a send fails
+            for event in batch or [{"type": "ping"}]:
+                await websocket.send_json(event)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        events.hub.unsubscribe(subscriber)
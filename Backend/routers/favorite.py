@@ -7,6 +7,8 @@ from models.favorite import Favorite
 from models.movie import Movie
 from models.user import User
 from schemas.favorite import FavoriteCreate, FavoriteRead, UserFavoritesResponse, MovieInFavorite
+from cache import get_cache, fill_cache, invalidate, FAVORITES
+from events import publish_favorites
 
 router = APIRouter(prefix="/favorites", tags=["favorites"])
 
@@ -42,12 +44,17 @@ def get_user_favorites(
     session: Session = Depends(get_session)
 ):
     """Get all favorites for the current user."""
-    statement = select(Favorite).where(Favorite.user_id == current_user.id)
-    favorites = session.exec(statement).all()
-    
-    # Get movie details for each favorite
-    movie_ids = [fav.movie_id for fav in favorites]
-    movies_statement = select(Movie).where(Movie.id.in_(movie_ids))
+    cache_key = f"{FAVORITES}{current_user.id}"
+    cached = get_cache().get(cache_key)
+    if cached is not None:
+        return UserFavoritesResponse(**cached)
+
+    # Favorites and their movie details in one joined query
+    movies_statement = (
+        select(Movie.id, Movie.title, Movie.image, Movie.slug)
+        .join(Favorite, Favorite.movie_id == Movie.id)
+        .where(Favorite.user_id == current_user.id)
+    )
     movies = session.exec(movies_statement).all()
     
     # Convert to response format
@@ -55,15 +62,18 @@ def get_user_favorites(
         MovieInFavorite(
             id=movie.id,
             title=movie.title,
-            image=movie.image
+            image=movie.image,
+            slug=movie.slug
         )
         for movie in movies
     ]
     
-    return UserFavoritesResponse(
+    response = UserFavoritesResponse(
         user_id=current_user.id,
         favorites=movie_favorites
     )
+    fill_cache(session, cache_key, response.model_dump())
+    return response
 
 @router.get("/check/{movie_id}")
 def check_favorite_status(
@@ -120,29 +130,16 @@ def add_favorite(
     session.add(new_favorite)
     session.commit()
     session.refresh(new_favorite)
+    invalidate(f"{FAVORITES}{current_user.id}")
+    publish_favorites(session, [movie_id])
     
     return new_favorite
 
-# ---------------------
-# Delete endpoint
-# ---------------------
-
-@router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
-def remove_favorite(
-    movie_id: int,
-    current_user: User = Depends(require_logged_in_user),
-    session: Session = Depends(get_session)
-):
-    """Remove a movie from user's favorites."""
-    favorite = _get_favorite_or_404(current_user.id, movie_id, session)
-    session.delete(favorite)
-    session.commit()
-    return
-
 # ---------------------
 # Bulk operations (optional)
 # ---------------------
 
+# Declared before DELETE /{movie_id} so "clear" isn't parsed as a movie id
 @router.delete("/clear", status_code=status.HTTP_204_NO_CONTENT)
 def clear_all_favorites(
     current_user: User = Depends(require_logged_in_user),
@@ -152,8 +149,31 @@ def clear_all_favorites(
     statement = select(Favorite).where(Favorite.user_id == current_user.id)
     favorites = session.exec(statement).all()
     
+    user_id = current_user.id  # read before commit expires the instance
+    movie_ids = [favorite.movie_id for favorite in favorites]
     for favorite in favorites:
         session.delete(favorite)
     
     session.commit()
-    return
\ No newline at end of file
+    invalidate(f"{FAVORITES}{user_id}")
+    publish_favorites(session, movie_ids)
+    return
+
+# ---------------------
+# Delete endpoint
+# ---------------------
+
+@router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
+def remove_favorite(
+    movie_id: int,
+    current_user: User = Depends(require_logged_in_user),
+    session: Session = Depends(get_session)
+):
+    """Remove a movie from user's favorites."""
+    user_id = current_user.id  # read before commit expires the instance
+    favorite = _get_favorite_or_404(user_id, movie_id, session)
+    session.delete(favorite)
+    session.commit()
+    invalidate(f"{FAVORITES}{user_id}")
+    publish_favorites(session, [movie_id])
+    return
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException, Depends, Query
+from sqlmodel import Session
+from typing import List, Optional
+from database.database import get_session
+from schemas.genre import GenreStats, GenreMoviesPage
+from views.genres import get_genre_stats, get_genre_movies_page
+from cache import get_cache, fill_cache, GENRES
+
+router = APIRouter(prefix="/genres", tags=["genres"])
+
+# GET svi zanrovi sa brojem filmova i prosecnom ocenom
+@router.get("/", response_model=List[GenreStats])
+def list_genres(session: Session = Depends(get_session)):
+    cache_key = f"{GENRES}stats"
+    cached = get_cache().get(cache_key)
+    if cached is not None:
+        return cached
+    stats = get_genre_stats(session)
+    fill_cache(session, cache_key, stats)
+    return stats
+
+# GET filmovi jednog zanra, stranicu po stranicu
+@router.get("/{name}/movies", response_model=GenreMoviesPage)
+def list_genre_movies(
+    name: str,
+    limit: int = Query(20, ge=1, le=100),
+    after: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    session: Session = Depends(get_session)
+):
+    cache_key = f"{GENRES}movies:{name}:{limit}:{after or ''}"
+    cached = get_cache().get(cache_key)
+    if cached is not None:
+        return cached
+    page = get_genre_movies_page(session, name, limit, after)
+    if page is None:
+        raise HTTPException(status_code=404, detail="Genre not found")
+    movies, next_cursor = page
+    response = {"items": movies, "next_cursor": next_cursor}
+    fill_cache(session, cache_key, response)
+    return response
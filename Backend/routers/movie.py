@@ -1,17 +1,34 @@
-from fastapi import APIRouter, HTTPException, Depends, Query, status
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, status
+from fastapi.responses import Response
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 from typing import List, Optional
-from database.database import engine
+from database.database import engine, get_session
+from database.config import settings
 from models.movie import Movie
-from schemas.movie import MovieCreate, MovieRead, MovieReadWithGenres
+from schemas.movie import MovieCreate, MovieRead, MovieReadWithGenres, MovieFull, MovieChanges, MovieFacetsPage
 from views.movie_views import (
     get_movie_rating, 
     get_movie_genres, 
-    create_movie_slug,
+    unique_movie_slug,
     get_movies_with_filters,
-    build_movie_response_data
+    build_movie_response_data,
+    build_movies_response_data,
+    parse_movie_fields,
+    parse_movie_ids,
+    get_movies_by_ids,
+    get_movie_rows,
+    delete_movie_cascade,
+    MOVIE_LIST_FIELDS
 )
+from views.serialization import movie_list_response, sparse_list_response
+from views.random_movie import get_random_movie, random_movie_sampler
+from views.movie_full import load_movie_full
+from views.movie_facets import browse_movies
+from views.movie_changes import get_movie_changes, touch_movies, record_movie_deleted, forget_tombstone
+from views.user import get_token_user_id
 from routers.user import require_admin_or_superadmin, User
+from cache import get_cache, fill_cache, invalidate, MOVIE_LIST, MOVIE_DETAIL, FAVORITES, GENRES
 
 router = APIRouter(prefix="/movies", tags=["movies"])
 
@@ -19,49 +36,153 @@ router = APIRouter(prefix="/movies", tags=["movies"])
 @router.get("/", response_model=List[MovieReadWithGenres])
 def get_movies(
     genre: Optional[str] = Query(None, description="Filter by genre name"),
-    sort: Optional[str] = Query("desc", description="Sort by rating: 'asc' or 'desc'")
+    sort: Optional[str] = Query("desc", description="Sort by rating: 'asc' or 'desc'"),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. 'title,rating,slug' (id is always included)"),
+    format: str = Query("rows", pattern="^(rows|columnar)$", description="'columnar' returns {count, columns: {field: [values]}}"),
+    session: Session = Depends(get_session)
 ):
-    with Session(engine) as session:
-        # Use view function for filtering logic
-        movies = get_movies_with_filters(session, genre, sort)
-
-        # Build response with calculated fields using view function
-        movie_responses = []
-        for movie in movies:
-            if movie.id is None:
-                continue  # Skip movies without id
-                
-            response_data = build_movie_response_data(session, movie)
-            if response_data:
-                movie_response = MovieReadWithGenres(**response_data)
-                movie_responses.append(movie_response)
-        
-        # Sort by rating
-        if sort == "asc":
-            movie_responses.sort(key=lambda x: x.rating)
-        else:  # desc
-            movie_responses.sort(key=lambda x: x.rating, reverse=True)
-        
-        return movie_responses
+    try:
+        selected = parse_movie_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+    # Sparse and columnar lists skip the ORM objects and response_model entirely
+    if selected is not None or format == "columnar":
+        selected = selected or list(MOVIE_LIST_FIELDS)
+        cache_key = f"{MOVIE_LIST}{genre or ''}:{sort}:{','.join(selected)}:{format}"
+        cached_body = get_cache().get(cache_key)
+        if cached_body is not None:
+            return Response(content=cached_body, media_type="application/json")
+        rows = get_movie_rows(session, selected, genre, sort)
+        response = sparse_list_response(rows, selected, columnar=format == "columnar")
+        fill_cache(session, cache_key, response.body)
+        return response
+
+    cache_key = f"{MOVIE_LIST}{genre or ''}:{sort}"
+    if settings.FAST_SERIALIZATION:
+        cached_body = get_cache().get(cache_key)
+        if cached_body is not None:
+            return Response(content=cached_body, media_type="application/json")
+
+    # Use view function for filtering logic
+    movies = get_movies_with_filters(session, genre, sort)
+
+    # Build response with calculated fields using view function
+    rows = build_movies_response_data(session, movies, all_movies=not genre)
+    
+    # Sort by rating
+    if sort == "asc":
+        rows.sort(key=lambda x: x["rating"])
+    else:  # desc
+        rows.sort(key=lambda x: x["rating"], reverse=True)
+
+    if settings.FAST_SERIALIZATION:
+        response = movie_list_response(rows)
+        fill_cache(session, cache_key, response.body)
+        return response
+    return [MovieReadWithGenres(**row) for row in rows]
+
+# GET nasumican film (optionally within a genre)
+@router.get("/random", response_model=MovieReadWithGenres)
+def get_random(
+    genre: Optional[str] = Query(None, description="Only sample movies of this genre"),
+    session: Session = Depends(get_session)
+):
+    movie = get_random_movie(session, genre)
+    if not movie:
+        raise HTTPException(status_code=404, detail="Movie not found")
+
+    response_data = build_movie_response_data(session, movie)
+    if not response_data:
+        raise HTTPException(status_code=404, detail="Movie not found")
+
+    return MovieReadWithGenres(**response_data)
+
+# GET izmene kataloga od date verzije (delta sync)
+@router.get("/changes", response_model=MovieChanges)
+def get_changes(
+    since: Optional[int] = Query(None, ge=0, description="Version from the previous response; omit for the full catalog"),
+    session: Session = Depends(get_session)
+):
+    return get_movie_changes(session, since)
+
+# GET filtriranje kataloga po fasetama (zanr, reziser, decenija, ocena) sa brojem filmova po vrednosti
+@router.get("/facets", response_model=MovieFacetsPage)
+def get_movie_facets(
+    genre: List[str] = Query([], description="Any of these genres (repeat the parameter)"),
+    director: List[str] = Query([], description="Any of these directors"),
+    rating: List[str] = Query([], description="Rating buckets: 9-10, 7-9, 5-7, 3-5, 1-3, unrated"),
+    year_from: Optional[int] = Query(None, description="Released in or after this year"),
+    year_to: Optional[int] = Query(None, description="Released in or before this year"),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    facet_limit: int = Query(20, ge=1, le=200, description="How many directors to count"),
+    session: Session = Depends(get_session)
+):
+    filters = {"genre": genre, "director": director, "rating": rating}
+    return browse_movies(session, filters, year_from, year_to, limit, offset, facet_limit)
+
+# GET vise filmova odjednom, redom kojim su trazeni (omiljeni, preporuke, istorija)
+@router.get("/batch", response_model=List[MovieReadWithGenres])
+def get_movies_batch(
+    ids: str = Query(..., description="Comma-separated movie ids, e.g. '12,3,40'; unknown ids are skipped"),
+    session: Session = Depends(get_session)
+):
+    try:
+        movie_ids = parse_movie_ids(ids, settings.MOVIE_BATCH_MAX_IDS)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return get_movies_by_ids(session, movie_ids)
+
+# GET film po slug-u (deep link /movie/:slug)
+@router.get("/by-slug/{slug}", response_model=MovieReadWithGenres)
+def get_movie_by_slug(slug: str, session: Session = Depends(get_session)):
+    movie_id = session.exec(select(Movie.id).where(Movie.slug == slug)).first()
+    if movie_id is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    # Same response and cache entry as GET /movies/{movie_id}
+    return get_movie(movie_id, session)
 
 # GET film po id
 @router.get("/{movie_id}", response_model=MovieReadWithGenres)
-def get_movie(movie_id: int):
-    with Session(engine) as session:
-        movie = session.get(Movie, movie_id)
-        if not movie:
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        # Ensure movie has valid ID
-        if movie.id is None:
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        # Use view function to build response data
-        response_data = build_movie_response_data(session, movie)
-        if not response_data:
-            raise HTTPException(status_code=404, detail="Movie not found")
-        
-        return MovieReadWithGenres(**response_data)
+def get_movie(movie_id: int, session: Session = Depends(get_session)):
+    cache_key = f"{MOVIE_DETAIL}{movie_id}"
+    cached = get_cache().get(cache_key)
+    if cached is not None:
+        return MovieReadWithGenres(**cached)
+
+    movie = session.get(Movie, movie_id)
+    if not movie:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    
+    # Ensure movie has valid ID
+    if movie.id is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    
+    # Use view function to build response data
+    response_data = build_movie_response_data(session, movie)
+    if not response_data:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    
+    fill_cache(session, cache_key, response_data)
+    return MovieReadWithGenres(**response_data)
+
+# GET sve sto treba modalu filma u jednom zahtevu
+@router.get("/{movie_id}/full", response_model=MovieFull)
+async def get_movie_full(
+    movie_id: int,
+    request: Request,
+    reviews_limit: int = Query(10, ge=1, le=50, description="Size of the first page of reviews"),
+    user_id: Optional[int] = Depends(get_token_user_id)
+):
+    try:
+        data = await load_movie_full(request, movie_id, user_id, reviews_limit,
+                                     settings.MOVIE_FULL_TIMEOUT_SECONDS)
+    except TimeoutError:
+        raise HTTPException(status_code=504, detail="Loading the movie took too long")
+    if data is None:
+        raise HTTPException(status_code=404, detail="Movie not found")
+    return data
 
 # POST novi film (admin/superadmin)
 @router.post("/", response_model=MovieRead)
@@ -83,11 +204,20 @@ def create_movie(movie: MovieCreate, current_user: User = Depends(require_admin_
         # Create movie with calculated ID
         movie_data = movie.model_dump()
         movie_data['id'] = next_id
+        movie_data['slug'] = unique_movie_slug(session, movie.title)
         
         new_movie = Movie(**movie_data)
         session.add(new_movie)
+        try:
+            session.flush()
+        except IntegrityError:
+            raise HTTPException(status_code=409, detail="A movie with this title was just created, retry")
+        forget_tombstone(session, next_id)
+        touch_movies(session, [next_id])
         session.commit()
         session.refresh(new_movie)
+        random_movie_sampler.add(new_movie.id, get_movie_genres(session, new_movie.id))
+        invalidate(MOVIE_LIST)
         return new_movie
 
 # DELETE film po id (admin/superadmin)
@@ -95,11 +225,14 @@ def create_movie(movie: MovieCreate, current_user: User = Depends(require_admin_
 def delete_movie(movie_id: int, current_user: User = Depends(require_admin_or_superadmin)):
     
     with Session(engine) as session:
-        movie = session.get(Movie, movie_id)
-        if not movie:
+        # Reviews, favorites and genre links go in the same transaction
+        if not delete_movie_cascade(session, movie_id):
             raise HTTPException(status_code=404, detail="Movie not found")
-        session.delete(movie)
+        record_movie_deleted(session, movie_id)
         session.commit()
+        random_movie_sampler.remove(movie_id)
+        # Favorites lists embed the movie's title and image
+        invalidate(MOVIE_LIST, f"{MOVIE_DETAIL}{movie_id}", FAVORITES, GENRES)
         return {"message": "Movie deleted"}
 
 # PUT update filma 
@@ -112,10 +245,19 @@ def update_movie(movie_id: int, movie_update: MovieCreate, current_user: User =
             raise HTTPException(status_code=404, detail="Movie not found")
         
         update_data = movie_update.model_dump(exclude_unset=True)
+        # Links keep working unless the title actually changes
+        if "title" in update_data and update_data["title"] != movie.title:
+            update_data["slug"] = unique_movie_slug(session, update_data["title"], movie_id)
         for field, value in update_data.items():
             setattr(movie, field, value)
         
         session.add(movie)
+        try:
+            session.flush()
+        except IntegrityError:
+            raise HTTPException(status_code=409, detail="A movie with this title was just created, retry")
+        touch_movies(session, [movie_id])
         session.commit()
         session.refresh(movie)
+        invalidate(MOVIE_LIST, f"{MOVIE_DETAIL}{movie_id}", FAVORITES, GENRES)
         return movie
\ No newline at end of file
@@ -1,12 +1,17 @@
 from typing import List, Optional, Any
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
 import views.user as user_views  # assumes views.user.get_current_user2 exists
 from database.database import get_session
 from models.review import Review
 from models.movie import Movie
 from models.user import User
-from schemas.review import ReviewCreate, ReviewRead
+from schemas.review import ReviewCreate, ReviewRead, ReviewSearchPage
+from cache import invalidate, MOVIE_LIST, MOVIE_DETAIL, GENRES
+from events import publish_rating
+from views.movie_changes import touch_movies
+from views.review_search import search_reviews
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 # ---------------------
 # Helpers / auth checks
@@ -76,13 +81,32 @@ def list_reviews(movie_id: Optional[int] = Query(None, description="Optional fil
     """
     List reviews. Optional filter by movie_id.
     """
-    stmt = select(Review)
+    # Load authors and movies up front instead of one lazy load per review
+    stmt = select(Review).options(selectinload(Review.user), selectinload(Review.movie))
     if movie_id is not None:
         stmt = stmt.where(Review.movie_id == movie_id)
     reviews = session.exec(stmt).all()
     return reviews
 
 
+@router.get("/search", response_model=ReviewSearchPage)
+def search(
+    q: str = Query(..., min_length=1, max_length=200, description="Words to find in review text"),
+    movie_id: Optional[int] = Query(None, description="Only reviews of this movie"),
+    user_id: Optional[int] = Query(None, description="Only reviews by this user"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    session: Session = Depends(get_session),
+):
+    """
+    Full-text search over review text, best matches first.
+    """
+    try:
+        return search_reviews(session, q, movie_id, user_id, limit, cursor)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
 @router.get("/{review_id}", response_model=ReviewRead)
 def get_review(review_id: int, session: Session = Depends(get_session)):
     """
@@ -119,8 +143,12 @@ def create_review(
 
     new_review = Review(**payload)
     session.add(new_review)
+    touch_movies(session, [movie_id])
     session.commit()
     session.refresh(new_review)
+    # The movie's average rating changed
+    invalidate(MOVIE_LIST, f"{MOVIE_DETAIL}{movie_id}", GENRES)
+    publish_rating(session, movie_id)
     return new_review
 # ---------------------
 # Update (ONLY owner)
@@ -156,8 +184,12 @@ def update_review(
     for field, value in update_data.items():
         setattr(review, field, value)
     session.add(review)
+    if "rating" in update_data:
+        touch_movies(session, [review.movie_id])
     session.commit()
     session.refresh(review)
+    invalidate(MOVIE_LIST, f"{MOVIE_DETAIL}{review.movie_id}", GENRES)
+    publish_rating(session, review.movie_id)
     return review
 # ---------------------
 # Delete (owner OR admin/superadmin)
@@ -171,6 +203,10 @@ def delete_review(
     review: Review = Depends(require_review_owner_or_admin),
     session: Session = Depends(get_session),
 ):
+    movie_id = review.movie_id
     session.delete(review)
+    touch_movies(session, [movie_id])
     session.commit()
+    invalidate(MOVIE_LIST, f"{MOVIE_DETAIL}{movie_id}", GENRES)
+    publish_rating(session, movie_id)
     return
@@ -1,12 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from typing import List
+from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile, status
+from typing import List, Optional
 
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlmodel import Session, select
 from database.database import get_db, get_session
+from database.config import settings
 from models.user import User
-from schemas.user import UserUpdate, UserRead, Register, Token, Login
+from schemas.user import UserUpdate, UserRead, UserPage, Register, Token, Login, ImportReport
 import views.user as user_views
+import views.user_import as user_import
+from cache import get_cache, fill_cache, invalidate, USERS, FAVORITES, MOVIES, GENRES
+from events import publish_ratings, publish_favorites
 
 router = APIRouter(prefix="/users", tags=["users"])
 # oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
@@ -31,9 +35,29 @@ def require_superadmin(user: User = Depends(user_views.get_current_user2)):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Operation not permitted")
     return user
 
-@router.get("/", response_model=List[UserRead])
-def list_all_users(session:Session = Depends(get_session), current_user:User=Depends(require_superadmin)):
-    return user_views.get_all_users(session)
+@router.get("/", response_model=UserPage)
+def list_all_users(
+    limit: int = Query(50, ge=1, le=500),
+    after: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    q: Optional[str] = Query(None, min_length=1, description="Username or email prefix"),
+    role: Optional[str] = Query(None, pattern="^(regular|admin|superadmin)$"),
+    session:Session = Depends(get_session),
+    current_user:User=Depends(require_superadmin)
+):
+    cache_key = f"{USERS}list:{limit}:{after or ''}:{q or ''}:{role or ''}"
+    cached = get_cache().get(cache_key)
+    if cached is not None:
+        return cached
+    users, next_cursor = user_views.get_users_page(session, limit, after, q, role)
+    page = {
+        "items": [
+            {**UserRead.model_validate(user).model_dump(), "role": role_name_of_user(user)}
+            for user in users
+        ],
+        "next_cursor": next_cursor,
+    }
+    fill_cache(session, cache_key, page)
+    return page
 
 @router.get("/me")
 def get_current_user_profile(current_user: User = Depends(user_views.get_current_user2)):
@@ -53,14 +77,42 @@ def get_current_user_profile(current_user: User = Depends(user_views.get_current
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED )
 def register_user(user_data:Register, session:Session = Depends(get_session)):
-    return user_views.register2(session, user_data)
+    new_user = user_views.register2(session, user_data)
+    invalidate(USERS)
+    return new_user
+
+@router.post("/import", response_model=ImportReport)
+def bulk_import_users(
+    file: UploadFile = File(..., description="CSV with a header row, or NDJSON (one user object per line)"),
+    format: Optional[str] = Query(None, pattern="^(csv|ndjson)$", description="Defaults from the file name"),
+    dry_run: bool = Query(False, description="Only validate and check for conflicts"),
+    session:Session = Depends(get_session),
+    current_user:User=Depends(require_superadmin)
+):
+    try:
+        text = file.file.read().decode("utf-8-sig")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=422, detail="Import file must be UTF-8")
+    records = user_import.parse_records(text, format or user_import.detect_format(file.filename, file.content_type))
+    if len(records) > settings.IMPORT_MAX_ROWS:
+        raise HTTPException(status_code=413, detail=f"At most {settings.IMPORT_MAX_ROWS} rows per import")
+
+    report = user_import.import_users(session, records, settings.IMPORT_BATCH_SIZE, dry_run,
+                                      settings.IMPORT_HASH_WORKERS)
+    if report["created"]:
+        invalidate(USERS)
+    return report
 
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 def delete_user(user_id:int, session:Session = Depends(get_session), current_user:User=Depends(require_superadmin)):
     user = user_views.get_user_by_id(session, user_id)
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    user_views.delete_user(session, user)
+    reviewed, favorited = user_views.delete_user(session, user)
+    # Their reviews moved the ratings of every movie they reviewed
+    invalidate(USERS, f"{FAVORITES}{user_id}", *([MOVIES, GENRES] if reviewed else []))
+    publish_ratings(session, reviewed)
+    publish_favorites(session, favorited)
     return
 
 @router.post("/login", response_model=Token)
@@ -75,12 +127,16 @@ def promote_user(user_id:int, session:Session = Depends(get_session), current_us
     target_user = user_views.get_user_by_id(session, user_id)
     if not target_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user_views.promote_user_to_admin(session, target_user)
+    promoted = user_views.promote_user_to_admin(session, target_user)
+    invalidate(USERS)
+    return promoted
 
 @router.put("/{user_id}/demote", response_model=UserRead)
 def demote_user(user_id:int, session:Session = Depends(get_session), current_user:User=Depends(require_superadmin)):
     target_user = user_views.get_user_by_id(session, user_id)
     if not target_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    return user_views.demote_admin_to_regular(session, target_user)
+    demoted = user_views.demote_admin_to_regular(session, target_user)
+    invalidate(USERS)
+    return demoted
     
@@ -10,6 +10,7 @@ class MovieInFavorite(BaseModel):
     id: int
     title: str
     image: Optional[str] = None
+    slug: Optional[str] = None
 
 class FavoriteBase(BaseModel):
     movie_id: int
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Optional
+from schemas.movie import MovieReadWithGenres
+
+class GenreStats(BaseModel):
+    name: str
+    movie_count: int
+    review_count: int
+    # Mean of all reviews of the genre's movies; 0.0 without reviews
+    rating: float
+
+class GenreMoviesPage(BaseModel):
+    items: list[MovieReadWithGenres]
+    # Pass as `after` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
@@ -1,6 +1,7 @@
 from pydantic import BaseModel
 from typing import Optional
 from datetime import date
+from schemas.review import ReviewRead
 
 class MovieBase(BaseModel):
     title: str
@@ -33,3 +34,31 @@ class MovieResponse(BaseModel):
     genres: list[str]
     image: Optional[str] = None
     slug: str
+
+class MovieFull(BaseModel):
+    """Movie page data in one response: details, first reviews, histogram, favorite status"""
+    movie: MovieReadWithGenres
+    reviews: list[ReviewRead]
+    review_count: int
+    rating_histogram: dict[int, int]
+    # None for anonymous callers
+    is_favorite: Optional[bool] = None
+
+class MovieChanges(BaseModel):
+    """Catalog delta since a client's last sync version"""
+    version: int
+    # True: `movies` is the whole catalog, replace the local copy
+    reset: bool
+    movies: list[MovieReadWithGenres]
+    deleted: list[int]
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+class MovieFacetsPage(BaseModel):
+    """Filtered movies, best rated first, with counts for every facet value"""
+    total: int
+    items: list[MovieReadWithGenres]
+    # genre, director, decade, rating -> values; each facet's counts ignore its own filter
+    facets: dict[str, list[FacetCount]]
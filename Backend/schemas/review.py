@@ -1,6 +1,6 @@
 from datetime import datetime
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Optional
 
 # Minimal info about user and movie for displaying in review
 class UserInReview(BaseModel):
@@ -23,4 +23,15 @@ class ReviewRead(ReviewBase):
     id: int
     review_date: datetime
     user: Optional[UserInReview] = None
-    movie: Optional[MovieInReview] = None
\ No newline at end of file
+    movie: Optional[MovieInReview] = None
+
+class ReviewSearchHit(ReviewRead):
+    # Higher is a better match; only comparable within one search
+    score: float
+    # Part of review_text around the first match, matches wrapped in <mark>
+    snippet: str
+
+class ReviewSearchPage(BaseModel):
+    items: List[ReviewSearchHit]
+    next_cursor: Optional[str] = None
+
@@ -1,6 +1,6 @@
-from typing import Optional, Annotated
+from typing import Optional, Annotated, Literal
 from sqlmodel import SQLModel
-from pydantic import EmailStr, BaseModel, ConfigDict, Field, constr
+from pydantic import EmailStr, BaseModel, ConfigDict, Field, constr, model_validator
 
 class Token(BaseModel):
     access_token: str
@@ -45,6 +45,17 @@ class UserRead(UserBase):
 
 
 
+class UserListItem(UserRead):
+    role: Optional[str] = None
+
+
+class UserPage(BaseModel):
+    items: list[UserListItem]
+    # Pass as `after` to get the next page; None on the last page
+    next_cursor: Optional[str] = None
+
+
+
 class Register(SQLModel):
     username: Annotated[str, Field(..., min_length=2, max_length=16)]
     password: Annotated[str, Field(..., min_length=8)]
@@ -58,4 +69,41 @@ class Register(SQLModel):
 class Login(SQLModel):
     username: str
     password: str
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+    model_config = ConfigDict(from_attributes=True)
+
+
+class UserImport(SQLModel):
+    """One row of a bulk import: Register fields, plus an optional role.
+
+    Either `password` or an existing bcrypt `hashed_password` (e.g. exported
+    from another system) must be given.
+    """
+    username: Annotated[str, Field(..., min_length=2, max_length=16)]
+    password: Optional[Annotated[str, Field(min_length=8)]] = None
+    hashed_password: Optional[str] = None
+    email: EmailStr
+    name: str
+    surname: str
+    address: Optional[str] = None
+    role: Literal["regular", "admin"] = "regular"
+
+    @model_validator(mode="after")
+    def one_password(self):
+        if bool(self.password) == bool(self.hashed_password):
+            raise ValueError("give exactly one of password or hashed_password")
+        return self
+
+
+class ImportRowResult(BaseModel):
+    row: int
+    username: Optional[str] = None
+    status: Literal["created", "valid", "error"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class ImportReport(BaseModel):
+    created: int
+    failed: int
+    dry_run: bool = False
+    rows: list[ImportRowResult]
@@ -0,0 +1,45 @@
+"""
+Production entry point: serves the app with WEB_CONCURRENCY worker processes.
+
+Usage (from Backend/):
+    WEB_CONCURRENCY=4 CACHE_BACKEND=redis CACHE_REDIS_URL=redis://... python serve.py
+
+Every worker imports the app itself, so each one builds its own engine and
+connection pool. Under gunicorn --preload the after-fork hooks registered in
+database/, cache/ and views/ reset the inherited state instead.
+
+The schema and default roles are created here, once, before the workers
+start; the workers see INIT_DB_ON_STARTUP=false and skip it, since
+otherwise every worker's startup would race to create the same tables
+(and with one worker, the schema would be created twice).
+"""
+import os
+
+import uvicorn
+
+from database.config import settings
+from database.workers import ensure_safe_worker_config
+
+
+def main():
+    # Fail here with a readable error rather than once per worker
+    ensure_safe_worker_config(settings)
+
+    from database.database import engine, init_db
+    init_db()
+    engine.dispose()
+    # Worker processes build their own settings and read this from the environment;
+    # a single worker runs in this process and shares the settings already built here
+    os.environ["INIT_DB_ON_STARTUP"] = "false"
+    settings.INIT_DB_ON_STARTUP = False
+
+    uvicorn.run(
+        "main:app",
+        host=settings.HOST,
+        port=settings.PORT,
+        workers=settings.WEB_CONCURRENCY,
+    )
+
+
+if __name__ == "__main__":
+    main()
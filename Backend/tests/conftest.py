@@ -0,0 +1,112 @@
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+import pytest
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+# Settings and the engine are created at import time, so point them at a
+# scratch SQLite file before anything imports the app.
+_db_dir = tempfile.mkdtemp(prefix="criticrew-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_dir}/test.db"
+os.environ["DB_ECHO"] = "false"
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+os.environ["PROFILING_DIR"] = f"{_db_dir}/profiles"
+# Off by default; the diagnostics tests need them installed on the app
+os.environ["PROFILING_ENABLED"] = "true"
+os.environ["SLOW_QUERY_ENABLED"] = "true"
+
+# Pre-hashed ("import-password"), so imports in tests don't spend seconds in bcrypt
+IMPORT_HASH = "$2b$12$Nh9t3fYiI.xfi3ix0FQkG.zEVI50k3Z09fYz1YjjQgqlZe4Jk/7BK"
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine):
+    """Record every SQL statement sent to `engine` inside the block."""
+    from sqlalchemy import event
+
+    counter = QueryCounter()
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.fixture(scope="session")
+def engine():
+    from database.database import engine
+    return engine
+
+
+@pytest.fixture(scope="session")
+def app():
+    import main
+    return main.app
+
+
+def reset_app_state():
+    """Forget what the app keeps in memory between requests: the cache and the in-process indexes."""
+    from cache import get_cache
+    from database.database import session_router
+    from views.movie_facets import movie_facet_index
+    from views.random_movie import random_movie_sampler
+
+    get_cache().clear()
+    random_movie_sampler.reset()
+    movie_facet_index.reset()
+    session_router.reset()
+
+
+def seed(engine, movies: int):
+    """Reseed the database with `movies` movies (and matching users, reviews...) from a clean slate."""
+    from benchmarks.data_generator import seed_database
+
+    seed_database(engine, movies)
+    reset_app_state()
+
+
+def auth_headers(client, username: str) -> dict:
+    from benchmarks.data_generator import DEFAULT_PASSWORD
+
+    response = client.post("/users/login", data={"username": username, "password": DEFAULT_PASSWORD})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="module")
+def seed_movies():
+    """How many movies `client` seeds; override this fixture in a module that needs more."""
+    return 10
+
+
+@pytest.fixture(scope="module")
+def client(app, engine, seed_movies):
+    """A TestClient on freshly seeded data, logged in as user1 (the superadmin).
+
+    `client.regular_headers` authenticates as user2, a regular user.
+    """
+    from fastapi.testclient import TestClient
+
+    seed(engine, seed_movies)
+    with TestClient(app) as client:
+        client.headers.update(auth_headers(client, "user1"))
+        client.regular_headers = auth_headers(client, "user2")
+        yield client
@@ -0,0 +1,110 @@
+"""Cache backends, the binary codec and cross-worker invalidation over Redis pub/sub."""
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from cache import serialization
+from cache.backends import InProcessCache, RedisCache, TieredCache
+
+
+def test_codec_round_trips_and_compresses():
+    rows = [{"id": i, "title": f"Movie {i}", "release_date": date(2000, 1, 1)} for i in range(200)]
+    data = serialization.dumps(rows)
+    assert data[:1] == serialization.ZLIB_JSON
+    assert serialization.loads(data)[5] == {"id": 5, "title": "Movie 5", "release_date": "2000-01-01"}
+
+    body = b'{"a":1}'
+    assert serialization.loads(serialization.dumps(body)) == body
+
+
+def test_in_process_cache_expiry_lru_and_prefixes():
+    cache = InProcessCache(max_entries=2, default_ttl=60)
+    cache.set("movies:list:a", 1)
+    cache.set("movies:detail:1", 2, ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("movies:detail:1") is None
+
+    cache.set("users:list", 3)
+    cache.set("movies:list:b", 4)  # evicts the least recently used entry
+    assert cache.get("movies:list:a") is None
+    assert not cache.invalidated_within(60)
+    cache.invalidate("movies:")
+    assert cache.invalidated_within(60) and not cache.invalidated_within(0)
+    assert cache.get("movies:list:b") is None
+    assert cache.get("users:list") == 3
+
+
+def start_server(port=0):
+    fakeredis = pytest.importorskip("fakeredis")
+    # Reusable, so an "outage" can come back on the same port
+    server_class = type("ReusableFakeServer", (fakeredis.TcpFakeServer,), {"allow_reuse_address": True})
+    server = server_class(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def stop_server(server):
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def redis_server():
+    pytest.importorskip("redis")
+    servers = [start_server()]
+    yield servers
+    stop_server(servers[-1])
+
+
+@pytest.fixture
+def redis_url(redis_server):
+    host, port = redis_server[0].server_address
+    return f"redis://{host}:{port}/0"
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_workers_share_values_and_invalidate_each_other(redis_url):
+    worker_a = TieredCache(InProcessCache(), RedisCache(redis_url))
+    worker_b = TieredCache(InProcessCache(), RedisCache(redis_url))
+    time.sleep(0.1)  # let both subscribers attach
+
+    worker_a.set("movies:detail:1", {"id": 1, "title": "Heat"})
+    assert worker_b.get("movies:detail:1") == {"id": 1, "title": "Heat"}
+    assert worker_b.local.get("movies:detail:1") is not None
+
+    worker_a.invalidate("movies:")
+    assert wait_for(lambda: worker_b.local.get("movies:detail:1") is None)
+    assert worker_b.get("movies:detail:1") is None
+
+    for worker in (worker_a, worker_b):
+        worker.close()
+        assert not worker._subscriber.is_alive()
+
+
+def test_redis_outage_misses_and_drops_local_copies_on_resubscribe(redis_server, redis_url):
+    worker = TieredCache(InProcessCache(), RedisCache(redis_url))
+    worker.set("movies:detail:1", {"id": 1})
+
+    # Redis down: the shared tier misses and ignores writes instead of raising
+    port = redis_server[0].server_address[1]
+    stop_server(redis_server.pop())
+    assert worker.shared.get("movies:detail:1") is None
+    worker.set("movies:detail:2", {"id": 2})
+    worker.invalidate("users:")
+    assert worker.get("movies:detail:1") == {"id": 1}  # the local copy
+
+    # Invalidations sent meanwhile are lost, so resubscribing drops every local copy
+    time.sleep(0.6)
+    redis_server.append(start_server(port))
+    assert wait_for(lambda: worker.local.get("movies:detail:1") is None, timeout=5)
+    worker.close()
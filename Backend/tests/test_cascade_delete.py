@@ -0,0 +1,73 @@
+import pytest
+from sqlmodel import Session, select, func
+
+from models.favorite import Favorite
+from models.movie_genre_link import MovieGenreLink
+from models.review import Review
+from models.user import User
+from tests.conftest import count_queries
+
+
+@pytest.fixture(scope="module")
+def seed_movies():
+    return 40
+
+
+def ranked(engine, column, user_column=None):
+    """Ids ordered by how many reviews reference them, most first."""
+    with Session(engine) as session:
+        query = select(column, func.count()).group_by(column).order_by(func.count().desc(), column)
+        if user_column is not None:
+            query = query.where(user_column != 1)  # keep the superadmin
+        return [(value, count) for value, count in session.exec(query).all()]
+
+
+def remaining(engine, model, column, value):
+    with Session(engine) as session:
+        return session.exec(select(func.count()).select_from(model).where(column == value)).one()
+
+
+def delete_counting(client, engine, url):
+    with count_queries(engine) as counter:
+        response = client.delete(url)
+    assert response.status_code < 300, response.text
+    return counter.count
+
+
+def test_movie_delete_is_constant_and_removes_children(client, engine):
+    movies = ranked(engine, Review.movie_id)
+    (popular, popular_reviews), (quiet, quiet_reviews) = movies[0], movies[-1]
+    assert popular_reviews > quiet_reviews
+
+    # The first versioned write creates the change counter; do it outside the count
+    client.put("/movies/1", json={"title": "Warm-up", "director": "D", "description": "Plot"})
+    statements = {delete_counting(client, engine, f"/movies/{movie_id}") for movie_id in (popular, quiet)}
+    assert len(statements) == 1
+    for movie_id in (popular, quiet):
+        assert client.get(f"/movies/{movie_id}").status_code == 404
+        for model, column in ((Review, Review.movie_id), (Favorite, Favorite.movie_id),
+                              (MovieGenreLink, MovieGenreLink.movie_id)):
+            assert remaining(engine, model, column, movie_id) == 0
+    assert client.delete(f"/movies/{popular}").status_code == 404
+
+
+def test_user_delete_is_constant_and_refreshes_ratings(client, engine):
+    users = ranked(engine, Review.user_id, Review.user_id)
+    (prolific, prolific_reviews), (quiet, quiet_reviews) = users[0], users[-1]
+    assert prolific_reviews > quiet_reviews
+
+    with Session(engine) as session:
+        movie_id = session.exec(select(Review.movie_id).where(Review.user_id == prolific)).first()
+    client.get(f"/movies/{movie_id}")  # cache the detail, so the delete must invalidate it
+
+    statements = {delete_counting(client, engine, f"/users/{user_id}") for user_id in (prolific, quiet)}
+    assert len(statements) == 1
+    for user_id in (prolific, quiet):
+        assert remaining(engine, Review, Review.user_id, user_id) == 0
+        assert remaining(engine, Favorite, Favorite.user_id, user_id) == 0
+        assert remaining(engine, User, User.id, user_id) == 0
+
+    with Session(engine) as session:
+        average = session.exec(select(func.avg(Review.rating)).where(Review.movie_id == movie_id)).one()
+    after = client.get(f"/movies/{movie_id}").json()["rating"]
+    assert after == pytest.approx(float(average or 0.0), abs=0.1)
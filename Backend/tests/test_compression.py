@@ -0,0 +1,107 @@
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+import middleware.compression as compression
+from middleware.compression import CompressionMiddleware, choose_encoding, parse_accept_encoding
+
+BIG = "catalog " * 500
+SMALL = "tiny"
+
+
+def test_accept_encoding_negotiation():
+    assert parse_accept_encoding("gzip;q=0.5, br , identity;q=x") == {"gzip": 0.5, "br": 1.0, "identity": 0.0}
+    assert choose_encoding("gzip, br") == "br"
+    assert choose_encoding("gzip;q=1, br;q=0.4") == "gzip"
+    assert choose_encoding("br;q=0, *;q=0.1") == "gzip"
+    assert choose_encoding("identity") is None
+    assert choose_encoding("") is None
+
+
+@pytest.fixture
+def text_app():
+    app = FastAPI()
+    app.state.body = BIG
+
+    @app.get("/big")
+    def big():
+        return PlainTextResponse(app.state.body, headers={"Vary": "Origin"})
+
+    @app.get("/small")
+    def small():
+        return PlainTextResponse(SMALL)
+
+    @app.get("/private")
+    def private():
+        return PlainTextResponse(BIG, headers={"Cache-Control": "private"})
+
+    @app.get("/encoded")
+    def encoded():
+        return Response(gzip.compress(BIG.encode()), media_type="text/plain", headers={"Content-Encoding": "gzip"})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BIG, BIG]), media_type="text/plain")
+
+    app.add_middleware(CompressionMiddleware, minimum_size=500, cache_size=4)
+    return app
+
+
+def get(client, url, accept):
+    return client.get(url, headers={"Accept-Encoding": accept})
+
+
+def test_large_bodies_are_compressed(text_app):
+    with TestClient(text_app) as client:
+        for accept in ("gzip", "br"):
+            response = get(client, "/big", accept)
+            assert response.headers["content-encoding"] == accept
+            assert int(response.headers["content-length"]) < len(BIG) / 10
+            assert response.headers["vary"] == "Origin, Accept-Encoding"
+            assert response.text == BIG  # httpx decodes both
+
+        # Uncompressed for this client, but a shared cache must still tell the two apart
+        plain = get(client, "/big", "identity")
+        assert "content-encoding" not in plain.headers and plain.text == BIG
+        assert plain.headers["vary"] == "Origin, Accept-Encoding"
+
+
+def test_what_is_passed_through(text_app):
+    with TestClient(text_app) as client:
+        small = get(client, "/small", "gzip")
+        assert "content-encoding" not in small.headers and "vary" not in small.headers
+        assert small.text == SMALL
+
+        encoded = get(client, "/encoded", "br")
+        assert encoded.headers["content-encoding"] == "gzip" and encoded.text == BIG
+
+        streamed = get(client, "/stream", "gzip")
+        assert "content-encoding" not in streamed.headers and streamed.text == BIG * 2
+
+
+def test_compressed_bodies_are_reused_while_unchanged(text_app, monkeypatch):
+    calls = []
+    compress = gzip.compress
+
+    def counted(body, **kwargs):
+        calls.append(len(body))
+        return compress(body, **kwargs)
+
+    monkeypatch.setattr(compression.gzip, "compress", counted)
+    with TestClient(text_app) as client:
+        for _ in range(3):
+            assert get(client, "/big", "gzip").text == BIG
+        assert len(calls) == 1
+
+        # Same URL, new body: compressed again, never the stale bytes
+        text_app.state.body = BIG.upper()
+        assert get(client, "/big", "gzip").text == BIG.upper()
+        assert len(calls) == 2
+
+        # Private responses aren't kept
+        get(client, "/private", "gzip")
+        get(client, "/private", "gzip")
+        assert len(calls) == 4
@@ -0,0 +1,152 @@
+import asyncio
+import threading
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+import events
+from events import format_sse
+from events.hub import EventHub, RESYNC
+from routers.events import stream_events
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_pending_events_coalesce_per_movie():
+    async def scenario():
+        hub = EventHub(max_pending=10)
+        hub.start(asyncio.get_running_loop())
+        subscriber = hub.subscribe()
+        for rating in (5.0, 6.0, 7.0):
+            hub.publish({"type": "rating", "movie_id": 1, "rating": rating})
+        hub.publish({"type": "favorites", "movie_id": 1, "favorites": 2})
+        await asyncio.sleep(0)
+        return await subscriber.next_batch(1)
+
+    batch = run(scenario())
+    assert [(event["type"], event.get("rating")) for event in batch] == [("rating", 7.0), ("favorites", None)]
+
+
+def test_slow_subscriber_gets_resync_instead_of_backlog():
+    async def scenario():
+        hub = EventHub(max_pending=3)
+        hub.start(asyncio.get_running_loop())
+        subscriber = hub.subscribe()
+        for movie_id in range(10):
+            hub.publish({"type": "rating", "movie_id": movie_id, "rating": 5.0})
+        await asyncio.sleep(0)
+        first = await subscriber.next_batch(1)
+        idle = await subscriber.next_batch(0.01)
+        return first, idle, len(subscriber.pending)
+
+    assert run(scenario()) == ([RESYNC], None, 0)
+
+
+def test_last_event_id_replays_missed_events():
+    async def scenario():
+        hub = EventHub(history=5)
+        hub.start(asyncio.get_running_loop())
+        for movie_id in range(8):
+            hub.publish({"type": "rating", "movie_id": movie_id, "rating": 5.0})
+        await asyncio.sleep(0)
+        history = list(hub._history)
+        resumed = await hub.subscribe(history[2]["id"]).next_batch(1)
+        too_old = await hub.subscribe("gone-1").next_batch(1)
+        return [event["movie_id"] for event in resumed], too_old
+
+    assert run(scenario()) == ([6, 7], [RESYNC])
+
+
+def test_stream_ends_when_the_client_is_gone(monkeypatch):
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def scenario():
+        hub = EventHub()
+        hub.start(asyncio.get_running_loop())
+        monkeypatch.setattr(events, "hub", hub)
+        request = Request({"type": "http", "method": "GET", "path": "/events", "headers": []}, receive)
+        chunks = (await stream_events(request, timeout=None)).body_iterator
+        first = await chunks.__anext__()
+        hub.publish({"type": "rating", "movie_id": 1, "rating": 5.0})
+        rest = [chunk async for chunk in chunks]
+        return first, rest, hub.subscriber_count
+
+    first, rest, subscribers = run(scenario())
+    assert first.startswith("retry: ") and rest == [] and subscribers == 0
+
+
+def test_stream_not_started_holds_no_subscription(monkeypatch):
+    async def receive():
+        return {"type": "http.disconnect"}
+
+    async def scenario():
+        hub = EventHub(max_subscribers=1)
+        hub.start(asyncio.get_running_loop())
+        monkeypatch.setattr(events, "hub", hub)
+        request = Request({"type": "http", "method": "GET", "path": "/events", "headers": []}, receive)
+        # Gone before the body started: nothing to leak
+        for _ in range(3):
+            await stream_events(request, timeout=None)
+        idle = hub.subscriber_count
+
+        hub.subscribe()
+        with pytest.raises(HTTPException) as full:
+            await stream_events(request, timeout=None)
+        return idle, full.value.status_code
+
+    assert run(scenario()) == (0, 503)
+
+
+def test_subscriber_limit():
+    hub = EventHub(max_subscribers=1)
+    assert hub.subscribe() is not None
+    assert hub.full and hub.subscribe() is None
+
+
+def test_format_sse():
+    text = format_sse([{"id": "a-1", "type": "rating", "movie_id": 3, "rating": 7.5}])
+    assert text == 'id: a-1\nevent: rating\ndata: {"movie_id":3,"rating":7.5}\n\n'
+
+
+def test_sse_stream_ends_after_timeout(client):
+    response = client.get("/events", params={"timeout": 0})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.startswith("retry: ")
+
+
+def test_stopping_the_hub_ends_open_streams(client):
+    loop = events.hub._loop
+    response = {}
+    reader = threading.Thread(target=lambda: response.update(stream=client.get("/events")))
+    reader.start()
+    try:
+        while not events.hub.subscriber_count and reader.is_alive():
+            reader.join(0.01)
+    finally:
+        # What the SIGTERM handler does when the server starts shutting down
+        loop.call_soon_threadsafe(events.hub.stop)
+        reader.join(5)
+        loop.call_soon_threadsafe(events.hub.start, loop)
+    assert not reader.is_alive()
+    assert response["stream"].text.startswith("retry: ") and events.hub.subscriber_count == 0
+
+
+def test_websocket_receives_rating_and_favorite_updates(client):
+    movie_id = client.get("/movies/").json()[-1]["id"]
+    with client.websocket_connect("/events/ws") as websocket:
+        response = client.post("/reviews/", json={"movie_id": movie_id, "rating": 9, "review_text": "Live"})
+        assert response.status_code < 400
+        event = websocket.receive_json()
+        reviews = client.get("/reviews/", params={"movie_id": movie_id}).json()
+        assert event["type"] == "rating" and event["movie_id"] == movie_id
+        assert event["reviews"] == len(reviews)
+
+        client.post("/favorites/", json={"movie_id": movie_id})
+        event = websocket.receive_json()
+        assert (event["type"], event["movie_id"]) == ("favorites", movie_id)
+        assert event["favorites"] >= 1
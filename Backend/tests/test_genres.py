@@ -0,0 +1,88 @@
+import pytest
+from sqlmodel import Session, select
+
+from models.genre import Genre
+from models.movie import Movie
+from models.movie_genre_link import MovieGenreLink
+from models.review import Review
+from tests.conftest import count_queries
+
+
+@pytest.fixture(scope="module")
+def seed_movies():
+    return 60
+
+
+def expected_stats(engine) -> dict:
+    """The same numbers, the slow way: one genre at a time."""
+    stats = {}
+    with Session(engine) as session:
+        for genre in session.exec(select(Genre)).all():
+            movie_ids = session.exec(select(MovieGenreLink.movie_id)
+                                     .where(MovieGenreLink.genre_id == genre.id)).all()
+            ratings = session.exec(select(Review.rating).where(Review.movie_id.in_(movie_ids))).all()
+            stats[genre.name] = {
+                "name": genre.name,
+                "movie_count": len(movie_ids),
+                "review_count": len(ratings),
+                "rating": round(sum(ratings) / len(ratings), 1) if ratings else 0.0,
+            }
+    return stats
+
+
+def genre_stats(client) -> dict:
+    return {row["name"]: row for row in client.get("/genres/").json()}
+
+
+def genre_movies(client, name, limit):
+    movies, after = [], None
+    while True:
+        page = client.get(f"/genres/{name}/movies", params={"limit": limit, **({"after": after} if after else {})})
+        assert page.status_code == 200, page.text
+        movies += page.json()["items"]
+        after = page.json()["next_cursor"]
+        if after is None:
+            return movies
+
+
+def test_stats_come_from_one_query_and_are_cached(client, engine):
+    with count_queries(engine) as counter:
+        stats = genre_stats(client)
+    assert counter.count == 1
+    assert stats == expected_stats(engine)
+    assert list(stats) == sorted(stats)
+
+    with count_queries(engine) as counter:
+        client.get("/genres/")
+    assert counter.count == 0
+
+
+def test_movie_pages_walk_the_genre_once(client, engine):
+    with Session(engine) as session:
+        expected = session.exec(select(Movie.slug)
+                                .join(MovieGenreLink, MovieGenreLink.movie_id == Movie.id)
+                                .join(Genre, Genre.id == MovieGenreLink.genre_id)
+                                .where(Genre.name == "Drama").order_by(Movie.slug)).all()
+    movies = genre_movies(client, "Drama", 4)
+    assert [movie["slug"] for movie in movies] == expected and len(expected) > 4
+    assert all("Drama" in movie["genres"] for movie in movies)
+    assert client.get("/genres/Nope/movies").status_code == 404
+
+
+def test_write_paths_keep_genres_fresh(client, engine):
+    genre_stats(client)
+    with Session(engine) as session:
+        movie_id, genre = session.exec(select(MovieGenreLink.movie_id, Genre.name)
+                                       .join(Genre, Genre.id == MovieGenreLink.genre_id)).first()
+    genre_movies(client, genre, 100)
+
+    client.post("/reviews/", json={"movie_id": movie_id, "rating": 1, "review_text": "Not for me"})
+    assert genre_stats(client)[genre] == expected_stats(engine)[genre]
+
+    client.put(f"/movies/{movie_id}", json={"title": "Retitled", "director": "D", "description": "Plot"})
+    assert "Retitled" in [movie["title"] for movie in genre_movies(client, genre, 100)]
+
+    before = genre_stats(client)[genre]["movie_count"]
+    assert client.delete(f"/movies/{movie_id}").status_code == 200
+    assert genre_stats(client)[genre]["movie_count"] == before - 1
+    assert genre_stats(client) == expected_stats(engine)
@@ -0,0 +1,9 @@
+"""The hot queries listed in benchmarks/explain_check.py must not full-scan."""
+from benchmarks.data_generator import seed_database
+from benchmarks.explain_check import check
+
+
+def test_hot_queries_use_indexes(engine):
+    seed_database(engine, 50)
+    failures = check(engine)
+    assert not failures, f"full table scans: {failures}"
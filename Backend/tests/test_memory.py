@@ -0,0 +1,116 @@
+import threading
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from middleware.memory import MemoryMiddleware, MemoryTracker
+
+_kept = []
+
+
+def hoard(kilobytes: int):
+    _kept.append([bytearray(1024) for _ in range(kilobytes)])
+
+
+@pytest.fixture
+def tracker():
+    tracker = MemoryTracker(frames=1, interval=3600)
+    tracker.start()
+    try:
+        yield tracker
+    finally:
+        tracker.stop()
+        _kept.clear()
+
+
+def test_diff_points_at_the_allocation_site(tracker):
+    hoard(2048)
+    top = tracker.diff("baseline", limit=1)[0]
+    assert top["site"][0].endswith(f"tests/test_memory.py:{hoard.__code__.co_firstlineno + 1}")
+    assert top["size_diff_kb"] >= 2048
+
+    tracker.take_snapshot()
+    # Nothing new since the periodic snapshot
+    assert all(entry["size_diff_kb"] < 512 for entry in tracker.diff("previous"))
+    assert [summary["traced_kb"] > 0 for summary in tracker.status()["history"]] == [True, True]
+    with pytest.raises(ValueError):
+        tracker.diff("yesterday")
+
+
+def test_peaks_are_attributed_to_routes(tracker):
+    app = FastAPI()
+
+    @app.get("/burst/{n}")
+    def burst(n: int):  # allocates a lot, keeps nothing
+        return {"size": len([bytearray(1024) for _ in range(4096)])}
+
+    @app.get("/leak/{n}")
+    def leak(n: int):
+        hoard(256)
+        return {}
+
+    app.add_middleware(MemoryMiddleware, tracker=tracker)
+    with TestClient(app) as client:
+        for n in range(3):
+            client.get(f"/burst/{n}")
+            client.get(f"/leak/{n}")
+        client.get("/nowhere")
+
+    routes = {row["route"]: row for row in tracker.top_routes()}
+    assert set(routes) == {"GET /burst/{n}", "GET /leak/{n}", "GET (no route)"}
+    assert routes["GET /burst/{n}"]["requests"] == 3
+    assert routes["GET /burst/{n}"]["mean_peak_kb"] >= 4096 > routes["GET /burst/{n}"]["mean_retained_kb"]
+    assert routes["GET /leak/{n}"]["mean_retained_kb"] >= 256
+
+
+def test_event_streams_do_not_block_measuring(tracker):
+    app = FastAPI()
+    streaming, done = threading.Event(), threading.Event()
+
+    @app.get("/stream")
+    def stream():
+        def events():
+            yield "data: hello\n\n"
+            streaming.set()
+            done.wait(5)
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/burst")
+    def burst():
+        return {"size": len([bytearray(1024) for _ in range(1024)])}
+
+    app.add_middleware(MemoryMiddleware, tracker=tracker)
+    with TestClient(app) as client:
+        reader = threading.Thread(target=lambda: client.get("/stream"))
+        reader.start()
+        try:
+            assert streaming.wait(5)
+            client.get("/burst")
+        finally:
+            done.set()
+            reader.join()
+
+    routes = {row["route"]: row for row in tracker.top_routes()}
+    assert routes["GET /burst"]["requests"] == 1 and routes["GET /stream"]["requests"] == 1
+
+
+def test_admin_endpoints(client):
+    from diagnostics import memory_tracker
+
+    # Off by default: the endpoints answer, with nothing to show
+    assert client.get("/diagnostics/memory").json()["tracing"] is False
+    assert client.get("/diagnostics/memory/diff").json() == {"tracing": False, "against": "baseline", "items": []}
+
+    memory_tracker.start()
+    try:
+        hoard(1024)
+        status = client.get("/diagnostics/memory").json()
+        assert status["tracing"] is True and len(status["history"]) == 1
+        items = client.get("/diagnostics/memory/diff", params={"limit": 3}).json()["items"]
+        assert any(entry["size_diff_kb"] >= 1024 for entry in items)
+        assert client.get("/diagnostics/memory/diff", params={"group_by": "module"}).status_code == 422
+    finally:
+        memory_tracker.stop()
+        _kept.clear()
@@ -0,0 +1,34 @@
+import pytest
+
+from database.config import settings
+from tests.conftest import count_queries
+
+
+@pytest.fixture(scope="module")
+def seed_movies():
+    return 30
+
+
+def test_batch_matches_single_lookups_in_requested_order(client, engine):
+    with count_queries(engine) as counter:
+        response = client.get("/movies/batch", params={"ids": "17, 3,999,17,8"})
+    assert response.status_code == 200
+    assert counter.count == 3
+
+    movies = response.json()
+    assert [movie["id"] for movie in movies] == [17, 3, 8]  # unknown and repeated ids dropped
+    assert movies == [client.get(f"/movies/{movie_id}").json() for movie_id in (17, 3, 8)]
+
+
+def test_bad_ids(client, engine):
+    with count_queries(engine) as counter:
+        assert client.get("/movies/batch", params={"ids": ""}).json() == []
+    assert counter.count == 0
+    assert client.get("/movies/batch", params={"ids": "1,two"}).status_code == 422
+    assert client.get("/movies/batch", params={"ids": "-1"}).status_code == 422
+    # Digits to str.isdigit(), not to int()
+    response = client.get("/movies/batch", params={"ids": "1,²"})
+    assert response.status_code == 422 and response.json()["detail"] == "Invalid movie id '²'"
+    too_many = ",".join(str(n) for n in range(1, settings.MOVIE_BATCH_MAX_IDS + 2))
+    assert client.get("/movies/batch", params={"ids": too_many}).status_code == 422
+    assert client.get("/movies/batch").status_code == 422
@@ -0,0 +1,47 @@
+def sync(client, since=None):
+    response = client.get("/movies/changes", params={} if since is None else {"since": since})
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_full_sync_then_only_changed_rows(client):
+    full = sync(client)
+    assert full["reset"] is True
+    assert len(full["movies"]) == 10 and full["deleted"] == []
+
+    client.put("/movies/4", json={"title": "Retitled", "director": "D", "description": "Plot"})
+    review = client.post("/reviews/", json={"movie_id": 6, "rating": 10, "review_text": "Top"}).json()
+    delta = sync(client, full["version"])
+    assert delta["reset"] is False
+    assert [movie["id"] for movie in delta["movies"]] == [4, 6]
+    assert delta["movies"][0]["title"] == "Retitled"
+    # The delta carries the same derived fields as GET /movies/
+    listed = {movie["id"]: movie for movie in client.get("/movies/").json()}
+    assert delta["movies"][1]["rating"] == listed[6]["rating"]
+
+    # Nothing new since the last sync
+    assert sync(client, delta["version"]) == {**delta, "movies": [], "deleted": []}
+
+    client.delete(f"/reviews/{review['id']}")
+    assert [movie["id"] for movie in sync(client, delta["version"])["movies"]] == [6]
+
+
+def test_deletes_leave_tombstones_until_the_id_is_reused(client):
+    movie = {"title": "Short-lived", "director": "D", "description": "Plot"}
+    movie_id = client.post("/movies/", json=movie).json()["id"]
+    version = sync(client)["version"]
+    assert client.delete(f"/movies/{movie_id}").status_code == 200
+    delta = sync(client, version)
+    assert (delta["movies"], delta["deleted"]) == ([], [movie_id])
+
+    # The next movie takes the freed id; it comes back as a row, not a delete
+    assert client.post("/movies/", json=movie).json()["id"] == movie_id
+    delta = sync(client, version)
+    assert ([movie["id"] for movie in delta["movies"]], delta["deleted"]) == ([movie_id], [])
+
+
+def test_unknown_version_forces_full_resync(client):
+    current = sync(client)["version"]
+    stale = sync(client, current + 100)
+    assert stale["reset"] is True and stale["version"] == current
+    assert len(stale["movies"]) == len(client.get("/movies/").json())
@@ -0,0 +1,111 @@
+from collections import Counter
+
+import pytest
+from sqlmodel import Session
+
+from models.movie import Movie
+from tests.conftest import count_queries
+from views.movie_changes import touch_movies
+from views.movie_facets import bitset_ids, rating_bucket
+
+
+@pytest.fixture(scope="module")
+def seed_movies():
+    return 80
+
+
+def facets(client, **params):
+    response = client.get("/movies/facets", params={"limit": 100, **params})
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def expected(client, genre=None, rating=None, year_from=None):
+    """Filter the full movie list by hand and count what each facet would show."""
+    movies = client.get("/movies/").json()
+    keep = {
+        "genre": lambda movie: genre is None or genre in movie["genres"],
+        "rating": lambda movie: rating is None or rating_bucket(movie["rating"] or None) == rating,
+        "decade": lambda movie: year_from is None or int(movie["release_date"][:4]) >= year_from,
+    }
+    values = {
+        "genre": lambda movie: movie["genres"],
+        "rating": lambda movie: [rating_bucket(movie["rating"] or None)],
+        "decade": lambda movie: [movie["release_date"][:3] + "0s"],
+    }
+    counts = {}
+    for facet in keep:
+        others = [test for name, test in keep.items() if name != facet]
+        counts[facet] = Counter(value for movie in movies if all(test(movie) for test in others)
+                                for value in values[facet](movie))
+    matching = {movie["id"] for movie in movies if all(test(movie) for test in keep.values())}
+    return matching, counts
+
+
+def assert_matches(client, **filters):
+    page = facets(client, **filters)
+    matching, counts = expected(client, **filters)
+    assert {movie["id"] for movie in page["items"]} == matching and page["total"] == len(matching)
+    for facet, counter in counts.items():
+        assert {row["value"]: row["count"] for row in page["facets"][facet]} == dict(counter), facet
+    return page
+
+
+def test_bitset_ids():
+    assert bitset_ids(0b101100) == [2, 3, 5]
+
+
+def test_counts_ignore_their_own_filter(client):
+    everything = assert_matches(client)
+    assert everything["total"] == 80
+    ratings = [movie["rating"] for movie in everything["items"]]
+    assert ratings == sorted(ratings, reverse=True)
+
+    page = assert_matches(client, genre="Drama", year_from=1980)
+    # Picking Drama doesn't hide the other genres' counts
+    assert len(page["facets"]["genre"]) > 1
+    assert_matches(client, genre="Drama", rating="7-9")
+
+    directors = facets(client, facet_limit=3)["facets"]["director"]
+    assert len(directors) == 3 and directors[0]["count"] >= directors[-1]["count"]
+    director = directors[0]["value"]
+    assert {movie["director"] for movie in facets(client, director=director)["items"]} == {director}
+
+    # Director counts under another filter come from the movies it matched
+    dramas = client.get("/movies/", params={"genre": "Drama"}).json()
+    counts = Counter(movie["director"] for movie in dramas)
+    top = facets(client, genre="Drama", facet_limit=2)["facets"]["director"]
+    assert [row["count"] for row in top] == [count for _, count in counts.most_common(2)]
+    assert all(counts[row["value"]] == row["count"] for row in top)
+
+
+def test_writes_update_the_index_incrementally(client, engine):
+    facets(client)
+    with count_queries(engine) as counter:
+        facets(client, genre="Drama", limit=5)
+    assert counter.count == 4  # version check, then the page: movies, ratings, genres
+
+    movie = facets(client)["items"][-1]  # the lowest rated
+    client.post("/reviews/", json={"movie_id": movie["id"], "rating": 10, "review_text": "Masterpiece"})
+    client.put(f"/movies/{movie['id']}", json={"title": movie["title"], "director": "Someone New",
+                                                "description": "Plot", "release_date": "2024-05-01"})
+    with count_queries(engine) as counter:
+        page = facets(client, director="Someone New")
+    # Only the touched movie is re-read: version, changed ids, tombstones, three loads, then the page
+    assert counter.count == 9
+    assert [item["id"] for item in page["items"]] == [movie["id"]]
+    assert_matches(client, year_from=2020)
+
+    client.delete(f"/movies/{movie['id']}")
+    assert facets(client, director="Someone New")["total"] == 0
+    assert_matches(client)
+
+    # Writes from elsewhere (another worker) are found through the change version too
+    with Session(engine) as session:
+        other = session.get(Movie, facets(client)["items"][0]["id"])
+        other.director = "Elsewhere"
+        session.add(other)
+        session.flush()
+        touch_movies(session, [other.id])
+        session.commit()
+    assert facets(client, director="Elsewhere")["total"] == 1
@@ -0,0 +1,45 @@
+import time
+
+import pytest
+
+from database.config import settings
+
+
+@pytest.fixture(scope="module")
+def seed_movies():
+    return 20
+
+
+def test_full_matches_the_separate_endpoints(client):
+    full = client.get("/movies/4/full", params={"reviews_limit": 2}).json()
+    reviews = client.get("/reviews/", params={"movie_id": 4}).json()
+
+    assert full["movie"] == client.get("/movies/4").json()
+    assert full["review_count"] == len(reviews)
+    assert sum(full["rating_histogram"].values()) == len(reviews)
+    assert len(full["reviews"]) == min(2, len(reviews))
+    newest = sorted(reviews, key=lambda r: (r["review_date"], r["id"]), reverse=True)[:2]
+    assert [r["id"] for r in full["reviews"]] == [r["id"] for r in newest]
+    anonymous = client.get("/movies/4/full", params={"reviews_limit": 2}, headers={"Authorization": ""}).json()
+    assert anonymous["is_favorite"] is None and anonymous["movie"] == full["movie"]
+
+
+def test_favorite_status_for_logged_in_caller(client):
+    client.post("/favorites/", json={"movie_id": 5}, headers=client.regular_headers)
+    assert client.get("/movies/5/full", headers=client.regular_headers).json()["is_favorite"] is True
+    assert client.get("/movies/5/full").json()["is_favorite"] is False  # user1 hasn't picked it
+
+
+def test_errors(client, monkeypatch):
+    assert client.get("/movies/9999/full").status_code == 404
+    assert client.get("/movies/4/full", headers={"Authorization": "Bearer nope"}).status_code == 401
+
+    import views.movie_full as movie_full
+
+    def slow_histogram(session, movie_id):
+        time.sleep(0.5)
+        return {}
+
+    monkeypatch.setattr(movie_full, "get_rating_histogram", slow_histogram)
+    monkeypatch.setattr(settings, "MOVIE_FULL_TIMEOUT_SECONDS", 0.05)
+    assert client.get("/movies/4/full").status_code == 504
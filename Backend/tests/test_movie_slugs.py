@@ -0,0 +1,41 @@
+from views.movie_views import create_movie_slug
+
+
+def create(client, title):
+    response = client.post("/movies/", json={"title": title, "director": "D", "description": "Plot"})
+    assert response.status_code == 200
+    return client.get(f"/movies/{response.json()['id']}").json()
+
+
+def test_create_movie_slug():
+    assert create_movie_slug("Schindler's List") == "schindlers-list"
+    assert create_movie_slug("Amélie: Le Fabuleux Destin") == "amelie-le-fabuleux-destin"
+    assert create_movie_slug("?!") == "movie"
+
+
+def test_collisions_get_numbered_suffixes(client):
+    slugs = [create(client, title)["slug"] for title in ("Alien", "Alien", "ALIEN!", "Alien 2")]
+    assert slugs == ["alien", "alien-2", "alien-3", "alien-2-2"]
+
+
+def test_lookup_by_slug_matches_lookup_by_id(client):
+    movie = create(client, "The Deep Link")
+    assert client.get(f"/movies/by-slug/{movie['slug']}").json() == movie
+    assert client.get("/movies/by-slug/no-such-movie").status_code == 404
+
+
+def test_slug_follows_title_changes_only(client):
+    movie = create(client, "Working Title")
+    body = {"title": "Working Title", "director": "Someone else", "description": "Plot"}
+    client.put(f"/movies/{movie['id']}", json=body)
+    assert client.get(f"/movies/{movie['id']}").json()["slug"] == "working-title"
+
+    client.put(f"/movies/{movie['id']}", json={**body, "title": "Final Title"})
+    assert client.get("/movies/by-slug/final-title").json()["id"] == movie["id"]
+    assert client.get("/movies/by-slug/working-title").status_code == 404
+
+
+def test_sparse_list_reads_the_stored_slug(client):
+    rows = client.get("/movies/", params={"fields": "slug"}).json()
+    assert "alien-2" in {row["slug"] for row in rows}
+    assert all(set(row) == {"id", "slug"} for row in rows)
@@ -0,0 +1,71 @@
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from middleware.profiling import AdminCache, ProfileStore, ProfilingMiddleware
+from tests.conftest import count_queries
+
+
+def burn_cpu(seconds: float) -> int:
+    total, deadline = 0, time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        total += sum(range(200))
+    return total
+
+
+def test_sampled_request_records_where_the_time_went(tmp_path):
+    app = FastAPI()
+
+    @app.get("/slow/{n}")
+    def slow(n: int):  # sync, so it runs in the threadpool
+        return {"total": burn_cpu(0.2)}
+
+    store = ProfileStore(str(tmp_path), max_profiles=2)
+    app.add_middleware(ProfilingMiddleware, store=store, sample_rate=1.0, interval=0.002)
+    with TestClient(app) as client:
+        for n in range(3):
+            response = client.get(f"/slow/{n}")
+
+    profiles = store.list()
+    assert len(profiles) == 2  # pruned to max_profiles
+    latest = profiles[0]
+    assert latest["id"] == response.headers["x-profile-id"]
+    assert (latest["route"], latest["path"], latest["status"], latest["trigger"]) == \
+        ("/slow/{n}", "/slow/2", 200, "sampled")
+    assert latest["duration_ms"] >= 200 and latest["samples"] > 10
+    assert "burn_cpu" in latest["top"][0]["function"]
+    assert "burn_cpu (tests/test_profiling.py" in store.path(latest["id"]).read_text()
+
+
+def test_only_admins_can_ask_for_a_profile(client):
+    assert "x-profile-id" not in client.get("/movies/4", headers={**client.regular_headers, "X-Profile": "1"}).headers
+    assert "x-profile-id" not in client.get("/movies/4", headers={"Authorization": "", "X-Profile": "1"}).headers
+    assert client.get("/diagnostics/profiles", headers=client.regular_headers).status_code == 403
+
+    # A movie that isn't cached yet, so the route runs its queries
+    profile_id = client.get("/movies/5", headers={"X-Profile": "1"}).headers["x-profile-id"]
+    listed = client.get("/diagnostics/profiles").json()[0]
+    assert listed["id"] == profile_id
+    assert (listed["route"], listed["trigger"], listed["queries"]) == ("/movies/{movie_id}", "header", 3)
+
+    download = client.get(f"/diagnostics/profiles/{profile_id}")
+    assert download.status_code == 200 and download.headers["content-type"].startswith("text/plain")
+    assert client.get("/diagnostics/profiles/..%2F..%2Fetc%2Fpasswd").status_code == 404
+    assert client.get("/diagnostics/profiles/20260101000000000000-00000000").status_code == 404
+
+
+def test_admin_checks_are_cached_per_user(client, engine, monkeypatch):
+    client.get("/movies/4")  # cached from here on: the route itself runs no queries
+    regular = {**client.regular_headers, "X-Profile": "1"}
+    client.get("/movies/4", headers=regular)
+    with count_queries(engine) as counter:
+        for _ in range(3):
+            assert "x-profile-id" not in client.get("/movies/4", headers=regular).headers
+    assert counter.count == 0
+
+    cache = AdminCache(ttl=60)
+    cache.put(7, True)
+    assert cache.get(7) is True and cache.get(8) is None
+    monkeypatch.setattr(time, "monotonic", lambda: float("inf"))
+    assert cache.get(7) is None
@@ -0,0 +1,219 @@
+"""
+Query-budget regression harness.
+
+Every route in routers/ is called against seeded data at two sizes and the
+number of SQL statements it issues is recorded. A route fails if it issues
+more statements on the larger dataset (an N+1 pattern) or more than its
+declared budget. New routes must be added to CASES with a budget.
+"""
+from dataclasses import dataclass, field
+from typing import Optional
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from tests.conftest import IMPORT_HASH, count_queries, seed
+
+SIZES = (10, 40)
+
+IMPORT_FILE = "\n".join(
+    f'{{"username": "imported{i}", "email": "imported{i}@example.com", "name": "Im", '
+    f'"surname": "Ported", "hashed_password": "{IMPORT_HASH}"}}'
+    for i in range(25)
+)
+
+
+@dataclass
+class Case:
+    method: str
+    route: str                   # path template as registered on the app
+    url: str                     # may use {free_movie_id}, {new_movie_id}, {new_user_id}, {slug}, {profile_id}
+    budget: int
+    auth: Optional[str] = None   # None, "regular", "superadmin" or "review_owner"
+    review_id: Optional[int] = None
+    json: Optional[dict] = None
+    data: Optional[dict] = None
+    files: Optional[dict] = None
+    headers: Optional[dict] = None
+    warmup: bool = False         # call once before counting (warms in-memory pools)
+    label: str = field(default="")
+
+    @property
+    def id(self):
+        return self.label or f"{self.method} {self.url}"
+
+
+# Order matters: reads first, then writes, then deletes.
+CASES = [
+    Case("GET", "/", "/", 0),
+    Case("GET", "/movies/", "/movies/", 3),
+    Case("GET", "/movies/", "/movies/?genre=Drama", 3, label="GET /movies/?genre="),
+    Case("GET", "/movies/", "/movies/?fields=title,rating,slug", 2, label="GET /movies/?fields="),
+    Case("GET", "/movies/", "/movies/?format=columnar", 3, label="GET /movies/?format=columnar"),
+    # Warm pool: the change version check comes first, then the movie itself
+    Case("GET", "/movies/random", "/movies/random", 4, warmup=True),
+    Case("GET", "/movies/changes", "/movies/changes", 4),
+    Case("GET", "/movies/{movie_id}", "/movies/1", 3),
+    Case("GET", "/genres/", "/genres/", 1),
+    Case("GET", "/genres/{name}/movies", "/genres/Drama/movies?limit=5", 4),
+    # First call loads the facet index; the second only checks the change version
+    Case("GET", "/movies/facets", "/movies/facets?genre=Adventure&year_from=1950", 4, warmup=True),
+    Case("GET", "/movies/batch", "/movies/batch?ids=7,2,9,4,1", 3),
+    Case("GET", "/movies/by-slug/{slug}", "/movies/by-slug/{slug}", 1, label="GET /movies/by-slug/ (detail cached)"),
+    Case("GET", "/movies/{movie_id}/full", "/movies/3/full", 6),
+    Case("GET", "/movies/{movie_id}/full", "/movies/3/full", 4, auth="regular",
+         label="GET /movies/{movie_id}/full (logged in, detail cached)"),
+    Case("GET", "/reviews/", "/reviews/", 3),
+    Case("GET", "/reviews/", "/reviews/?movie_id=1", 3, label="GET /reviews/?movie_id="),
+    Case("GET", "/reviews/search", "/reviews/search?q=golden+river&movie_id=1&limit=5", 1,
+         label="GET /reviews/search?q="),
+    Case("GET", "/reviews/{review_id}", "/reviews/1", 3),
+    Case("GET", "/favorites/", "/favorites/", 2, auth="regular"),
+    Case("GET", "/favorites/check/{movie_id}", "/favorites/check/1", 2, auth="regular"),
+    Case("GET", "/users/", "/users/", 3, auth="superadmin"),
+    Case("GET", "/users/", "/users/?q=user1&role=regular&after=user10&limit=5", 3, auth="superadmin",
+         label="GET /users/?q=&role=&after="),
+    Case("GET", "/users/me", "/users/me", 2, auth="regular"),
+    # Profiling adds the admin check (user and role) to the route's own 3
+    Case("GET", "/movies/{movie_id}", "/movies/2", 5, auth="superadmin", headers={"X-Profile": "1"},
+         label="GET /movies/{movie_id} (profiled)"),
+    Case("GET", "/diagnostics/profiles", "/diagnostics/profiles", 2, auth="superadmin"),
+    Case("GET", "/diagnostics/profiles/{profile_id}", "/diagnostics/profiles/{profile_id}", 2,
+         auth="superadmin"),
+    Case("GET", "/diagnostics/slow-queries", "/diagnostics/slow-queries", 2, auth="superadmin"),
+    Case("DELETE", "/diagnostics/slow-queries", "/diagnostics/slow-queries", 2, auth="superadmin"),
+    Case("GET", "/diagnostics/memory", "/diagnostics/memory", 2, auth="superadmin"),
+    Case("GET", "/diagnostics/memory/diff", "/diagnostics/memory/diff", 2, auth="superadmin"),
+    Case("GET", "/events", "/events?timeout=0", 0),
+    Case("POST", "/users/login", "/users/login", 1,
+         data={"username": "user2", "password": "benchmark-password"}),
+    Case("POST", "/users/register", "/users/register", 4,
+         json={"username": "newuser", "password": "new-password", "email": "new@example.com",
+               "name": "New", "surname": "User"}),
+    Case("POST", "/users/import", "/users/import", 6, auth="superadmin",
+         files={"file": ("users.ndjson", IMPORT_FILE)}),
+    Case("PUT", "/users/{user_id}/promote", "/users/3/promote", 6, auth="superadmin"),
+    Case("PUT", "/users/{user_id}/demote", "/users/3/demote", 6, auth="superadmin"),
+    Case("POST", "/movies/", "/movies/", 11, auth="superadmin",
+         json={"title": "New Movie", "director": "Someone", "description": "Plot"}),
+    Case("PUT", "/movies/{movie_id}", "/movies/2", 8, auth="superadmin",
+         json={"title": "Renamed", "director": "Someone", "description": "Plot"}),
+    Case("POST", "/reviews/", "/reviews/", 9, auth="regular",
+         json={"movie_id": 1, "rating": 7, "review_text": "Great"}),
+    Case("PUT", "/reviews/{review_id}", "/reviews/1", 9, auth="review_owner", review_id=1,
+         json={"movie_id": 1, "rating": 8, "review_text": "Even better"}),
+    Case("POST", "/favorites/", "/favorites/", 8, auth="regular",
+         json={"movie_id": "{free_movie_id}"}),
+    Case("DELETE", "/favorites/{movie_id}", "/favorites/{free_movie_id}", 4, auth="regular"),
+    Case("DELETE", "/favorites/clear", "/favorites/clear", 4, auth="regular"),
+    Case("DELETE", "/reviews/{review_id}", "/reviews/2", 6, auth="review_owner", review_id=2),
+    Case("DELETE", "/movies/{movie_id}", "/movies/{new_movie_id}", 8, auth="superadmin"),
+    Case("DELETE", "/users/{user_id}", "/users/{new_user_id}", 8, auth="superadmin"),
+    # After the writes above, so there are changed movies and a tombstone to return
+    Case("GET", "/movies/changes", "/movies/changes?since=0", 5, label="GET /movies/changes?since= (delta)"),
+]
+
+
+def _resolve(value, context):
+    if isinstance(value, str):
+        return value.format(**context)
+    if isinstance(value, dict):
+        return {k: (int(_resolve(v, context)) if k.endswith("_id") and isinstance(v, str)
+                    else _resolve(v, context)) for k, v in value.items()}
+    return value
+
+
+def _token_for(user_id: int) -> str:
+    from views.user import create_access_token
+    return create_access_token(data={"sub": str(user_id)})
+
+
+def _build_context(engine) -> dict:
+    from models.favorite import Favorite
+    from models.movie import Movie
+
+    with Session(engine) as session:
+        favorited = set(session.exec(select(Favorite.movie_id).where(Favorite.user_id == 2)).all())
+        movie_ids = session.exec(select(Movie.id).order_by(Movie.id)).all()
+        slug = session.get(Movie, 1).slug
+    return {"free_movie_id": next(m for m in movie_ids if m not in favorited and m > 3), "slug": slug}
+
+
+def _headers(case: Case, engine) -> dict:
+    from models.review import Review
+
+    if case.auth is None:
+        return {}
+    if case.auth == "review_owner":
+        with Session(engine) as session:
+            user_id = session.get(Review, case.review_id).user_id
+    else:
+        user_id = {"superadmin": 1, "regular": 2}[case.auth]
+    return {"Authorization": f"Bearer {_token_for(user_id)}"}
+
+
+def _run_cases(app, engine, movies: int) -> dict:
+    from diagnostics import profile_store
+    from models.movie import Movie
+    from models.user import User
+
+    seed(engine, movies)
+    context = _build_context(engine)
+
+    counts = {}
+    with TestClient(app) as client:
+        for case in CASES:
+            if "{new_" in case.url:
+                # Rows created by earlier cases, so deletes don't hit seeded FKs
+                with Session(engine) as session:
+                    context["new_movie_id"] = session.exec(
+                        select(Movie.id).where(Movie.title == "New Movie")).first()
+                    context["new_user_id"] = session.exec(
+                        select(User.id).where(User.username == "newuser")).first()
+            if "{profile_id}" in case.url:
+                context["profile_id"] = profile_store.list(1)[0]["id"]
+            url = _resolve(case.url, context)
+            kwargs = {"headers": {**_headers(case, engine), **(case.headers or {})}}
+            if case.json is not None:
+                kwargs["json"] = _resolve(case.json, context)
+            if case.data is not None:
+                kwargs["data"] = case.data
+            if case.files is not None:
+                kwargs["files"] = case.files
+
+            if case.warmup:
+                client.request(case.method, url, **kwargs)
+            with count_queries(engine) as counter:
+                response = client.request(case.method, url, **kwargs)
+            assert response.status_code < 400, f"{case.id}: {response.status_code} {response.text}"
+            counts[case.id] = counter.count
+    return counts
+
+
+@pytest.fixture(scope="module")
+def query_counts(app, engine):
+    return {size: _run_cases(app, engine, size) for size in SIZES}
+
+
+@pytest.mark.parametrize("case", CASES, ids=lambda case: case.id)
+def test_query_count_is_constant_and_within_budget(case, query_counts):
+    small, large = (query_counts[size][case.id] for size in SIZES)
+    assert large <= small, (
+        f"{case.id} issued {small} statements with {SIZES[0]} movies but {large} "
+        f"with {SIZES[1]}: query count grows with data size (N+1?)"
+    )
+    assert large <= case.budget, f"{case.id} issued {large} statements, budget is {case.budget}"
+
+
+def test_every_route_has_a_budget(app):
+    declared = {(case.method, case.route) for case in CASES}
+    routes = {
+        (method, route.path)
+        for route in app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    missing = sorted(routes - declared)
+    assert not missing, f"routes without a query budget: {missing}"
@@ -0,0 +1,137 @@
+import random
+
+import pytest
+from sqlmodel import Session, select
+
+import views.random_movie as random_movie
+from models.genre import Genre
+from models.movie import Movie
+from models.movie_genre_link import MovieGenreLink
+from tests.conftest import seed
+from views.movie_changes import record_movie_deleted, touch_movies
+from views.movie_views import delete_movie_cascade
+from views.random_movie import RandomMovieSampler, _IdArray, get_random_movie
+
+
+class ScriptedRandom(random.Random):
+    """Picks the given indexes first, then behaves like a seeded Random."""
+
+    def __init__(self, *indexes):
+        super().__init__(0)
+        self.indexes = list(indexes)
+
+    def randrange(self, *args):
+        return self.indexes.pop(0) if self.indexes else super().randrange(*args)
+
+
+def assert_consistent(pool: _IdArray):
+    assert len(pool.positions) == len(pool.ids)
+    assert all(pool.ids[index] == item_id for item_id, index in pool.positions.items())
+
+
+def test_remove_swaps_the_last_id_into_the_hole():
+    pool = _IdArray()
+    for item_id in (1, 2, 3, 4, 5):
+        pool.add(item_id)
+    pool.add(3)  # already there
+    pool.remove(2)
+    assert pool.ids == [1, 5, 3, 4]
+    assert_consistent(pool)
+
+    pool.remove(4)  # the last one: nothing to swap
+    pool.remove(42)  # unknown: ignored
+    assert pool.ids == [1, 5, 3]
+    assert_consistent(pool)
+
+    for item_id in (1, 5, 3):
+        pool.remove(item_id)
+        assert_consistent(pool)
+    assert pool.sample(random.Random()) is None
+
+
+@pytest.fixture(scope="module")
+def genres_of(engine):
+    seed(engine, 20)
+    genres = {}
+    with Session(engine) as session:
+        for movie_id, name in session.exec(select(MovieGenreLink.movie_id, Genre.name)
+                                           .join(Genre, Genre.id == MovieGenreLink.genre_id)).all():
+            genres.setdefault(name, set()).add(movie_id)
+    return genres
+
+
+@pytest.fixture
+def sampler(engine, genres_of, monkeypatch):
+    sampler = RandomMovieSampler()
+    with Session(engine) as session:
+        sampler.ensure_current(session)
+    monkeypatch.setattr(random_movie, "random_movie_sampler", sampler)
+    return sampler
+
+
+def test_genre_pools_only_hold_their_movies(sampler, genres_of):
+    assert set(sampler._by_genre) == set(genres_of)
+    for name, movie_ids in genres_of.items():
+        assert set(sampler._by_genre[name].ids) == movie_ids
+        assert {sampler.sample(name) for _ in range(50)} <= movie_ids
+    assert sampler.sample("No Such Genre") is None
+
+    drama = next(iter(genres_of["Drama"]))
+    sampler.remove(drama)
+    assert drama not in sampler._all.positions
+    assert all(drama not in pool.positions for pool in sampler._by_genre.values())
+    for pool in (sampler._all, *sampler._by_genre.values()):
+        assert_consistent(pool)
+
+    sampler.add(500, ["Drama", "Brand New"])
+    assert sampler._by_genre["Brand New"].ids == [500] and sampler.sample("Brand New") == 500
+    assert 500 in sampler._by_genre["Drama"].positions
+
+
+def test_add_after_reset_waits_for_the_reload(sampler, engine):
+    sampler.reset()
+    sampler.add(500, ["Drama"])  # not loaded: the reload will see the database instead
+    assert sampler.sample() is None
+    with Session(engine) as session:
+        sampler.ensure_current(session)
+    assert 500 not in sampler._all.positions and len(sampler._all) == 20
+
+
+def test_deleted_movie_is_dropped_and_retried(sampler, engine):
+    # Deleted by another worker: still in this pool, gone from the database
+    sampler.add(500, ["Drama"])
+    sampler._rng = ScriptedRandom(sampler._all.positions[500])
+    with Session(engine) as session:
+        movie = get_random_movie(session)
+    assert movie is not None and movie.id != 500
+    assert 500 not in sampler._all.positions and 500 not in sampler._by_genre["Drama"].positions
+
+    # Only stale ids left: give up after max_attempts rather than loop
+    for movie_id in list(sampler._all.ids):
+        sampler.remove(movie_id)
+    for movie_id in (501, 502, 503):
+        sampler.add(movie_id)
+    with Session(engine) as session:
+        assert get_random_movie(session, max_attempts=2) is None
+    assert len(sampler._all) == 1
+
+
+def test_other_workers_writes_are_caught_up(sampler, engine, genres_of):
+    # Written straight to the database, as another worker would
+    drama = next(iter(genres_of["Drama"]))
+    with Session(engine) as session:
+        movie = Movie(id=900, title="Elsewhere", director="D", description="Plot")
+        movie.genres = [session.exec(select(Genre).where(Genre.name == "Drama")).one()]
+        session.add(movie)
+        session.flush()
+        touch_movies(session, [900])
+        delete_movie_cascade(session, drama)
+        record_movie_deleted(session, drama)
+        session.commit()
+
+    with Session(engine) as session:
+        sampler.ensure_current(session)
+    assert 900 in sampler._all.positions and 900 in sampler._by_genre["Drama"].positions
+    assert drama not in sampler._all.positions and drama not in sampler._by_genre["Drama"].positions
+    for pool in (sampler._all, *sampler._by_genre.values()):
+        assert_consistent(pool)
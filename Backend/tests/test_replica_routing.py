@@ -0,0 +1,137 @@
+"""Read/write routing between a primary and a replica, using two SQLite files."""
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from sqlmodel import create_engine
+from starlette.requests import Request
+
+from database.routing import SessionRouter
+
+
+def make_request(method="GET", headers=None, client="10.0.0.1"):
+    raw_headers = [(k.lower().encode(), v.encode()) for k, v in (headers or {}).items()]
+    return Request({"type": "http", "method": method, "headers": raw_headers,
+                    "client": (client, 1234), "path": "/", "query_string": b""})
+
+
+@pytest.fixture
+def router(tmp_path):
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "primary"), (replica, "replica")):
+        with engine.begin() as connection:
+            connection.execute(text("CREATE TABLE whoami (name TEXT)"))
+            connection.execute(text("INSERT INTO whoami VALUES (:name)"), {"name": name})
+    return SessionRouter(primary, replica, pin_seconds=60, retry_seconds=60)
+
+
+def served_by(router, request):
+    with router.open_session(request) as session:
+        return session.exec(text("SELECT name FROM whoami")).scalar_one()
+
+
+def test_reads_go_to_replica_and_writes_to_primary(router):
+    assert served_by(router, make_request("GET")) == "replica"
+    assert served_by(router, make_request("POST", client="10.0.0.2")) == "primary"
+
+
+def test_writer_is_pinned_to_primary(router):
+    token = {"Authorization": "Bearer abc"}
+    served_by(router, make_request("PUT", token, client="10.0.0.3"))
+    # Same token from another address still reads its own writes
+    assert served_by(router, make_request("GET", token, client="10.0.0.4")) == "primary"
+    assert served_by(router, make_request("GET", {"Authorization": "Bearer other"},
+                                          client="10.0.0.5")) == "replica"
+
+
+def test_pins_are_not_shared_through_an_address(router):
+    # Behind a proxy every client arrives from the same address
+    served_by(router, make_request("POST", {"Authorization": "Bearer writer"}, client="10.0.0.9"))
+    assert served_by(router, make_request("GET", {"Authorization": "Bearer reader"}, client="10.0.0.9")) == "replica"
+    assert served_by(router, make_request("GET", client="10.0.0.9")) == "replica"
+    served_by(router, make_request("POST", client="10.0.0.9"))  # anonymous writes pin nobody
+    assert served_by(router, make_request("GET", client="10.0.0.9")) == "replica"
+
+
+def test_strong_consistency_header_forces_primary(router):
+    assert served_by(router, make_request("GET", {"X-Consistency": "strong"})) == "primary"
+
+
+def test_failing_replica_falls_back_to_primary(router, tmp_path):
+    router.replica = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    assert served_by(router, make_request("GET")) == "primary"
+    assert not router.replica_available()
+
+
+def test_without_replica_everything_uses_primary(router):
+    router.replica = None
+    assert served_by(router, make_request("GET")) == "primary"
+
+
+def test_replica_failing_mid_request_is_marked_down(router, monkeypatch):
+    import database.database as database
+    from sqlalchemy.exc import OperationalError
+
+    monkeypatch.setattr(database, "session_router", router)
+    sessions = database.get_session(make_request("GET"))
+    assert router.engine_for(next(sessions)) == "replica"
+    with pytest.raises(OperationalError):
+        sessions.throw(OperationalError("SELECT 1", {}, Exception("server has gone away")))
+    assert not router.replica_available()
+    assert served_by(router, make_request("GET")) == "primary"
+
+
+def test_replica_failing_under_movie_full_is_marked_down(router, monkeypatch):
+    import anyio
+    import database.database as database
+    from views.movie_full import load_movie_full
+
+    # The replica has no movie tables: every part's query fails there
+    monkeypatch.setattr(database, "session_router", router)
+    with pytest.raises(Exception):
+        anyio.run(load_movie_full, make_request("GET"), 1, None, 5, 2.0)
+    assert not router.replica_available()
+
+
+def copy_database(source: str, target: str):
+    """The replica catching up: a consistent copy of the primary's file."""
+    with sqlite3.connect(source) as primary, sqlite3.connect(target) as replica:
+        primary.backup(replica)
+
+
+def test_lagging_replica_reads_do_not_refill_the_cache(app, engine, tmp_path, monkeypatch):
+    from cache import get_cache, MOVIE_DETAIL
+    from database.database import session_router
+    from tests.conftest import auth_headers, seed
+
+    seed(engine, 10)
+    replica_path = str(tmp_path / "replica.db")
+    copy_database(engine.url.database, replica_path)
+    monkeypatch.setattr(session_router, "replica", create_engine(f"sqlite:///{replica_path}"))
+    # Earlier tests' writes are outside the lag window
+    monkeypatch.setattr(session_router, "pin_seconds", 0)
+
+    with TestClient(app) as client:
+        admin = auth_headers(client, "user1")
+        movie = client.get("/movies/3").json()  # from the replica, nothing invalidated yet: cached
+        assert get_cache().get(f"{MOVIE_DETAIL}3") is not None
+
+        monkeypatch.setattr(session_router, "pin_seconds", 60)
+        assert client.put("/movies/3", headers=admin, json={"title": "Renamed", "director": movie["director"],
+                                                            "description": "Plot"}).status_code == 200
+        # Anybody but the writer still reads the replica's old row, which must not go back in the cache
+        assert client.get("/movies/3").json()["title"] == movie["title"]
+        assert get_cache().get(f"{MOVIE_DETAIL}3") is None
+        assert client.get("/movies/3").json()["title"] == movie["title"]  # read again, not cached
+        # The writer reads the primary, and that may be cached
+        assert client.get("/movies/3", headers=admin).json()["title"] == "Renamed"
+        assert get_cache().get(f"{MOVIE_DETAIL}3")["title"] == "Renamed"
+
+        # Once the lag window has passed, replica reads fill the cache again
+        copy_database(engine.url.database, replica_path)
+        get_cache().clear()
+        monkeypatch.setattr(session_router, "pin_seconds", 0)
+        assert client.get("/movies/3").json()["title"] == "Renamed"
+        assert get_cache().get(f"{MOVIE_DETAIL}3")["title"] == "Renamed"
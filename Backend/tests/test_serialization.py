@@ -0,0 +1,46 @@
+import pytest
+
+import views.serialization as serialization
+from database.config import settings
+from views.movie_views import MOVIE_LIST_FIELDS
+
+
+@pytest.fixture(scope="module")
+def seed_movies():
+    return 30
+
+
+def movie_lists(client, **params) -> list:
+    from cache import get_cache
+
+    get_cache().clear()
+    response = client.get("/movies/", params=params)
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_fast_paths_match_the_response_model(client, monkeypatch):
+    # The awkward cases: no genres, no date, no reviews, and an average that needs rounding
+    bare = client.post("/movies/", json={"title": "Bare", "director": "D", "description": "Plot"}).json()
+    rated = client.get("/movies/", params={"sort": "asc"}).json()[0]["id"]
+    for rating in (7, 8, 8):
+        client.post("/reviews/", json={"movie_id": rated, "rating": rating, "review_text": "Fine"})
+
+    for params in ({}, {"sort": "asc"}, {"genre": "Drama"}):
+        monkeypatch.setattr(settings, "FAST_SERIALIZATION", False)
+        expected = movie_lists(client, **params)
+        monkeypatch.setattr(settings, "FAST_SERIALIZATION", True)
+        assert movie_lists(client, **params) == expected
+        with monkeypatch.context() as without_orjson:
+            without_orjson.setattr(serialization, "orjson", None)  # the TypeAdapter fallback
+            assert movie_lists(client, **params) == expected
+
+        # Every field picked explicitly goes through the sparse path; same values
+        sparse = movie_lists(client, fields=",".join(MOVIE_LIST_FIELDS), **params)
+        assert sorted(sparse, key=lambda movie: movie["id"]) == sorted(expected, key=lambda movie: movie["id"])
+
+    movies = {movie["id"]: movie for movie in movie_lists(client)}
+    assert movies[bare["id"]]["genres"] == [] and movies[bare["id"]]["release_date"] is None
+    assert movies[bare["id"]]["rating"] == 0.0
+    assert movies[rated]["rating"] == 7.7
+    assert all(len(movie["release_date"]) == 10 for movie in movies.values() if movie["release_date"])
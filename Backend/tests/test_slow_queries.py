@@ -0,0 +1,85 @@
+import pytest
+from sqlalchemy import create_engine, text
+
+from middleware.slow_queries import SlowQueryLog, normalize_sql, parameters_shape
+
+
+def test_normalize_sql_groups_statements_by_template():
+    assert normalize_sql("SELECT *\n  FROM reviews WHERE movie_id IN (?, ?, ?) AND rating > 7 LIMIT ?") == \
+        "SELECT * FROM reviews WHERE movie_id IN (?, ...) AND rating > ? LIMIT ?"
+    assert normalize_sql("SELECT * FROM movies WHERE title = 'It''s' AND id IN (%s, %s)") == \
+        "SELECT * FROM movies WHERE title = ? AND id IN (?, ...)"
+    assert normalize_sql("INSERT INTO t (a, b) VALUES (?, ?), (?, ?), (?, ?)") == \
+        "INSERT INTO t (a, b) VALUES (?, ?), ..."
+    assert normalize_sql("SELECT anon_1.id FROM t2 AS anon_1") == "SELECT anon_1.id FROM t2 AS anon_1"
+
+
+def test_parameters_shape_hides_values():
+    assert parameters_shape((1, 2, "secret"), False) == "(2 x int, str)"
+    assert parameters_shape({"name": "secret"}, False) == "{name: str}"
+    assert parameters_shape([(1, "a"), (2, "b")], True) == "2 x (int, str)"
+
+
+def test_slow_statements_are_aggregated_and_explained(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/slow.db")
+    log = SlowQueryLog(threshold_ms=0)
+    log.install([engine])
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE reviews (id INTEGER PRIMARY KEY, movie_id INTEGER, rating INTEGER)"))
+        connection.execute(text("CREATE INDEX ix_reviews_movie_id ON reviews (movie_id)"))
+        connection.execute(text("INSERT INTO reviews (movie_id, rating) VALUES (:movie_id, :rating)"),
+                           [{"movie_id": n % 5, "rating": n % 10} for n in range(50)])
+        for ids in ((1,), (1, 2), (1, 2, 3)):
+            connection.exec_driver_sql(
+                f"SELECT * FROM reviews WHERE movie_id IN ({', '.join('?' * len(ids))})", ids)
+        connection.exec_driver_sql("SELECT * FROM reviews WHERE rating = ?", (3,))
+
+    by_template = {entry["template"]: entry for entry in log.top(100, sort="count")}
+    lookup = by_template["SELECT * FROM reviews WHERE movie_id IN (?, ...)"]
+    assert lookup["count"] == 3 and lookup["routes"] == [{"route": None, "count": 3}]
+    assert any("USING INDEX ix_reviews_movie_id" in line for line in lookup["explain"])
+    assert any(line.startswith("SCAN") for line in by_template["SELECT * FROM reviews WHERE rating = ?"]["explain"])
+    # Batched inserts are recorded but not explained
+    assert by_template["INSERT INTO reviews (movie_id, rating) VALUES (?, ?)"]["explain"] == []
+
+    log.threshold_ms = 10_000
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SELECT count(*) FROM reviews")
+    assert "SELECT count(*) FROM reviews" not in {entry["template"] for entry in log.top(100)}
+
+    with pytest.raises(ValueError):
+        log.top(sort="rating")
+    log.clear()
+    log.max_templates = 2
+    log.threshold_ms = 0
+    with engine.connect() as connection:
+        for column in ("id", "movie_id", "rating"):
+            connection.exec_driver_sql(f"SELECT max({column}) FROM reviews")
+    assert len(log.top(100)) == 2
+
+
+@pytest.fixture(scope="module")
+def client(client):
+    from diagnostics import slow_query_log
+
+    threshold = slow_query_log.threshold_ms
+    slow_query_log.threshold_ms = 0  # every statement counts as slow
+    try:
+        yield client
+    finally:
+        slow_query_log.threshold_ms = threshold
+        slow_query_log.clear()
+
+
+def test_admin_endpoint_lists_offenders_by_route(client):
+    assert client.delete("/diagnostics/slow-queries").status_code == 204
+    assert client.get("/movies/6").status_code == 200
+
+    page = client.get("/diagnostics/slow-queries", params={"sort": "count"}).json()
+    assert page["threshold_ms"] == 0
+    detail = [entry for entry in page["items"]
+              if {"route": "GET /movies/{movie_id}", "count": 1} in entry["routes"]]
+    assert detail and all(entry["template"].startswith("SELECT") and entry["explain"] for entry in detail)
+
+    assert client.get("/diagnostics/slow-queries", params={"sort": "nope"}).status_code == 422
+    assert client.get("/diagnostics/slow-queries", headers=client.regular_headers).status_code == 403
@@ -0,0 +1,44 @@
+import pytest
+
+from tests.conftest import count_queries
+
+
+@pytest.fixture(scope="module")
+def seed_movies():
+    return 30
+
+
+@pytest.mark.parametrize("params", [{}, {"genre": "Drama"}, {"sort": "asc"}])
+def test_fields_project_the_full_list(client, params):
+    full = client.get("/movies/", params=params).json()
+    sparse = client.get("/movies/", params={**params, "fields": "slug,rating,genres"}).json()
+    assert sparse == [{"id": m["id"], "genres": m["genres"], "rating": m["rating"], "slug": m["slug"]}
+                      for m in full]
+
+
+def test_unrequested_columns_are_not_selected(client, engine):
+    from cache import get_cache
+
+    get_cache().clear()
+    with count_queries(engine) as counter:
+        client.get("/movies/", params={"fields": "title"})
+    movie_query = next(sql for sql in counter.statements if "FROM movies" in sql)
+    assert "description" not in movie_query
+    assert not any("genre" in sql for sql in counter.statements)
+
+
+def test_columnar_format(client):
+    full = client.get("/movies/").json()
+    columnar = client.get("/movies/", params={"format": "columnar", "fields": "title,rating"}).json()
+    assert columnar["count"] == len(full)
+    assert columnar["columns"] == {
+        "id": [m["id"] for m in full],
+        "title": [m["title"] for m in full],
+        "rating": [m["rating"] for m in full],
+    }
+
+
+def test_unknown_field_is_rejected(client):
+    response = client.get("/movies/", params={"fields": "title,budget"})
+    assert response.status_code == 422
+    assert "budget" in response.json()["detail"]
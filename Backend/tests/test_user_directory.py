@@ -0,0 +1,33 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def seed_movies():
+    return 60  # 30 users, user1 is the superadmin
+
+
+def walk(client, **params):
+    usernames, after = [], None
+    while True:
+        page = client.get("/users/", params={**params, "limit": 7, **({"after": after} if after else {})}).json()
+        usernames += [user["username"] for user in page["items"]]
+        after = page["next_cursor"]
+        if after is None:
+            return usernames
+
+
+def test_pages_cover_every_user_once_in_order(client):
+    usernames = walk(client)
+    assert usernames == sorted(f"user{i}" for i in range(1, 31))
+
+
+def test_prefix_search_on_username_and_email(client):
+    assert walk(client, q="user2") == sorted(["user2"] + [f"user{i}" for i in range(20, 30)])
+    assert walk(client, q="USER3") == ["user3", "user30"]
+    assert walk(client, q="nobody") == []
+
+
+def test_role_filter_and_role_names(client):
+    page = client.get("/users/", params={"role": "superadmin"}).json()
+    assert [(u["username"], u["role"]) for u in page["items"]] == [("user1", "superadmin")]
+    assert len(walk(client, role="regular")) == 29
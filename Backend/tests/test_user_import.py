@@ -0,0 +1,96 @@
+import json
+
+from sqlmodel import Session
+
+import views.passwords as passwords
+from database.config import settings
+from tests.conftest import IMPORT_HASH
+from views.user_import import import_users
+
+CSV = f"""username,email,name,surname,password,hashed_password,role
+alice,alice@example.com,Alice,A,alice-password,,
+Bob,BOB@example.com,Bob,B,,{IMPORT_HASH},admin
+user2,someone@example.com,Taken,Name,long-password,,
+carol,user3@example.com,Carol,C,long-password,,
+alice,alice2@example.com,Alice,Again,long-password,,
+dave,not-an-email,Dave,D,long-password,,
+erin,erin@example.com,Erin,E,short,,
+frank,frank@example.com,Frank,F,,not-a-hash,
+"""
+
+
+def test_dry_run_writes_nothing(client):
+    report = client.post("/users/import", params={"dry_run": True},
+                         files={"file": ("users.csv", CSV)}).json()
+    assert [row["status"] for row in report["rows"]][:2] == ["valid", "valid"]
+    assert report["created"] == 0
+    assert client.get("/users/", params={"q": "alice"}).json()["items"] == []
+
+
+def test_csv_import_reports_every_row(client, monkeypatch):
+    # Two processes so the pool path runs even on a single-core machine
+    monkeypatch.setattr(settings, "IMPORT_HASH_WORKERS", 2)
+    report = client.post("/users/import", files={"file": ("users.csv", CSV)}).json()
+    rows = {row["row"]: row for row in report["rows"]}
+
+    assert (report["created"], report["failed"]) == (2, 6)
+    assert rows[1]["status"] == rows[2]["status"] == "created"
+    assert rows[2]["username"] == "bob"
+    assert rows[3]["error"] == "Username already registered"
+    assert rows[4]["error"] == "Email already registered"
+    assert rows[5]["error"] == "Username appears earlier in the file"
+    assert "email" in rows[6]["error"]
+    assert "password" in rows[7]["error"]
+    assert rows[8]["error"] == "hashed_password is not a bcrypt hash"
+
+    # Both imported users can log in and bob kept his role
+    assert client.post("/users/login", data={"username": "alice", "password": "alice-password"}).status_code == 200
+    assert client.post("/users/login", data={"username": "bob", "password": "import-password"}).status_code == 200
+    assert client.get("/users/", params={"q": "bob"}).json()["items"][0]["role"] == "admin"
+
+
+def test_ndjson_import_with_bad_lines(client):
+    lines = [
+        json.dumps({"username": "grace", "email": "grace@example.com", "name": "G", "surname": "H",
+                    "hashed_password": IMPORT_HASH}),
+        "{not json",
+        "[1, 2]",
+    ]
+    report = client.post("/users/import", files={"file": ("users.ndjson", "\n".join(lines))}).json()
+    assert [row["status"] for row in report["rows"]] == ["created", "error", "error"]
+    assert report["rows"][1]["error"].startswith("invalid JSON")
+
+
+def test_one_hashing_pool_serves_every_batch(client, engine, monkeypatch):
+    pools = []
+
+    class CountedPool(passwords.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(passwords, "ProcessPoolExecutor", CountedPool)
+    records = [(n, {"username": f"pooled{n}", "email": f"pooled{n}@example.com", "name": "P", "surname": "Q",
+                    "password": "pool-password"}) for n in range(1, 7)]
+    with Session(engine) as session:
+        report = import_users(session, records, batch_size=2, hash_workers=2)
+    assert report["created"] == 6 and len(pools) == 1
+
+
+def test_concurrent_registration_fails_only_its_row(client, engine, monkeypatch):
+    hash_batch = passwords.PasswordHasher.hash
+
+    def register_meanwhile(hasher, batch):
+        # Another client takes one of the names between the check and the insert
+        response = client.post("/users/register", json={"username": "henry", "email": "henry@elsewhere.com",
+                                                         "name": "H", "surname": "S", "password": "long-password"})
+        assert response.status_code == 201, response.text
+        return hash_batch(hasher, batch)
+
+    monkeypatch.setattr(passwords.PasswordHasher, "hash", register_meanwhile)
+    lines = [json.dumps({"username": name, "email": f"{name}@example.com", "name": "N", "surname": "S",
+                         "password": "long-password"}) for name in ("henry", "ivy", "jack")]
+    report = client.post("/users/import", files={"file": ("users.ndjson", "\n".join(lines))}).json()
+    assert [row["status"] for row in report["rows"]] == ["error", "created", "created"]
+    assert report["rows"][0]["error"] == "Username or email was registered during the import"
+    assert all(row["id"] for row in report["rows"][1:])
@@ -0,0 +1,69 @@
+from typing import List, Optional, Tuple
+
+from sqlmodel import Session, select, func
+
+from models.genre import Genre
+from models.movie import Movie
+from models.movie_genre_link import MovieGenreLink
+from models.review import Review
+from views.movie_views import build_movies_response_data
+
+
+def get_genre_stats(session: Session) -> List[dict]:
+    """Every genre with its movie count, review count and average rating, in one query.
+
+    Reviews are first summed per movie and then per genre through
+    movie_genre_link, so each review row is read once however many genres
+    its movie has. The rating is the mean of all the genre's reviews
+    (0.0 when it has none).
+    """
+    per_movie = (
+        select(Review.movie_id, func.count().label("reviews"), func.sum(Review.rating).label("total"))
+        .group_by(Review.movie_id)
+        .subquery()
+    )
+    statement = (
+        select(Genre.name, func.count(MovieGenreLink.movie_id), func.sum(per_movie.c.reviews),
+               func.sum(per_movie.c.total))
+        .select_from(Genre)
+        .outerjoin(MovieGenreLink, MovieGenreLink.genre_id == Genre.id)
+        .outerjoin(per_movie, per_movie.c.movie_id == MovieGenreLink.movie_id)
+        .group_by(Genre.id, Genre.name)
+        .order_by(Genre.name)
+    )
+    return [
+        {
+            "name": name,
+            "movie_count": movie_count,
+            "review_count": int(reviews or 0),
+            "rating": round(float(total) / float(reviews), 1) if reviews else 0.0,
+        }
+        for name, movie_count, reviews, total in session.exec(statement).all()
+    ]
+
+
+def get_genre_movies_page(session: Session, name: str, limit: int,
+                          after: Optional[str] = None) -> Optional[Tuple[List[dict], Optional[str]]]:
+    """One page of a genre's movies in slug order, plus the cursor for the next page.
+
+    Returns None for an unknown genre. Keyset pagination on the unique
+    slug, so deep pages cost the same as the first one; ratings and genres
+    of the page come in one query each.
+    """
+    genre_id = session.exec(select(Genre.id).where(Genre.name == name)).first()
+    if genre_id is None:
+        return None
+
+    statement = (
+        select(Movie)
+        .join(MovieGenreLink, MovieGenreLink.movie_id == Movie.id)
+        .where(MovieGenreLink.genre_id == genre_id)
+        .order_by(Movie.slug)
+        .limit(limit + 1)
+    )
+    if after:
+        statement = statement.where(Movie.slug > after)
+    movies = list(session.exec(statement).all())
+
+    next_cursor = movies[limit - 1].slug if len(movies) > limit else None
+    return build_movies_response_data(session, movies[:limit]), next_cursor
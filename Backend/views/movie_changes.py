@@ -0,0 +1,98 @@
+"""
+Delta sync for the movie catalog.
+
+Every write that changes what GET /movies/ returns for a movie (the movie
+row itself, or its rating through a review) stamps the movie with the next
+value of a global counter. Deleted movies leave a tombstone stamped the
+same way. A client that remembers the last version it saw asks for
+everything above it and gets only the rows that changed.
+
+The counter is bumped with an UPDATE in the writer's own transaction. The
+row lock it takes is held until commit, so writers commit in version order
+and a reader can never see version N+1 while N is still in flight.
+"""
+from typing import Iterable, List, Optional
+
+from sqlalchemy import delete, insert, literal, update
+from sqlmodel import Session, select
+
+from models.movie import Movie
+from models.movie_tombstone import MovieTombstone
+from models.sync_version import SyncVersion
+from views.movie_views import build_movies_response_data
+
+MOVIES = "movies"
+
+
+def _current_version_subquery(name: str = MOVIES):
+    return select(SyncVersion.value).where(SyncVersion.name == name).scalar_subquery()
+
+
+def bump_version(session: Session, name: str = MOVIES):
+    """Advance the counter in the current transaction (creates it on first use)."""
+    connection = session.connection()
+    result = connection.execute(
+        update(SyncVersion).where(SyncVersion.name == name).values(value=SyncVersion.value + 1)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(SyncVersion).values(name=name, value=1))
+
+
+def touch_movies(session: Session, movie_ids: Iterable[Optional[int]]):
+    """Stamp movies with a new version; call before commit, rows must be flushed."""
+    movie_ids = [movie_id for movie_id in movie_ids if movie_id is not None]
+    if not movie_ids:
+        return
+    bump_version(session)
+    session.connection().execute(
+        update(Movie).where(Movie.id.in_(movie_ids)).values(version=_current_version_subquery())
+    )
+
+
+def record_movie_deleted(session: Session, movie_id: int):
+    """Leave a tombstone for a deleted movie; call before commit."""
+    bump_version(session)
+    session.connection().execute(
+        insert(MovieTombstone).from_select(
+            ["movie_id", "version"],
+            select(literal(movie_id), SyncVersion.value).where(SyncVersion.name == MOVIES),
+        )
+    )
+
+
+def forget_tombstone(session: Session, movie_id: int):
+    """A new movie reused a deleted id; its own version supersedes the tombstone."""
+    session.connection().execute(delete(MovieTombstone).where(MovieTombstone.movie_id == movie_id))
+
+
+def get_current_version(session: Session) -> int:
+    return session.exec(select(SyncVersion.value).where(SyncVersion.name == MOVIES)).first() or 0
+
+
+def get_movie_changes(session: Session, since: Optional[int] = None) -> dict:
+    """Movies changed and ids deleted after `since` (see schemas.movie.MovieChanges).
+
+    Without `since`, or with a version this database never reached (it was
+    reset), the whole catalog comes back with reset=True: the client
+    replaces its copy.
+    """
+    # Read the version first: rows stamped later are left for the next sync
+    version = get_current_version(session)
+    if since == version:
+        return {"version": version, "reset": False, "movies": [], "deleted": []}
+
+    reset = since is None or since > version
+    query = select(Movie).order_by(Movie.id)
+    if not reset:
+        query = query.where(Movie.version > since, Movie.version <= version)
+    movies = session.exec(query).all()
+    rows = build_movies_response_data(session, movies, all_movies=reset) if movies else []
+
+    deleted: List[int] = []
+    if not reset:
+        deleted = list(session.exec(
+            select(MovieTombstone.movie_id)
+            .where(MovieTombstone.version > since, MovieTombstone.version <= version)
+            .order_by(MovieTombstone.movie_id)
+        ).all())
+    return {"version": version, "reset": reset, "movies": rows, "deleted": deleted}
@@ -0,0 +1,253 @@
+"""
+Faceted catalog browsing: filter by genre, director, release year and
+rating bucket, with a count for every value of every facet.
+
+Each worker keeps, per facet value, the set of matching movie ids as a
+bitset (a Python int, bit N set = movie N is in it). A request ANDs the
+bitsets of the selected values together (ORing values within one facet),
+and each facet's counts are popcounts of its value bitsets ANDed with
+the other facets' selection, so the counts cost no queries at all.
+
+Directors are the exception: there are about as many of them as movies,
+and a dense bitset per director would cost memory and time in proportion
+to the largest movie id. They keep plain id sets instead, and their
+counts come from the movies the other filters matched.
+
+The index follows the change versions of views/movie_changes.py: every
+movie and review write stamps the movies it touched, so a request first
+reads the current version and, if it moved, re-reads just those movies
+(and drops the tombstoned ones). Writes made by other workers are picked
+up the same way.
+"""
+import heapq
+import threading
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlmodel import Session, select, func
+
+from database.workers import after_fork
+from models.genre import Genre
+from models.movie import Movie
+from models.movie_genre_link import MovieGenreLink
+from models.movie_tombstone import MovieTombstone
+from models.review import Review
+from views.movie_changes import get_current_version
+from views.movie_views import build_movies_response_data
+
+FACETS = ("genre", "director", "decade", "rating")
+# Facets with few values, kept as bitsets; directors are kept as id sets
+BITSET_FACETS = ("genre", "decade", "rating")
+# Lower bounds of the rating buckets: [1, 3), [3, 5), [5, 7), [7, 9), [9, 10]
+RATING_BUCKETS = ((9, "9-10"), (7, "7-9"), (5, "5-7"), (3, "3-5"), (1, "1-3"))
+UNRATED = "unrated"
+RATING_ORDER = [name for _, name in RATING_BUCKETS] + [UNRATED]
+
+
+def rating_bucket(rating: Optional[float]) -> str:
+    if rating is None:
+        return UNRATED
+    return next((name for lower, name in RATING_BUCKETS if rating >= lower), RATING_BUCKETS[-1][1])
+
+
+def bitset_ids(bits: int) -> List[int]:
+    """Movie ids of a bitset, ascending."""
+    return [movie_id for movie_id, bit in enumerate(reversed(bin(bits)[2:])) if bit == "1"]
+
+
+class MovieFacetIndex:
+    """Per-facet-value bitsets of movie ids, kept current by change version."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.version: Optional[int] = None
+        self._all = 0
+        self._years: Dict[int, int] = {}
+        self._postings: Dict[str, Dict[str, int]] = {facet: {} for facet in BITSET_FACETS}
+        self._directors: Dict[str, Set[int]] = {}
+        self._director_of: Dict[int, str] = {}
+        # What each movie is filed under, so an update can unfile it first
+        self._filed: Dict[int, List[Tuple[str, str]]] = {}
+        self._year_of: Dict[int, int] = {}
+        self.ratings: Dict[int, float] = {}
+
+    def reset_after_fork(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def _unfile(self, movie_id: int):
+        bit = 1 << movie_id
+        for facet, value in self._filed.pop(movie_id, []):
+            postings = self._postings[facet]
+            postings[value] &= ~bit
+            if not postings[value]:
+                del postings[value]
+        director = self._director_of.pop(movie_id, None)
+        if director is not None:
+            movie_ids = self._directors[director]
+            movie_ids.discard(movie_id)
+            if not movie_ids:
+                del self._directors[director]
+        year = self._year_of.pop(movie_id, None)
+        if year is not None:
+            self._years[year] &= ~bit
+            if not self._years[year]:
+                del self._years[year]
+        self.ratings.pop(movie_id, None)
+        self._all &= ~bit
+
+    def _file(self, movie_id: int, director: str, year: Optional[int], genres: Iterable[str],
+              rating: Optional[float]):
+        bit = 1 << movie_id
+        filed = [("genre", genre) for genre in genres]
+        filed.append(("rating", rating_bucket(rating)))
+        if year is not None:
+            filed.append(("decade", f"{year // 10 * 10}s"))
+            self._years[year] = self._years.get(year, 0) | bit
+            self._year_of[movie_id] = year
+        for facet, value in filed:
+            postings = self._postings[facet]
+            postings[value] = postings.get(value, 0) | bit
+        self._filed[movie_id] = filed
+        self._directors.setdefault(director, set()).add(movie_id)
+        self._director_of[movie_id] = director
+        if rating is not None:
+            self.ratings[movie_id] = rating
+        self._all |= bit
+
+    def _load_movies(self, session: Session, movie_ids: Optional[List[int]], version: int):
+        """(Re)file the given movies, or every movie when movie_ids is None; three queries."""
+        movies = select(Movie.id, Movie.director, Movie.release_date)
+        genres = select(MovieGenreLink.movie_id, Genre.name).join(Genre, Genre.id == MovieGenreLink.genre_id)
+        ratings = select(Review.movie_id, func.avg(Review.rating)).group_by(Review.movie_id)
+        if movie_ids is not None:
+            # Rows stamped after `version` wait for the next catch-up
+            movies = movies.where(Movie.id.in_(movie_ids), Movie.version <= version)
+            genres = genres.where(MovieGenreLink.movie_id.in_(movie_ids))
+            ratings = ratings.where(Review.movie_id.in_(movie_ids))
+
+        genres_of: Dict[int, List[str]] = {}
+        for movie_id, name in session.exec(genres).all():
+            genres_of.setdefault(movie_id, []).append(name)
+        rating_of = {movie_id: round(float(avg), 1) for movie_id, avg in session.exec(ratings).all()
+                     if movie_id is not None and avg is not None}
+        for movie_id, director, release_date in session.exec(movies).all():
+            self._unfile(movie_id)
+            self._file(movie_id, director, release_date.year if release_date else None,
+                       genres_of.get(movie_id, []), rating_of.get(movie_id))
+
+    def ensure_current(self, session: Session):
+        """Catch up with the database: one query when nothing changed."""
+        with self._lock:
+            # Read under the lock: a thread holding an older version must not
+            # mistake the newer index for a database reset
+            version = get_current_version(session)
+            if self.version == version:
+                return
+            if self.version is None or version < self.version:
+                # First use, or the database was reset under us
+                self.reset()
+                self._load_movies(session, None, version)
+            else:
+                changed = list(session.exec(
+                    select(Movie.id).where(Movie.version > self.version, Movie.version <= version)
+                ).all())
+                deleted = session.exec(
+                    select(MovieTombstone.movie_id)
+                    .where(MovieTombstone.version > self.version, MovieTombstone.version <= version)
+                ).all()
+                for movie_id in deleted:
+                    self._unfile(movie_id)
+                if changed:
+                    self._load_movies(session, changed, version)
+            self.version = version
+
+    def search(self, filters: Dict[str, List[str]], year_from: Optional[int] = None,
+               year_to: Optional[int] = None, facet_limit: int = 20) -> Tuple[List[int], Dict[str, list]]:
+        """Ids matching every filter (best rated first) and the counts of every facet value.
+
+        A facet's counts apply all the other filters but not its own, so
+        they show what picking another value of that facet would give.
+        The year range counts as the decade facet's filter.
+        """
+        with self._lock:
+            selections = {}
+            for facet, values in filters.items():
+                if values:
+                    bits = 0
+                    if facet == "director":
+                        for value in values:
+                            for movie_id in self._directors.get(value, ()):
+                                bits |= 1 << movie_id
+                    else:
+                        postings = self._postings[facet]
+                        for value in values:
+                            bits |= postings.get(value, 0)
+                    selections[facet] = bits
+            if year_from is not None or year_to is not None:
+                bits = 0
+                for year, year_bits in self._years.items():
+                    if (year_from is None or year >= year_from) and (year_to is None or year <= year_to):
+                        bits |= year_bits
+                selections["decade"] = bits
+
+            def matching(skip: Optional[str] = None) -> int:
+                bits = self._all
+                for facet, facet_bits in selections.items():
+                    if facet != skip:
+                        bits &= facet_bits
+                return bits
+
+            facets = {}
+            for facet in BITSET_FACETS:
+                base = matching(facet)
+                counts = [(value, (bits & base).bit_count()) for value, bits in self._postings[facet].items()]
+                counts = [(value, count) for value, count in counts if count]
+                if facet == "rating":
+                    counts.sort(key=lambda item: RATING_ORDER.index(item[0]))
+                else:
+                    counts.sort()
+                facets[facet] = [{"value": value, "count": count} for value, count in counts]
+            facets["director"] = self._director_counts(matching("director"), facet_limit)
+
+            ids = bitset_ids(matching())
+            ratings = self.ratings
+        ids.sort(key=lambda movie_id: (-ratings.get(movie_id, 0.0), movie_id))
+        return ids, {facet: facets[facet] for facet in FACETS}
+
+    def _director_counts(self, base: int, facet_limit: int) -> List[dict]:
+        """The `facet_limit` most common directors among the movies in `base`."""
+        if base == self._all:
+            sizes = ((len(movie_ids), director) for director, movie_ids in self._directors.items())
+        else:
+            director_of = self._director_of
+            sizes = ((count, director) for director, count
+                     in Counter(director_of[movie_id] for movie_id in bitset_ids(base)).items())
+        top = heapq.nsmallest(facet_limit, ((-count, director) for count, director in sizes))
+        return [{"value": director, "count": -count} for count, director in top]
+
+
+movie_facet_index = MovieFacetIndex()
+after_fork(movie_facet_index.reset_after_fork)
+
+
+def browse_movies(session: Session, filters: Dict[str, List[str]], year_from: Optional[int] = None,
+                  year_to: Optional[int] = None, limit: int = 20, offset: int = 0,
+                  facet_limit: int = 20) -> dict:
+    """One page of matching movies with facet counts (see schemas.movie.MovieFacetsPage).
+
+    `filters` maps genre, director and rating to the accepted values.
+    """
+    movie_facet_index.ensure_current(session)
+    ids, facets = movie_facet_index.search(filters, year_from, year_to, facet_limit)
+    page_ids = ids[offset:offset + limit]
+    items = []
+    if page_ids:
+        movies = {movie.id: movie for movie in session.exec(select(Movie).where(Movie.id.in_(page_ids))).all()}
+        # Keep the index's order; a movie deleted since the catch-up is just skipped
+        items = build_movies_response_data(session, [movies[movie_id] for movie_id in page_ids
+                                                     if movie_id in movies])
+    return {"total": len(ids), "items": items, "facets": facets}
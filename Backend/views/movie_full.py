@@ -0,0 +1,116 @@
+"""
+Everything the movie modal needs, loaded in one request.
+
+The movie, the first page of reviews, the rating histogram and the
+caller's favorite status don't depend on each other, so each part runs in
+its own worker thread with its own session, and the request waits for all
+of them under a single time budget.
+"""
+from typing import Dict, List, Optional
+
+import anyio
+from anyio import to_thread
+from sqlmodel import Session, select, func
+from sqlalchemy.orm import selectinload
+
+from database.database import routed_session
+from models.favorite import Favorite
+from models.movie import Movie
+from models.review import Review
+from views.movie_views import build_movie_response_data
+from cache import get_cache, fill_cache, MOVIE_DETAIL
+
+RATINGS = range(1, 11)
+
+
+def get_movie_detail(session: Session, movie_id: int) -> Optional[dict]:
+    """Movie with rating, genres and slug; shares the GET /movies/{id} cache entry."""
+    cache_key = f"{MOVIE_DETAIL}{movie_id}"
+    cached = get_cache().get(cache_key)
+    if cached is not None:
+        return cached
+    movie = session.get(Movie, movie_id)
+    if not movie:
+        return None
+    data = build_movie_response_data(session, movie)
+    if data:
+        fill_cache(session, cache_key, data)
+    return data
+
+
+def get_movie_reviews_page(session: Session, movie_id: int, limit: int) -> List[dict]:
+    """Newest reviews of a movie with their authors."""
+    reviews = session.exec(
+        select(Review)
+        .options(selectinload(Review.user))
+        .where(Review.movie_id == movie_id)
+        .order_by(Review.review_date.desc(), Review.id.desc())
+        .limit(limit)
+    ).all()
+    return [
+        {
+            "id": review.id,
+            "rating": review.rating,
+            "review_text": review.review_text,
+            "review_date": review.review_date,
+            "user": {"id": review.user.id, "username": review.user.username} if review.user else None,
+        }
+        for review in reviews
+    ]
+
+
+def get_rating_histogram(session: Session, movie_id: int) -> Dict[int, int]:
+    """Number of reviews per rating (1-10), zeros included."""
+    rows = session.exec(
+        select(Review.rating, func.count())
+        .where(Review.movie_id == movie_id)
+        .group_by(Review.rating)
+    ).all()
+    histogram = {rating: 0 for rating in RATINGS}
+    for rating, count in rows:
+        histogram[rating] = count
+    return histogram
+
+
+def is_favorite(session: Session, user_id: int, movie_id: int) -> bool:
+    statement = select(Favorite.id).where(Favorite.user_id == user_id, Favorite.movie_id == movie_id)
+    return session.exec(statement).first() is not None
+
+
+async def load_movie_full(request, movie_id: int, user_id: Optional[int],
+                          reviews_limit: int, timeout: float) -> Optional[dict]:
+    """Run the independent loads concurrently; None if the movie doesn't exist.
+
+    Raises TimeoutError when the parts together take longer than `timeout`.
+    """
+    def in_session(load, *args):
+        # Sessions aren't thread-safe, so every part opens its own
+        def run():
+            with routed_session(request) as session:
+                return load(session, *args)
+        return run
+
+    parts = {
+        "movie": in_session(get_movie_detail, movie_id),
+        "reviews": in_session(get_movie_reviews_page, movie_id, reviews_limit),
+        "rating_histogram": in_session(get_rating_histogram, movie_id),
+    }
+    if user_id is not None:
+        parts["is_favorite"] = in_session(is_favorite, user_id, movie_id)
+
+    results = {}
+
+    async def run_part(name, func):
+        # A thread can't be interrupted; on timeout it finishes in the background
+        results[name] = await to_thread.run_sync(func, abandon_on_cancel=True)
+
+    with anyio.fail_after(timeout):
+        async with anyio.create_task_group() as task_group:
+            for name, func in parts.items():
+                task_group.start_soon(run_part, name, func)
+
+    if results["movie"] is None:
+        return None
+    results.setdefault("is_favorite", None)
+    results["review_count"] = sum(results["rating_histogram"].values())
+    return results
@@ -1,9 +1,21 @@
+import re
+import unicodedata
+from sqlalchemy import delete
 from sqlmodel import Session, select, func
-from typing import List, Optional
+from typing import Dict, List, Optional
 from models.movie import Movie
 from models.genre import Genre
 from models.movie_genre_link import MovieGenreLink
 from models.review import Review
+from models.favorite import Favorite
+
+# Fields GET /movies/ can return with `fields=`; id is always included
+MOVIE_LIST_FIELDS = ("id", "title", "director", "description", "image",
+                     "release_date", "genres", "rating", "slug")
+# Computed from other tables rather than selected from movies
+COMPUTED_MOVIE_FIELDS = {"genres", "rating"}
+# Leaves room for a collision suffix within the 255-character column
+SLUG_MAX_LENGTH = 200
 
 def get_movie_rating(session: Session, movie_id: Optional[int]) -> float:
     """Calculate average rating for a movie from reviews"""
@@ -19,46 +31,156 @@ def get_movie_genres(session: Session, movie_id: Optional[int]) -> List[str]:
     """Get all genre names for a movie"""
     if movie_id is None:
         return []
-        
-    genre_ids = session.exec(
-        select(MovieGenreLink.genre_id).where(MovieGenreLink.movie_id == movie_id)
-    ).all()
-    
-    if not genre_ids:
-        return []
-    
-    # Get genres one by one to avoid in_ issues
-    genres = []
-    for genre_id in genre_ids:
-        if genre_id is not None:
-            genre_name = session.exec(
-                select(Genre.name).where(Genre.id == genre_id)
-            ).first()
-            if genre_name:
-                genres.append(genre_name)
-    
+
+    return list(session.exec(
+        select(Genre.name)
+        .join(MovieGenreLink, MovieGenreLink.genre_id == Genre.id)
+        .where(MovieGenreLink.movie_id == movie_id)
+    ).all())
+
+def get_movies_ratings(session: Session, movie_ids: Optional[List[int]] = None) -> Dict[int, float]:
+    """Average rating per movie in one grouped query (all movies if movie_ids is None)"""
+    statement = select(Review.movie_id, func.avg(Review.rating)).group_by(Review.movie_id)
+    if movie_ids is not None:
+        if not movie_ids:
+            return {}
+        statement = statement.where(Review.movie_id.in_(movie_ids))
+
+    return {
+        movie_id: round(float(avg), 1)
+        for movie_id, avg in session.exec(statement).all()
+        if movie_id is not None and avg is not None
+    }
+
+def get_movies_genres(session: Session, movie_ids: Optional[List[int]] = None) -> Dict[int, List[str]]:
+    """Genre names per movie in one joined query (all movies if movie_ids is None)"""
+    statement = select(MovieGenreLink.movie_id, Genre.name).join(
+        Genre, Genre.id == MovieGenreLink.genre_id
+    )
+    if movie_ids is not None:
+        if not movie_ids:
+            return {}
+        statement = statement.where(MovieGenreLink.movie_id.in_(movie_ids))
+
+    genres: Dict[int, List[str]] = {}
+    for movie_id, genre_name in session.exec(statement).all():
+        genres.setdefault(movie_id, []).append(genre_name)
     return genres
 
 def create_movie_slug(title: str) -> str:
     """Create URL-friendly slug from movie title"""
-    return title.lower().replace(" ", "-").replace(":", "").replace("'", "")
+    ascii_title = unicodedata.normalize("NFKD", title).encode("ascii", "ignore").decode()
+    slug = re.sub(r"[^a-z0-9]+", "-", ascii_title.lower().replace("'", "")).strip("-")
+    return slug[:SLUG_MAX_LENGTH].rstrip("-") or "movie"
+
+def unique_movie_slug(session: Session, title: str, movie_id: Optional[int] = None) -> str:
+    """Slug for `title` that no other movie uses: "alien", then "alien-2", "alien-3"...
+
+    One query reads every taken variant. The unique index still has the
+    final say if two requests pick the same slug at once.
+    """
+    base = create_movie_slug(title)
+    # Slugs are [a-z0-9-] only, and "-" is the one such character below ".", so
+    # this range holds exactly `base` and `base-...`; unlike LIKE (case-insensitive
+    # in SQLite) it is served by the slug index
+    statement = select(Movie.slug).where(Movie.slug >= base, Movie.slug < f"{base}.")
+    if movie_id is not None:
+        statement = statement.where(Movie.id != movie_id)
+    taken = set(session.exec(statement).all())
+
+    slug, suffix = base, 2
+    while slug in taken:
+        slug, suffix = f"{base}-{suffix}", suffix + 1
+    return slug
 
 def get_movies_with_filters(session: Session, genre: Optional[str] = None, sort: Optional[str] = "desc") -> List[Movie]:
     """Get movies with optional genre filtering - business logic"""
     statement = select(Movie)
-    movies = session.exec(statement).all()
 
     # Filter by genre if specified
     if genre:
-        filtered = []
-        for movie in movies:
-            if movie.id is not None:
-                movie_genres = get_movie_genres(session, movie.id)
-                if genre in movie_genres:
-                    filtered.append(movie)
-        movies = filtered
-    
-    return movies
+        statement = (
+            statement
+            .join(MovieGenreLink, MovieGenreLink.movie_id == Movie.id)
+            .join(Genre, Genre.id == MovieGenreLink.genre_id)
+            .where(Genre.name == genre)
+        )
+
+    return list(session.exec(statement).all())
+
+def parse_movie_ids(ids: str, max_ids: int) -> List[int]:
+    """Turn "3,1,3" into [3, 1]: requested order, duplicates dropped"""
+    movie_ids: Dict[int, None] = {}  # keeps insertion order
+    for part in ids.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if not (part.isascii() and part.isdigit()):  # "²".isdigit() too, but int() refuses it
+            raise ValueError(f"Invalid movie id {part!r}")
+        movie_ids[int(part)] = None
+        if len(movie_ids) > max_ids:
+            raise ValueError(f"At most {max_ids} ids per request")
+    return list(movie_ids)
+
+def get_movies_by_ids(session: Session, movie_ids: List[int]) -> List[dict]:
+    """Response rows for `movie_ids` in the given order; unknown ids are skipped.
+
+    Three queries whatever the count: the movies, their ratings, their genres.
+    """
+    if not movie_ids:
+        return []
+    movies = {movie.id: movie for movie in session.exec(select(Movie).where(Movie.id.in_(movie_ids))).all()}
+    ordered = [movies[movie_id] for movie_id in movie_ids if movie_id in movies]
+    return build_movies_response_data(session, ordered)
+
+def parse_movie_fields(fields: Optional[str]) -> Optional[List[str]]:
+    """Turn "title,rating" into field names in schema order (None means every field)"""
+    if not fields:
+        return None
+    requested = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = requested - set(MOVIE_LIST_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))} "
+                         f"(allowed: {', '.join(MOVIE_LIST_FIELDS)})")
+    requested.add("id")
+    return [name for name in MOVIE_LIST_FIELDS if name in requested]
+
+def get_movie_rows(session: Session, fields: List[str], genre: Optional[str] = None,
+                   sort: Optional[str] = "desc") -> List[dict]:
+    """Movies sorted by rating, as dicts holding only `fields`.
+
+    Only the needed movie columns are selected, so e.g. description is never
+    loaded unless asked for. Ratings are always fetched (they decide the
+    order); genres only when requested.
+    """
+    columns = [name for name in fields if name not in COMPUTED_MOVIE_FIELDS]
+
+    statement = select(*(getattr(Movie, name) for name in columns))
+    if genre:
+        statement = (
+            statement
+            .join(MovieGenreLink, MovieGenreLink.movie_id == Movie.id)
+            .join(Genre, Genre.id == MovieGenreLink.genre_id)
+            .where(Genre.name == genre)
+        )
+    results = session.exec(statement).all()
+    # A single selected column comes back as plain values, not rows
+    rows = [dict(zip(columns, row if len(columns) > 1 else (row,))) for row in results]
+
+    movie_ids = None if not genre else [row["id"] for row in rows]
+    ratings = get_movies_ratings(session, movie_ids)
+    genres = get_movies_genres(session, movie_ids) if "genres" in fields else {}
+    for row in rows:
+        row["rating"] = ratings.get(row["id"], 0.0)
+    rows.sort(key=lambda row: row["rating"], reverse=sort != "asc")
+
+    return [
+        {
+            name: genres.get(row["id"], []) if name == "genres" else row[name]
+            for name in fields
+        }
+        for row in rows
+    ]
 
 def build_movie_response_data(session: Session, movie: Movie) -> dict:
     """Build enhanced movie response data with genres, rating, and slug"""
@@ -67,7 +189,6 @@ def build_movie_response_data(session: Session, movie: Movie) -> dict:
         
     rating = get_movie_rating(session, movie.id)
     genres = get_movie_genres(session, movie.id)
-    slug = create_movie_slug(movie.title)
     
     return {
         "id": movie.id,
@@ -78,5 +199,43 @@ def build_movie_response_data(session: Session, movie: Movie) -> dict:
         "release_date": movie.release_date,
         "genres": genres,
         "rating": rating,
-        "slug": slug
-    }
\ No newline at end of file
+        "slug": movie.slug
+    }
+
+def build_movies_response_data(session: Session, movies: List[Movie], all_movies: bool = False) -> List[dict]:
+    """Build response data for many movies with a fixed number of queries.
+
+    Ratings and genres are fetched in one query each; pass all_movies=True
+    when `movies` is the whole catalog to skip the IN (...) filter.
+    """
+    movie_ids = None if all_movies else [movie.id for movie in movies if movie.id is not None]
+    ratings = get_movies_ratings(session, movie_ids)
+    genres = get_movies_genres(session, movie_ids)
+
+    return [
+        {
+            "id": movie.id,
+            "title": movie.title,
+            "director": movie.director,
+            "description": movie.description,
+            "image": movie.image,
+            "release_date": movie.release_date,
+            "genres": genres.get(movie.id, []),
+            "rating": ratings.get(movie.id, 0.0),
+            "slug": movie.slug
+        }
+        for movie in movies
+        if movie.id is not None
+    ]
+
+def delete_movie_cascade(session: Session, movie_id: int) -> bool:
+    """Delete a movie with its reviews, favorites and genre links; False if it didn't exist.
+
+    One DELETE per table no matter how many reviews or favorites the movie
+    has, and no rows are loaded. The caller commits.
+    """
+    connection = session.connection()
+    for table, column in ((Favorite, Favorite.movie_id), (Review, Review.movie_id),
+                          (MovieGenreLink, MovieGenreLink.movie_id)):
+        connection.execute(delete(table).where(column == movie_id))
+    return connection.execute(delete(Movie).where(Movie.id == movie_id)).rowcount > 0
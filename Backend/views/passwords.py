@@ -0,0 +1,74 @@
+"""
+Password hashing.
+
+Kept free of database and app imports: bulk imports hash in spawned
+worker processes, which import only this module.
+"""
+import math
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import List, Optional
+
+
+@lru_cache()
+def get_pwd_context():
+    # passlib is imported on first use so it doesn't slow down cold starts
+    from passlib.context import CryptContext
+    return CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+def hash_password(password: str) -> str:
+    return get_pwd_context().hash(password)
+
+def verify_password(plain_password: str, hashed_password: str) -> bool:
+    return get_pwd_context().verify(plain_password, hashed_password)
+
+def is_password_hash(value: str) -> bool:
+    """True if `value` is a hash this app can verify (e.g. exported from another system)."""
+    return get_pwd_context().identify(value, required=False) is not None
+
+
+def _hash_chunk(passwords: List[str]) -> List[str]:
+    return [hash_password(password) for password in passwords]
+
+
+class PasswordHasher:
+    """Hashes lists of passwords across `workers` processes (default: every core).
+
+    bcrypt is deliberately slow, so bulk imports spread it over a process
+    pool. Workers are spawned rather than forked: the server process has
+    threads and open connections a forked child must not inherit. Spawning
+    costs an interpreter start and the imports, so the pool is started on
+    first use and kept for every later call; close it (or use `with`) when
+    the import is done.
+    """
+
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def hash(self, passwords: List[str]) -> List[str]:
+        workers = min(self.workers, len(passwords))
+        if workers <= 1:
+            return _hash_chunk(passwords)
+        if self._pool is None:
+            context = multiprocessing.get_context("spawn")
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+        # A few chunks per worker keeps them all busy without per-item IPC
+        size = math.ceil(len(passwords) / (workers * 4))
+        chunks = [passwords[i:i + size] for i in range(0, len(passwords), size)]
+        return [hashed for chunk in self._pool.map(_hash_chunk, chunks) for hashed in chunk]
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
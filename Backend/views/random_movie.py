@@ -0,0 +1,170 @@
+import random
+import threading
+from typing import Dict, List, Optional
+from sqlmodel import Session, select
+from models.movie import Movie
+from models.genre import Genre
+from models.movie_genre_link import MovieGenreLink
+from models.movie_tombstone import MovieTombstone
+from database.workers import after_fork
+from views.movie_changes import get_current_version
+
+
+class _IdArray:
+    """Array of ids with O(1) add, remove and uniform sampling.
+
+    Removal swaps the last element into the freed slot, so `positions`
+    always maps an id to its index in `ids`.
+    """
+
+    def __init__(self):
+        self.ids: List[int] = []
+        self.positions: Dict[int, int] = {}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def add(self, item_id: int):
+        if item_id in self.positions:
+            return
+        self.positions[item_id] = len(self.ids)
+        self.ids.append(item_id)
+
+    def remove(self, item_id: int):
+        index = self.positions.pop(item_id, None)
+        if index is None:
+            return
+        last = self.ids.pop()
+        if index < len(self.ids):
+            self.ids[index] = last
+            self.positions[last] = index
+
+    def sample(self, rng: random.Random) -> Optional[int]:
+        if not self.ids:
+            return None
+        return self.ids[rng.randrange(len(self.ids))]
+
+
+class RandomMovieSampler:
+    """In-memory pool of valid movie ids, optionally split by genre name.
+
+    Loaded lazily from the database on first use, then kept current by
+    change version (views/movie_changes.py) like the facet index: each
+    use reads the version and, if it moved, re-reads just the movies
+    stamped since and drops the tombstoned ones, so writes made by other
+    workers show up too. The write paths also update the pool directly,
+    so the worker that made a write sees it without waiting for that.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+        self._all = _IdArray()
+        self._by_genre: Dict[str, _IdArray] = {}
+        self.version: Optional[int] = None
+
+    def _load(self, session: Session, movie_ids: Optional[List[int]], version: int):
+        """(Re)add the given movies, or every movie when movie_ids is None."""
+        movies = select(Movie.id)
+        genres = select(MovieGenreLink.movie_id, Genre.name).join(Genre, Genre.id == MovieGenreLink.genre_id)
+        if movie_ids is not None:
+            # Rows stamped after `version` wait for the next catch-up
+            movies = movies.where(Movie.id.in_(movie_ids), Movie.version <= version)
+            genres = genres.where(MovieGenreLink.movie_id.in_(movie_ids))
+            for movie_id in movie_ids:
+                self._remove(movie_id)
+
+        for movie_id in session.exec(movies).all():
+            if movie_id is not None:
+                self._all.add(movie_id)
+        for movie_id, genre_name in session.exec(genres).all():
+            if movie_id is not None and movie_id in self._all.positions:
+                self._by_genre.setdefault(genre_name, _IdArray()).add(movie_id)
+
+    def ensure_current(self, session: Session):
+        """Catch up with the database: one query when nothing changed."""
+        with self._lock:
+            version = get_current_version(session)
+            if self.version == version:
+                return
+            if self.version is None or version < self.version:
+                # First use, or the database was reset under us
+                self._all = _IdArray()
+                self._by_genre = {}
+                self._load(session, None, version)
+            else:
+                changed = list(session.exec(
+                    select(Movie.id).where(Movie.version > self.version, Movie.version <= version)
+                ).all())
+                deleted = session.exec(
+                    select(MovieTombstone.movie_id)
+                    .where(MovieTombstone.version > self.version, MovieTombstone.version <= version)
+                ).all()
+                for movie_id in deleted:
+                    self._remove(movie_id)
+                if changed:
+                    self._load(session, changed, version)
+            self.version = version
+
+    def add(self, movie_id: int, genres: Optional[List[str]] = None):
+        """Register a newly created movie (no-op until the pool is loaded)."""
+        with self._lock:
+            if self.version is None:
+                return
+            self._all.add(movie_id)
+            for genre_name in genres or []:
+                self._by_genre.setdefault(genre_name, _IdArray()).add(movie_id)
+
+    def remove(self, movie_id: int):
+        """Drop a deleted movie from the pool and every genre array."""
+        with self._lock:
+            if self.version is None:
+                return
+            self._remove(movie_id)
+
+    def _remove(self, movie_id: int):
+        self._all.remove(movie_id)
+        for genre_ids in self._by_genre.values():
+            genre_ids.remove(movie_id)
+
+    def sample(self, genre: Optional[str] = None) -> Optional[int]:
+        with self._lock:
+            pool = self._by_genre.get(genre) if genre else self._all
+            if pool is None:
+                return None
+            return pool.sample(self._rng)
+
+    def reset(self):
+        with self._lock:
+            self._all = _IdArray()
+            self._by_genre = {}
+            self.version = None
+
+    def reset_after_fork(self):
+        # The lock may have been held by another thread at fork time, and
+        # workers sharing the parent's RNG state would all pick the same movies
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+        self.reset()
+
+
+random_movie_sampler = RandomMovieSampler()
+after_fork(random_movie_sampler.reset_after_fork)
+
+
+def get_random_movie(session: Session, genre: Optional[str] = None, max_attempts: int = 3) -> Optional[Movie]:
+    """Pick a uniformly random movie, optionally within a genre.
+
+    Costs a version check plus one primary-key fetch per attempt; ids that
+    vanished anyway (deleted after the check) are dropped and retried.
+    """
+    random_movie_sampler.ensure_current(session)
+    for _ in range(max_attempts):
+        movie_id = random_movie_sampler.sample(genre)
+        if movie_id is None:
+            return None
+        movie = session.get(Movie, movie_id)
+        if movie:
+            return movie
+        random_movie_sampler.remove(movie_id)
+    return None
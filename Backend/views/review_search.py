@@ -0,0 +1,160 @@
+"""
+Full-text search over review text.
+
+MySQL matches against the FULLTEXT index on reviews.review_text; SQLite
+(local and test runs) matches against the reviews_fts FTS5 table (see
+models/review.py). Either way the engine's index produces (id, score)
+pairs, and one shared query joins them to the review, its author and its
+movie. Hits come best first. Pages use a cursor holding the last hit's
+(score, id) instead of an OFFSET, so page 50 costs the same as page 1.
+"""
+import base64
+import html
+import json
+import re
+from typing import List, Optional, Tuple
+
+from sqlalchemy import Float, Integer, and_, or_, text
+from sqlmodel import Session, select
+
+from models.movie import Movie
+from models.review import Review
+from models.user import User
+
+SEARCH_DIALECTS = ("sqlite", "mysql")
+MAX_TERMS = 8
+SNIPPET_WORDS = 24
+MARK_START, MARK_END = "<mark>", "</mark>"
+
+_WORD = re.compile(r"(\w+)", re.UNICODE)
+
+# InnoDB's defaults (innodb_ft_min_token_size and INNODB_FT_DEFAULT_STOPWORD).
+# Such words are never indexed, so a required "+word" would match nothing.
+MYSQL_MIN_TOKEN_SIZE = 3
+MYSQL_STOPWORDS = frozenset((
+    "a about an are as at be by com de en for from how i in is it la of on or "
+    "that the this to was what when where who will with und www"
+).split())
+
+
+def parse_terms(q: str) -> List[str]:
+    """Words of the query, lowercased and deduplicated; operators and quotes are dropped."""
+    terms = []
+    for word in _WORD.findall(q.lower()):
+        if word not in terms:
+            terms.append(word)
+    return terms[:MAX_TERMS]
+
+
+def encode_cursor(score: float, review_id: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps([score, review_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        score, review_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return float(score), int(review_id)
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def ensure_search_supported(*engines):
+    """Refuse to start on a database whose full-text index _hits can't query."""
+    for engine in engines:
+        if engine is not None and engine.dialect.name not in SEARCH_DIALECTS:
+            raise RuntimeError(f"Review search needs one of {', '.join(SEARCH_DIALECTS)}, "
+                               f"not {engine.dialect.name} ({engine.url.render_as_string()})")
+
+
+def _hits(dialect: str, terms: List[str]):
+    """(id, score) of every matching review, higher score = better match.
+
+    Only SEARCH_DIALECTS get here: ensure_search_supported runs at startup.
+    """
+    if dialect == "sqlite":
+        # Every term must appear; the last one may be a prefix (search as you type)
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        statement = text(
+            "SELECT rowid AS id, -bm25(reviews_fts) AS score FROM reviews_fts WHERE reviews_fts MATCH :match"
+        ).bindparams(match=match)
+    else:
+        # A prefix term ("word*") is kept even when short or a stopword
+        *words, prefix = terms
+        words = [word for word in words if len(word) >= MYSQL_MIN_TOKEN_SIZE and word not in MYSQL_STOPWORDS]
+        required = " ".join(f"+{term}" for term in [*words, prefix]) + "*"
+        statement = text(
+            "SELECT id, MATCH (review_text) AGAINST (:natural IN NATURAL LANGUAGE MODE) AS score "
+            "FROM reviews WHERE MATCH (review_text) AGAINST (:required IN BOOLEAN MODE)"
+        ).bindparams(natural=" ".join(terms), required=required)
+    return statement.columns(id=Integer, score=Float).subquery("hits")
+
+
+def highlight(review_text: str, terms: List[str], words: int = SNIPPET_WORDS) -> str:
+    """A window of `words` words around the first match, matches wrapped in <mark>.
+
+    Like the search itself, only the last term matches as a prefix. The
+    result is HTML: the review text is escaped, only the marks are markup.
+    """
+    tokens = _WORD.split(review_text)  # words sit at the odd indexes
+    positions = range(1, len(tokens), 2)
+    *whole, prefix = terms
+    is_match = lambda token: token.lower() in whole or token.lower().startswith(prefix)
+    first = next((i for i in positions if is_match(tokens[i])), 1)
+
+    start = max(1, first - 2 * (words // 3))
+    end = min(len(tokens), start + 2 * words - 1)
+    parts = ["…" if start > 1 else html.escape(tokens[0])]
+    for i in range(start, end):
+        token = html.escape(tokens[i])
+        parts.append(f"{MARK_START}{token}{MARK_END}" if i % 2 and is_match(tokens[i]) else token)
+    if end < len(tokens):
+        parts.append("…")
+    return "".join(parts).strip()
+
+
+def search_reviews(session: Session, q: str, movie_id: Optional[int] = None, user_id: Optional[int] = None,
+                   limit: int = 20, cursor: Optional[str] = None) -> dict:
+    """One page of reviews matching `q` (see schemas.review.ReviewSearchPage).
+
+    Raises ValueError for a query without words or a malformed cursor.
+    """
+    terms = parse_terms(q)
+    if not terms:
+        raise ValueError("Search query has no words")
+
+    hits = _hits(session.get_bind().dialect.name, terms)
+    statement = (
+        select(Review.id, Review.rating, Review.review_text, Review.review_date,
+               User.id, User.username, Movie.id, Movie.title, hits.c.score)
+        .join(hits, hits.c.id == Review.id)
+        .outerjoin(User, User.id == Review.user_id)
+        .outerjoin(Movie, Movie.id == Review.movie_id)
+    )
+    if movie_id is not None:
+        statement = statement.where(Review.movie_id == movie_id)
+    if user_id is not None:
+        statement = statement.where(Review.user_id == user_id)
+    if cursor:
+        after_score, after_id = decode_cursor(cursor)
+        statement = statement.where(or_(
+            hits.c.score < after_score,
+            and_(hits.c.score == after_score, Review.id < after_id),
+        ))
+    # One extra row tells whether there is a next page
+    rows = session.exec(statement.order_by(hits.c.score.desc(), Review.id.desc()).limit(limit + 1)).all()
+
+    items = [
+        {
+            "id": review_id,
+            "rating": rating,
+            "review_text": review_text,
+            "review_date": review_date,
+            "user": {"id": author_id, "username": username} if author_id is not None else None,
+            "movie": {"id": movie, "title": title} if movie is not None else None,
+            "score": score,
+            "snippet": highlight(review_text, terms),
+        }
+        for review_id, rating, review_text, review_date, author_id, username, movie, title, score in rows[:limit]
+    ]
+    next_cursor = encode_cursor(items[-1]["score"], items[-1]["id"]) if len(rows) > limit else None
+    return {"items": items, "next_cursor": next_cursor}
@@ -0,0 +1,49 @@
+import json
+from typing import Any, List
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from pydantic import TypeAdapter
+from schemas.movie import MovieReadWithGenres
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, pydantic-core is the fallback
+    orjson = None
+
+
+# Built once at import: the serializer for a movie list is compiled a single time
+movie_list_adapter = TypeAdapter(List[MovieReadWithGenres])
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson when it is installed."""
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(
+            jsonable_encoder(content), ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+
+def movie_list_response(rows: List[dict]) -> Response:
+    """Serialize trusted movie dicts (from build_movie_response_data) without re-validating.
+
+    The dicts are produced by our own view code from database rows, so the
+    response_model validation pass is skipped: orjson encodes them directly,
+    or the precompiled TypeAdapter dumps model_construct()ed instances.
+    """
+    if orjson is not None:
+        return FastJSONResponse(rows)
+    models = [MovieReadWithGenres.model_construct(**row) for row in rows]
+    return Response(content=movie_list_adapter.dump_json(models), media_type="application/json")
+
+
+def to_columns(rows: List[dict], fields: List[str]) -> dict:
+    """Columnar form of a list: one array per field instead of one object per row."""
+    return {"count": len(rows), "columns": {name: [row[name] for row in rows] for name in fields}}
+
+
+def sparse_list_response(rows: List[dict], fields: List[str], columnar: bool = False) -> Response:
+    """Serialize projected rows; they don't match the full response_model, so it is bypassed."""
+    return FastJSONResponse(to_columns(rows, fields) if columnar else rows)
@@ -1,30 +1,29 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from jose import jwt, JWTError, ExpiredSignatureError
-from passlib.context import CryptContext
 from fastapi.security import OAuth2PasswordBearer
 from fastapi import Depends, HTTPException, status
-from sqlmodel import Session, select
+from sqlmodel import Session, select, or_
+from sqlalchemy import delete
+from sqlalchemy.orm import joinedload
 from database.config import settings
 from models.user import User
 from models.role import Role
+from models.review import Review
+from models.favorite import Favorite
 from database.database import get_session
 from schemas.user import Register, Login, UserUpdate
+from views.passwords import get_pwd_context, hash_password, verify_password
+from views.movie_changes import touch_movies
 
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login")
+optional_oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/users/login", auto_error=False)
 secret_key = settings.SECRET_KEY.get_secret_value()
 algorithm = settings.ALGORITHM
 access_token_expire_minutes = settings.ACCESS_TOKEN_EXPIRE_MINUTES
 
 
-def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None):
     to_encode = data.copy()
@@ -71,6 +70,32 @@ def authenticate_user(db:Session, username: str, password: str):
 def get_all_users(db:Session):
     stmt = select(User)
     return db.exec(stmt).all()
+def prefix_range(column, prefix: str):
+    """`column LIKE 'prefix%'` as a range, so both SQLite and MySQL use the index."""
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return (column >= prefix) & (column < upper)
+
+def get_users_page(db: Session, limit: int, after: Optional[str] = None, q: Optional[str] = None,
+                   role: Optional[str] = None) -> Tuple[List[User], Optional[str]]:
+    """One page of users in username order, plus the cursor for the next page.
+
+    Keyset pagination: `after` is the last username of the previous page, so
+    every page is an index range scan no matter how deep it is. `q` matches a
+    username or email prefix; roles are joined in the same query.
+    """
+    stmt = select(User).options(joinedload(User.role)).order_by(User.username).limit(limit + 1)
+    if after:
+        stmt = stmt.where(User.username > after)
+    if q:
+        q = q.strip().lower()  # usernames and emails are stored lowercased
+        stmt = stmt.where(or_(prefix_range(User.username, q), prefix_range(User.email, q)))
+    if role:
+        stmt = stmt.where(User.role_id == select(Role.id).where(Role.name == role).scalar_subquery())
+
+    users = list(db.exec(stmt).all())
+    next_cursor = users[limit - 1].username if len(users) > limit else None
+    return users[:limit], next_cursor
+
 def get_role_by_name(db:Session, role_name:str):
     stmt = select(Role).where(Role.name == role_name)
     return db.exec(stmt).first()
@@ -123,6 +148,21 @@ def get_current_user2(token: str = Depends(oauth2_scheme), db: Session = Depends
     return user
 
 
+def get_token_user_id(token: Optional[str] = Depends(optional_oauth2_scheme)) -> Optional[int]:
+    """User id from the bearer token without a database lookup; None for anonymous callers."""
+    if token is None:
+        return None
+    sub = verify_token(token).get("sub")  # raises 401 for bad or expired tokens
+    try:
+        return int(sub)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+
+
 def register(db:Session, user_data):#:Register
     
     if get_user_by_username(db, user_data.username):
@@ -223,9 +263,23 @@ def update_user(db:Session, user:User, user_data):#:UserUpdate
     db.refresh(user)
     return user
 
-def delete_user(db:Session, user:User):
-    db.delete(user)
+def delete_user(db:Session, user:User) -> Tuple[List[int], List[int]]:
+    """Delete a user with their reviews and favorites in set-based statements.
+
+    Returns the ids of the movies they had reviewed and favorited, whose
+    ratings and favorite counts just changed.
+    """
+    user_id = user.id
+    reviewed = list(db.exec(select(Review.movie_id).where(Review.user_id == user_id).distinct()).all())
+    favorited = list(db.exec(select(Favorite.movie_id).where(Favorite.user_id == user_id)).all())
+
+    connection = db.connection()
+    connection.execute(delete(Review).where(Review.user_id == user_id))
+    connection.execute(delete(Favorite).where(Favorite.user_id == user_id))
+    connection.execute(delete(User).where(User.id == user_id))
+    touch_movies(db, reviewed)
     db.commit()
+    return reviewed, favorited
 
 def set_user_role(db:Session, user:User, role_id:int):
     user.role_id = role_id
@@ -0,0 +1,200 @@
+"""
+Bulk user import from CSV or NDJSON.
+
+For each batch of rows, one query finds the usernames and emails that are
+already taken. The passwords are then hashed across a process pool (one for
+the whole import), and the new users are inserted with one executemany
+INSERT plus one query to read their ids back. Every input row gets a
+result, so a bad row never stops the rest.
+"""
+import csv
+import io
+import json
+from typing import Dict, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select, or_
+
+from models.role import Role
+from models.user import User
+from schemas.user import UserImport
+from views.passwords import PasswordHasher, is_password_hash
+
+FORMATS = ("csv", "ndjson")
+
+# (row number, parsed record or the reason it couldn't be parsed)
+Record = Tuple[int, Union[dict, str]]
+
+
+def detect_format(filename: Optional[str], content_type: Optional[str] = None) -> str:
+    name = (filename or "").lower()
+    if name.endswith((".ndjson", ".jsonl")) or "ndjson" in (content_type or ""):
+        return "ndjson"
+    return "csv"
+
+
+def parse_records(text: str, fmt: str) -> List[Record]:
+    """Split an import file into records; rows are numbered from 1, not counting a CSV header."""
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        # Empty cells mean "not given", so optional fields keep their defaults
+        return [
+            (number, {key.strip(): value.strip() for key, value in row.items()
+                      if key and isinstance(value, str) and value.strip()})
+            for number, row in enumerate(reader, start=1)
+        ]
+
+    records = []
+    for number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as exc:
+            records.append((number, f"invalid JSON: {exc.msg}"))
+            continue
+        records.append((number, record if isinstance(record, dict) else "expected a JSON object"))
+    return records
+
+
+def _error(number: int, username: Optional[str], message: str) -> dict:
+    return {"row": number, "username": username, "status": "error", "error": message}
+
+
+def _validation_message(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc']) or 'row'}: {error['msg']}"
+        for error in exc.errors()
+    )
+
+
+def _validate(records: List[Record], results: Dict[int, dict]) -> List[Tuple[int, UserImport]]:
+    """Schema checks and duplicates within the file; failures go straight into `results`."""
+    valid = []
+    usernames, emails = set(), set()
+    for number, record in records:
+        if isinstance(record, str):
+            results[number] = _error(number, None, record)
+            continue
+        try:
+            user = UserImport.model_validate(record)
+        except ValidationError as exc:
+            results[number] = _error(number, record.get("username"), _validation_message(exc))
+            continue
+
+        # Stored lowercased, like register2 does
+        user.username = user.username.lower()
+        user.email = user.email.lower()
+        if user.hashed_password and not is_password_hash(user.hashed_password):
+            results[number] = _error(number, user.username, "hashed_password is not a bcrypt hash")
+        elif user.username in usernames:
+            results[number] = _error(number, user.username, "Username appears earlier in the file")
+        elif user.email in emails:
+            results[number] = _error(number, user.username, "Email appears earlier in the file")
+        else:
+            usernames.add(user.username)
+            emails.add(user.email)
+            valid.append((number, user))
+    return valid
+
+
+def _insert_batch(session: Session, rows: List[dict]) -> Dict[str, int]:
+    """Insert the rows in one statement and commit; returns username -> id."""
+    session.connection().execute(User.__table__.insert(), rows)
+    ids = dict(session.exec(
+        select(User.username, User.id).where(User.username.in_([row["username"] for row in rows]))
+    ).all())
+    session.commit()
+    return ids
+
+
+def _insert_each(session: Session, rows: List[dict]) -> Dict[str, int]:
+    """Insert and commit the rows one at a time, skipping the ones that conflict."""
+    ids = {}
+    for row in rows:
+        try:
+            result = session.connection().execute(User.__table__.insert(), row)
+            session.commit()
+        except IntegrityError:
+            session.rollback()
+            continue
+        ids[row["username"]] = result.inserted_primary_key[0]
+    return ids
+
+
+def _import_batch(session: Session, batch: List[Tuple[int, UserImport]], role_ids: Dict[str, int],
+                  dry_run: bool, hasher: PasswordHasher, results: Dict[int, dict]):
+    """Check, hash and insert one batch, putting each row's outcome into `results`."""
+    taken = session.exec(
+        select(User.username, User.email).where(or_(
+            User.username.in_([user.username for _, user in batch]),
+            User.email.in_([user.email for _, user in batch]),
+        ))
+    ).all()
+    taken_usernames = {username for username, _ in taken}
+    taken_emails = {email for _, email in taken}
+
+    fresh = []
+    for number, user in batch:
+        if user.username in taken_usernames:
+            results[number] = _error(number, user.username, "Username already registered")
+        elif user.email in taken_emails:
+            results[number] = _error(number, user.username, "Email already registered")
+        elif dry_run:
+            results[number] = {"row": number, "username": user.username, "status": "valid"}
+        else:
+            fresh.append((number, user))
+    if not fresh:
+        return
+
+    hashed = iter(hasher.hash([user.password for _, user in fresh if user.password]))
+    rows = [
+        {
+            "username": user.username,
+            "email": user.email,
+            "name": user.name,
+            "surname": user.surname,
+            "address": user.address,
+            "hashed_password": user.hashed_password or next(hashed),
+            "role_id": role_ids.get(user.role),
+        }
+        for _, user in fresh
+    ]
+    try:
+        ids = _insert_batch(session, rows)
+    except IntegrityError:
+        # Someone registered some of these names since the check above: find out which
+        session.rollback()
+        ids = _insert_each(session, rows)
+
+    for number, user in fresh:
+        if user.username in ids:
+            results[number] = {"row": number, "username": user.username,
+                               "status": "created", "id": ids[user.username]}
+        else:
+            results[number] = _error(number, user.username, "Username or email was registered during the import")
+
+
+def import_users(session: Session, records: List[Record], batch_size: int = 1000,
+                 dry_run: bool = False, hash_workers: Optional[int] = None) -> dict:
+    """Create users from parsed records; returns the per-row report (see schemas.user.ImportReport).
+
+    Each batch is committed on its own. With dry_run nothing is hashed or
+    written; rows that would be created are reported as "valid".
+    """
+    results: Dict[int, dict] = {}
+    valid = _validate(records, results)
+    role_ids = dict(session.exec(select(Role.name, Role.id)).all())
+
+    with PasswordHasher(hash_workers) as hasher:
+        for start in range(0, len(valid), batch_size):
+            _import_batch(session, valid[start:start + batch_size], role_ids, dry_run, hasher, results)
+
+    rows = [results[number] for number in sorted(results)]
+    return {
+        "created": sum(row["status"] == "created" for row in rows),
+        "failed": sum(row["status"] == "error" for row in rows),
+        "dry_run": dry_run,
+        "rows": rows,
+    }
@@ -35,22 +35,32 @@ function Modal({ isOpen, onClose, movie }) {
   const [favoriteMessage, setFavoriteMessage] = useState("");
   const [favoriteSeverity, setFavoriteSeverity] = useState("success");
 
-  // Load favorite status
+  // Initial reviews for UserReviews (null until the movie details are loaded)
+  const [details, setDetails] = useState(null);
+  const [detailsLoaded, setDetailsLoaded] = useState(false);
+
+  // Load favorite status and the first reviews in one request
   useEffect(() => {
     if (!movie) return;
 
     setCurrentRating(movie.rating);
     setIsUserRating(movie.isUserRating || false);
+    setDetails(null);
+    setDetailsLoaded(false);
 
-    const loadFavoriteStatus = async () => {
-      if (isAuthenticated) {
-        try {
-          const response = await apiService.checkFavoriteStatus(movie.id);
-          setIsFavorite(response.is_favorite);
+    const loadDetails = async () => {
+      try {
+        const full = await apiService.getMovieFull(movie.id);
+        setDetails(full);
+        setCurrentRating(full.movie.rating);
+        if (full.is_favorite !== null) {
+          setIsFavorite(full.is_favorite);
           return;
-        } catch {
-          // fallback to localStorage
         }
+      } catch {
+        // fallback to localStorage
+      } finally {
+        setDetailsLoaded(true);
       }
       const favorites = JSON.parse(
         localStorage.getItem("movieFavorites") || "[]"
@@ -58,7 +68,7 @@ function Modal({ isOpen, onClose, movie }) {
       setIsFavorite(favorites.includes(movie.id));
     };
 
-    loadFavoriteStatus();
+    loadDetails();
   }, [movie, isAuthenticated]);
 
   const updateMovieRating = (reviews) => {
@@ -321,10 +331,14 @@ function Modal({ isOpen, onClose, movie }) {
             >
               User Reviews
             </Typography>
-            <UserReviews
-              movieId={movie.id}
-              onReviewsChange={updateMovieRating}
-            />
+            {detailsLoaded && (
+              <UserReviews
+                movieId={movie.id}
+                initialReviews={details?.reviews}
+                reviewCount={details?.review_count}
+                onReviewsChange={updateMovieRating}
+              />
+            )}
           </Box>
         </Box>
       </DialogContent>
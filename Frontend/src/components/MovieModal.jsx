@@ -18,8 +18,7 @@ function MovieModal() {
       
       try {
         setLoading(true);
-        const movies = await moviesService.getAllMovies();
-        const foundMovie = movies.find((m) => m.slug === slug);
+        const foundMovie = await moviesService.getMovieBySlug(slug);
         setMovie(foundMovie);
         
         if (!foundMovie) {
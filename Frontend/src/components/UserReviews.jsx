@@ -22,7 +22,7 @@ import DeleteIcon from "@mui/icons-material/Delete";
 import { useAuth } from "../contexts/AuthContext";
 import { useThemeContext } from "../contexts/ThemeContext";
 
-function UserReviews({ movieId, onReviewsChange }) {
+function UserReviews({ movieId, initialReviews, reviewCount, onReviewsChange }) {
   const { currentUser, isAuthenticated } = useAuth();
   const { theme } = useThemeContext();
 
@@ -45,7 +45,11 @@ function UserReviews({ movieId, onReviewsChange }) {
         setError(null);
         console.log(`🎬 Loading reviews for movie ${movieId}...`);
         
-        const reviewsData = await apiService.getMovieReviews(movieId);
+        // The modal already fetched the first page; only refetch if there are more
+        const reviewsData =
+          initialReviews && reviewCount <= initialReviews.length
+            ? initialReviews
+            : await apiService.getMovieReviews(movieId);
         
         // Transform API data to match component expectations
         const transformedReviews = reviewsData.map(review => ({
@@ -80,7 +84,7 @@ function UserReviews({ movieId, onReviewsChange }) {
     };
 
     loadReviews();
-  }, [movieId]);
+  }, [movieId, initialReviews, reviewCount]);
 
   const handleAddReview = async () => {
     if (!isAuthenticated || !comment.trim() || !rating) {
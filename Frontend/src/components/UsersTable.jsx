@@ -19,6 +19,8 @@ import {
   Stack,
   Tooltip,
   Paper,
+  TextField,
+  MenuItem,
 } from "@mui/material";
 import {
   People as PeopleIcon,
@@ -76,8 +78,15 @@ export default function UsersTable({ showNotification }) {
 
   const [users, setUsers] = useState([]);
   const [loading, setLoading] = useState(true);
+  const [hasLoaded, setHasLoaded] = useState(false);
   const [error, setError] = useState(null);
 
+  // Server-side search and paging (the API returns one page at a time)
+  const [search, setSearch] = useState("");
+  const [roleFilter, setRoleFilter] = useState("");
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
   // viewerRole - treba da bude 'superadmin' da bi se dashboard video
   const viewerRole = deriveRoleFromUserObject(currentUser);
   const canAct = viewerRole === "superadmin";
@@ -91,14 +100,25 @@ export default function UsersTable({ showNotification }) {
   const getId = (u) => u?.id ?? u?._id ?? u?.user_id ?? u?.__rowId ?? null;
 
   // fetch users: prvo pokušaj API, pa fallback na localStorage / users.json
-  async function fetchUsers() {
-    setLoading(true);
+  // append=true loads the next page after the rows already shown
+  async function fetchUsers({ append = false } = {}) {
+    if (append) setLoadingMore(true);
+    else setLoading(true);
     setError(null);
     try {
       let list = [];
       let usedApi = false;
       try {
-        if (apiService && typeof apiService.getAllUsers === "function") {
+        if (apiService && typeof apiService.getUsersPage === "function") {
+          const page = await apiService.getUsersPage({
+            q: search.trim() || undefined,
+            role: roleFilter || undefined,
+            after: append ? nextCursor : undefined,
+          });
+          list = page?.items ?? [];
+          setNextCursor(page?.next_cursor ?? null);
+          usedApi = true;
+        } else if (apiService && typeof apiService.getAllUsers === "function") {
           const res = await apiService.getAllUsers();
           // standardne oblike odgovora:
           if (Array.isArray(res)) list = res;
@@ -163,20 +183,24 @@ export default function UsersTable({ showNotification }) {
         ...u,
       }));
 
-      setUsers(normalized);
+      setUsers((prev) => (append ? [...prev, ...normalized] : normalized));
     } catch (err) {
       console.error("fetchUsers error:", err);
       setError(err?.message || "Failed to load users");
       notify("Ne mogu da učitam korisnike.", "error");
     } finally {
       setLoading(false);
+      setLoadingMore(false);
+      setHasLoaded(true);
     }
   }
 
+  // Reload from the first page when the search changes (debounced while typing)
   useEffect(() => {
-    fetchUsers();
+    const timer = setTimeout(() => fetchUsers(), search ? 300 : 0);
+    return () => clearTimeout(timer);
     // eslint-disable-next-line react-hooks/exhaustive-deps
-  }, []);
+  }, [search, roleFilter]);
 
   // Helper: persist to localStorage (store full users array)
   const persistLocal = (arr) => {
@@ -381,7 +405,7 @@ export default function UsersTable({ showNotification }) {
     );
   }
 
-  if (loading) {
+  if (loading && !hasLoaded) {
     return (
       <Card sx={{ mb: 4 }}>
         <CardContent>
@@ -396,7 +420,7 @@ export default function UsersTable({ showNotification }) {
   return (
     <Card sx={{ mb: 4 }}>
       <CardHeader
-        title={`Users Management (${users.length})`}
+        title={`Users Management (${users.length}${nextCursor ? "+" : ""})`}
         subheader="Manage user roles and permissions"
         avatar={<PeopleIcon />}
       />
@@ -407,6 +431,29 @@ export default function UsersTable({ showNotification }) {
           </Box>
         ) : null}
 
+        <Stack direction={{ xs: "column", sm: "row" }} spacing={2} mb={2}>
+          <TextField
+            size="small"
+            label="Search username or email"
+            value={search}
+            onChange={(e) => setSearch(e.target.value)}
+            sx={{ flexGrow: 1 }}
+          />
+          <TextField
+            select
+            size="small"
+            label="Role"
+            value={roleFilter}
+            onChange={(e) => setRoleFilter(e.target.value)}
+            sx={{ minWidth: 160 }}
+          >
+            <MenuItem value="">All roles</MenuItem>
+            <MenuItem value="regular">Regular</MenuItem>
+            <MenuItem value="admin">Admin</MenuItem>
+            <MenuItem value="superadmin">Superadmin</MenuItem>
+          </TextField>
+        </Stack>
+
         {users.length === 0 ? (
           <Box
             display="flex"
@@ -515,6 +562,18 @@ export default function UsersTable({ showNotification }) {
             </Table>
           </TableContainer>
         )}
+
+        {nextCursor ? (
+          <Box display="flex" justifyContent="center" mt={2}>
+            <Button
+              variant="outlined"
+              onClick={() => fetchUsers({ append: true })}
+              disabled={loadingMore}
+            >
+              {loadingMore ? <CircularProgress size={20} /> : "Load more"}
+            </Button>
+          </Box>
+        ) : null}
       </CardContent>
     </Card>
   );
@@ -164,10 +164,52 @@ class ApiService {
     return await this.makeRequest(url, { method: "GET" });
   }
 
+  // Catalog delta since a sync version; without one, the whole catalog
+  async getMovieChanges(since = null) {
+    const url = since === null ? "/movies/changes" : `/movies/changes?since=${since}`;
+    return await this.makeRequest(url, { method: "GET" });
+  }
+
+  async getRandomMovie(genre = null) {
+    const params = new URLSearchParams();
+    if (genre) {
+      params.append("genre", genre);
+    }
+
+    const url = params.toString()
+      ? `/movies/random?${params.toString()}`
+      : "/movies/random";
+    return await this.makeRequest(url, { method: "GET" });
+  }
+
   async getMovieById(id) {
     return await this.makeRequest(`/movies/${id}`, { method: "GET" });
   }
 
+  // Many movies in one request, in the order of `ids` (unknown ids are left out)
+  async getMoviesByIds(ids) {
+    const params = new URLSearchParams({ ids: ids.join(",") });
+    return await this.makeRequest(`/movies/batch?${params.toString()}`, { method: "GET" });
+  }
+
+  async getMovieBySlug(slug) {
+    return await this.makeRequest(`/movies/by-slug/${encodeURIComponent(slug)}`, { method: "GET" });
+  }
+
+  // Movie, first page of reviews, rating histogram and favorite status in one request
+  async getMovieFull(movieId, reviewsLimit = 10) {
+    const token =
+      localStorage.getItem("token") || localStorage.getItem("authToken");
+
+    return await this.makeRequest(
+      `/movies/${movieId}/full?reviews_limit=${reviewsLimit}`,
+      {
+        method: "GET",
+        headers: token ? { Authorization: `Bearer ${token}` } : {},
+      }
+    );
+  }
+
   async getMoviesByGenre(genre, sort = "desc") {
     const params = new URLSearchParams();
     if (genre) {
@@ -182,6 +224,40 @@ class ApiService {
     });
   }
 
+  // Faceted browsing: genres/directors/ratings are arrays (any of), years a range.
+  // The response has total, items and facets: {genre|director|decade|rating: [{value, count}]}
+  async getMovieFacets({ genres = [], directors = [], ratings = [], yearFrom = null, yearTo = null,
+                         limit = 20, offset = 0 } = {}) {
+    const params = new URLSearchParams({ limit: String(limit), offset: String(offset) });
+    genres.forEach((genre) => params.append("genre", genre));
+    directors.forEach((director) => params.append("director", director));
+    ratings.forEach((rating) => params.append("rating", rating));
+    if (yearFrom) {
+      params.append("year_from", yearFrom);
+    }
+    if (yearTo) {
+      params.append("year_to", yearTo);
+    }
+    return await this.makeRequest(`/movies/facets?${params.toString()}`, { method: "GET" });
+  }
+
+  // Every genre with movie_count, review_count and average rating
+  async getGenres() {
+    return await this.makeRequest("/genres/", { method: "GET" });
+  }
+
+  // One page of a genre's movies; pass next_cursor back as `after` for the next one
+  async getGenreMovies(genre, { limit = 20, after = null } = {}) {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (after) {
+      params.append("after", after);
+    }
+    return await this.makeRequest(
+      `/genres/${encodeURIComponent(genre)}/movies?${params.toString()}`,
+      { method: "GET" }
+    );
+  }
+
   // Review-related API calls
   async getMovieReviews(movieId) {
     // Use the correct endpoint with query parameter
@@ -195,6 +271,22 @@ class ApiService {
     return await this.makeRequest("/reviews/", { method: "GET" });
   }
 
+  // Full-text search over review text; pass next_cursor back as cursor for more.
+  // Snippets wrap matches in <mark>…</mark>: split on the tags, don't inject them as HTML.
+  async searchReviews(q, { movieId = null, userId = null, limit = 20, cursor = null } = {}) {
+    const params = new URLSearchParams({ q, limit: String(limit) });
+    if (movieId) {
+      params.append("movie_id", movieId);
+    }
+    if (userId) {
+      params.append("user_id", userId);
+    }
+    if (cursor) {
+      params.append("cursor", cursor);
+    }
+    return await this.makeRequest(`/reviews/search?${params.toString()}`, { method: "GET" });
+  }
+
   async createReview(reviewData) {
     // Get auth token from localStorage
     const token =
@@ -254,16 +346,35 @@ class ApiService {
   }
 
   // User management API calls (admin/superadmin only)
-  async getAllUsers() {
+
+  // One page of the user directory: { items, next_cursor }
+  async getUsersPage({ q, role, after, limit = 50 } = {}) {
     const token =
       localStorage.getItem("token") || localStorage.getItem("authToken");
 
-    return await this.makeRequest("/users/", {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (q) params.append("q", q);
+    if (role) params.append("role", role);
+    if (after) params.append("after", after);
+
+    return await this.makeRequest(`/users/?${params.toString()}`, {
       method: "GET",
       headers: token ? { Authorization: `Bearer ${token}` } : {},
     });
   }
 
+  // Every user, following the page cursors (prefer getUsersPage for large lists)
+  async getAllUsers() {
+    const users = [];
+    let after = null;
+    do {
+      const page = await this.getUsersPage({ after, limit: 500 });
+      users.push(...page.items);
+      after = page.next_cursor;
+    } while (after);
+    return users;
+  }
+
   async deleteUser(userId) {
     const token =
       localStorage.getItem("token") || localStorage.getItem("authToken");
@@ -10,6 +10,8 @@ class MoviesService {
     this.moviesCacheTime = null;
     this.isLoading = false;
     this.listeners = new Set(); // For rating update notifications
+    this.eventSource = null; // Live rating updates from the backend (/events)
+    this.syncVersion = null; // Catalog version of moviesCache, for delta sync
   }
 
   // Check if cached data is still valid
@@ -45,17 +47,18 @@ class MoviesService {
     this.isLoading = true;
 
     try {
-      console.log('🎬 MoviesService: Fetching movies from API...');
-      const movies = await apiService.getAllMovies();
+      console.log('🎬 MoviesService: Syncing movies from API...');
+      const changes = await apiService.getMovieChanges(this.moviesCache ? this.syncVersion : null);
       
-      if (!Array.isArray(movies)) {
-        console.error('❌ Invalid response format, expected array but got:', typeof movies);
+      if (!changes || !Array.isArray(changes.movies) || !Array.isArray(changes.deleted)) {
+        console.error('❌ Invalid response format, expected catalog changes but got:', typeof changes);
         throw new Error('Invalid response format');
       }
       
-      console.log('✅ API Success: Received', movies.length, 'movies');
-      const transformed = this.transformMoviesData(movies);
-      console.log('🔄 Transformed', transformed.length, 'movies');
+      console.log('✅ API Success: Received', changes.movies.length, 'changed movies,', changes.deleted.length, 'deleted');
+      const transformed = this.applyMovieChanges(changes);
+      this.syncVersion = changes.version;
+      console.log('🔄 Catalog now has', transformed.length, 'movies');
       
       // Cache the results
       this.moviesCache = transformed;
@@ -83,6 +86,35 @@ class MoviesService {
     }
   }
 
+  // Merge a /movies/changes response into the cached catalog (rating desc, like GET /movies/)
+  applyMovieChanges(changes) {
+    const byId = new Map(
+      changes.reset || !this.moviesCache ? [] : this.moviesCache.map(movie => [movie.id, movie])
+    );
+    changes.deleted.forEach(id => byId.delete(id));
+    this.transformMoviesData(changes.movies).forEach(movie => byId.set(movie.id, movie));
+    return [...byId.values()].sort((a, b) => b.rating - a.rating);
+  }
+
+  // Get several movies by ID in one request; cached movies are not fetched again.
+  // The backend accepts up to 100 ids per call, so longer lists are split.
+  async getMoviesByIds(ids) {
+    const wanted = ids.map(id => parseInt(id));
+    const byId = new Map();
+    if (this.moviesCache && this.isCacheValid(this.moviesCacheTime)) {
+      this.moviesCache
+        .filter(movie => wanted.includes(movie.id))
+        .forEach(movie => byId.set(movie.id, movie));
+    }
+
+    const missing = wanted.filter(id => !byId.has(id));
+    for (let start = 0; start < missing.length; start += 100) {
+      const movies = await apiService.getMoviesByIds(missing.slice(start, start + 100));
+      this.transformMoviesData(movies).forEach(movie => byId.set(movie.id, movie));
+    }
+    return wanted.filter(id => byId.has(id)).map(id => byId.get(id));
+  }
+
   // Get single movie by ID - uses cached movies when available
   async getMovieById(id) {
     // Try to find movie in cached movies first
@@ -168,11 +200,20 @@ class MoviesService {
     return sorted;
   }
 
-  // Get movie by slug (for routing)
+  // Get movie by slug (for routing) - one indexed lookup instead of the whole catalog
   async getMovieBySlug(slug) {
+    if (this.moviesCache && this.isCacheValid(this.moviesCacheTime)) {
+      const cachedMovie = this.moviesCache.find(movie => movie.slug === slug);
+      if (cachedMovie) {
+        console.log(`🎯 MoviesService: Found movie ${slug} in cache`);
+        return cachedMovie;
+      }
+    }
+
     try {
-      const movies = await this.getAllMovies();
-      return movies.find(movie => movie.slug === slug) || null;
+      console.log(`🎬 MoviesService: Fetching movie ${slug} from API...`);
+      const movie = await apiService.getMovieBySlug(slug);
+      return this.transformMovieData(movie);
     } catch (error) {
       console.error(`Failed to fetch movie by slug ${slug}:`, error);
       return null;
@@ -201,12 +242,11 @@ class MoviesService {
     };
   }
 
-  // Get unique genres from all movies
+  // Get genre names (sorted by the backend) without loading every movie
   async getUniqueGenres() {
     try {
-      const movies = await this.getAllMovies();
-      const allGenres = movies.flatMap(movie => movie.genres);
-      return [...new Set(allGenres)].sort();
+      const genres = await apiService.getGenres();
+      return genres.map(genre => genre.name);
     } catch (error) {
       console.error('Failed to fetch genres:', error);
       return [];
@@ -254,7 +294,46 @@ class MoviesService {
   // Event listener management
   addRatingUpdateListener(callback) {
     this.listeners.add(callback);
-    return () => this.listeners.delete(callback); // Return unsubscribe function
+    this.connectLiveUpdates();
+    return () => {
+      this.listeners.delete(callback);
+      if (this.listeners.size === 0) {
+        this.disconnectLiveUpdates();
+      }
+    }; // Return unsubscribe function
+  }
+
+  // Subscribe to rating changes made by other users (Server-Sent Events)
+  connectLiveUpdates() {
+    if (this.eventSource || typeof EventSource === 'undefined') {
+      return;
+    }
+    // EventSource reconnects by itself and resumes from the last event id
+    this.eventSource = new EventSource(`${apiService.api.defaults.baseURL}/events`);
+    this.eventSource.addEventListener('rating', (event) => {
+      const { movie_id: movieId, rating } = JSON.parse(event.data);
+      if (!this.moviesCache) {
+        return;
+      }
+      const movie = this.moviesCache.find(m => m.id === movieId);
+      if (movie && movie.rating !== rating) {
+        movie.rating = rating;
+        this.notifyListeners(movieId, rating);
+      }
+    });
+    // Too many updates were missed; reload the list instead
+    this.eventSource.addEventListener('resync', () => {
+      this.getAllMovies(true).then(movies => {
+        movies.forEach(movie => this.notifyListeners(movie.id, movie.rating));
+      });
+    });
+  }
+
+  disconnectLiveUpdates() {
+    if (this.eventSource) {
+      this.eventSource.close();
+      this.eventSource = null;
+    }
   }
 
   notifyListeners(movieId, newRating) {
@@ -281,6 +360,7 @@ class MoviesService {
   clearCache() {
     this.moviesCache = null;
     this.moviesCacheTime = null;
+    this.syncVersion = null;
     this.cache.clear();
     console.log('🗑️ Cache cleared');
   }
@@ -1,11 +1,19 @@
+import apiService from "../services/apiService";
 import moviesService from "../services/moviesService";
 /**
- * Fetch a random movie from the moviesService
+ * Fetch a random movie sampled by the backend (/movies/random)
+ * @param {string|null} genre Optional genre to sample from
  * @returns {Promise<object|null>} A random movie object or null if none exist
  */
-export async function getRandomMovie() {
-  const movies = await moviesService.getAllMovies();
-  if (!movies || movies.length === 0) return null;
-  const randomIndex = Math.floor(Math.random() * movies.length);
-  return movies[randomIndex];
-}
\ No newline at end of file
+export async function getRandomMovie(genre = null) {
+  try {
+    const movie = await apiService.getRandomMovie(genre);
+    return movie ? moviesService.transformMovieData(movie) : null;
+  } catch (error) {
+    console.warn("⚠️ Random movie endpoint failed, picking from catalog:", error.message);
+    const movies = await moviesService.getAllMovies();
+    if (!movies || movies.length === 0) return null;
+    const randomIndex = Math.floor(Math.random() * movies.length);
+    return movies[randomIndex];
+  }
+}